@@ -22,6 +22,7 @@ the classes contained therein.
 
 import collections
 import copy
+import functools
 from importlib import import_module
 import inspect
 import logging
@@ -45,6 +46,8 @@ from horizon.decorators import _current_component
 from horizon.decorators import require_auth
 from horizon.decorators import require_perms
 from horizon import loaders
+from horizon.utils.memoized import get_request_scope
+from horizon.utils.memoized import get_shared_backend
 from horizon.utils import settings as utils_settings
 
 
@@ -67,24 +70,34 @@ def _decorate_urlconf(urlpatterns, decorator, *args, **kwargs):
             _decorate_urlconf(pattern.url_patterns, decorator, *args, **kwargs)
 
 
-# FIXME(lhcheng): We need to find a better way to cache the result.
-# Rather than storing it in the session, we could leverage the Django
-# session. Currently, this has been causing issue with cookie backend,
-# adding 1600+ in the cookie size.
+# Namespace of the shared cache holding the results of the access checks
+# made for each token.
+ACCESS_CACHE = 'horizon.base.access'
+
+
 def access_cached(func):
-    def inner(self, context):
-        session = context['request'].session
-        try:
-            if session['allowed']['valid_for'] != session.get('token'):
-                raise KeyError()
-        except KeyError:
-            session['allowed'] = {"valid_for": session.get('token')}
+    """Caches the result of an access check per token.
 
+    The results are kept in the shared cache rather than in the session,
+    which would grow every session cookie, for ``NAV_CACHE_TIMEOUT``
+    seconds. The results of all the components are held by a single entry
+    per token. They are not cached for requests without a token.
+    """
+    @functools.wraps(func)
+    def inner(self, context):
+        timeout = getattr(settings, 'NAV_CACHE_TIMEOUT', 300)
+        scope = get_request_scope(context['request'])
+        if not timeout or scope[0] is None:
+            return func(self, context)
+        backend = get_shared_backend()
         key = "%s.%s" % (self.__class__.__module__, self.__class__.__name__)
-        if key not in session['allowed']:
-            session['allowed'][key] = func(self, context)
-            session.modified = True
-        return session['allowed'][key]
+        allowed = backend.get(ACCESS_CACHE, scope, None) or {}
+        if key not in allowed:
+            # The cached dict may be read by other threads, never modify it.
+            allowed = dict(allowed)
+            allowed[key] = func(self, context)
+            backend.set(ACCESS_CACHE, scope, allowed, timeout)
+        return allowed[key]
     return inner
 
 
@@ -123,15 +136,12 @@ class HorizonComponent(object):
                 urlpatterns = []
         return urlpatterns
 
-    # FIXME(lhcheng): Removed the access_cached decorator for now until
-    # a better implementation has been figured out. This has been causing
-    # issue with cookie backend, adding 1600+ in the cookie size.
-    # @access_cached
+    @access_cached
     def can_access(self, context):
         """Return whether the user has role based access to this component.
 
         This method is not intended to be overridden.
-        The result of the method is stored in per-session cache.
+        The result of the method is stored in a per-token cache.
         """
         return self.allowed(context)
 
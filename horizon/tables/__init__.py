@@ -29,6 +29,7 @@ from horizon.tables.base import Column
 from horizon.tables.base import DataTable
 from horizon.tables.base import Row
 from horizon.tables.base import WrappingColumn
+from horizon.tables.views import DataTableExportMixin
 from horizon.tables.views import DataTableView
 from horizon.tables.views import MixedDataTableView
 from horizon.tables.views import MultiTableMixin
@@ -51,6 +52,7 @@ __all__ = [
     'DataTable',
     'Row',
     'WrappingColumn',
+    'DataTableExportMixin',
     'DataTableView',
     'MixedDataTableView',
     'MultiTableMixin',
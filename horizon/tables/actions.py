@@ -28,6 +28,7 @@ from django.utils.html import linebreaks  # noqa
 from django.utils.http import urlencode
 from django.utils.translation import ugettext_lazy as _
 from django.utils.translation import ungettext_lazy
+import futurist
 import six
 
 from horizon import messages
@@ -869,9 +870,23 @@ class BatchAction(Action):
        Optional message for providing an appropriate help text for
        the horizon user.
 
+    .. attribute:: concurrent
+
+       Boolean value indicating whether :meth:`action` may be run for the
+       selected objects concurrently. Only enable it when ``action`` is
+       thread-safe, which is usually the case when it only calls an API.
+       Defaults to ``False``.
+
+    .. attribute:: max_workers
+
+       Maximum number of threads used when ``concurrent`` is enabled.
+       Defaults to the ``BATCH_ACTION_MAX_WORKERS`` setting, or 10.
+
     """
 
     help_text = _("This action cannot be undone.")
+    concurrent = False
+    max_workers = None
 
     def __init__(self, **kwargs):
         super(BatchAction, self).__init__(**kwargs)
@@ -967,10 +982,24 @@ class BatchAction(Action):
         attrs.update({'data-batch-action': 'true'})
         return attrs
 
+    def get_max_workers(self):
+        """Returns the number of threads to run the action with."""
+        if self.max_workers is not None:
+            return self.max_workers
+        return getattr(settings, 'BATCH_ACTION_MAX_WORKERS', 10)
+
+    def _run_action(self, request, datum_id):
+        try:
+            self.action(request, datum_id)
+        except Exception as ex:
+            return ex
+        return None
+
     def handle(self, table, request, obj_ids):
         action_success = []
         action_failure = []
         action_not_allowed = []
+        allowed = []
         for datum_id in obj_ids:
             datum = table.get_object_by_id(datum_id)
             datum_display = table.get_object_display(datum) or datum_id
@@ -981,16 +1010,32 @@ class BatchAction(Action):
                     'dis': datum_display
                 })
                 continue
-            try:
-                self.action(request, datum_id)
-                # Call update to invoke changes if needed
-                self.update(request, datum)
+            allowed.append((datum_id, datum, datum_display))
+
+        max_workers = min(self.get_max_workers(), len(allowed))
+        if self.concurrent and max_workers > 1:
+            with futurist.ThreadPoolExecutor(max_workers=max_workers) as e:
+                futures = [e.submit(self._run_action, request, datum_id)
+                           for datum_id, datum, datum_display in allowed]
+            errors = [future.result() for future in futures]
+        else:
+            errors = [self._run_action(request, datum_id)
+                      for datum_id, datum, datum_display in allowed]
+
+        for (datum_id, datum, datum_display), ex in zip(allowed, errors):
+            if ex is None:
+                try:
+                    # Call update to invoke changes if needed
+                    self.update(request, datum)
+                except Exception as update_ex:
+                    ex = update_ex
+            if ex is None:
                 action_success.append(datum_display)
                 self.success_ids.append(datum_id)
                 LOG.info(u'%(action)s: "%(datum_display)s"',
                          {'action': self._get_action_name(past=True),
                           'datum_display': datum_display})
-            except Exception as ex:
+            else:
                 # Handle the exception but silence it since we'll display
                 # an aggregate error message later. Otherwise we'd get
                 # multiple error messages displayed to the user.
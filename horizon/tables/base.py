@@ -28,13 +28,16 @@ from django.http import HttpResponse
 from django import template
 from django.template.defaultfilters import slugify
 from django.template.defaultfilters import truncatechars
-from django.template.loader import render_to_string
+from django.utils.encoding import force_text
+from django.utils.formats import localize
+from django.utils.html import conditional_escape
 from django.utils.html import escape
 from django.utils.html import linebreaks  # noqa
 from django.utils import http
 from django.utils.http import urlencode
 from django.utils.safestring import mark_safe
 from django.utils import termcolors
+from django.utils.timezone import template_localtime
 from django.utils.translation import ugettext_lazy as _
 import six
 
@@ -575,10 +578,16 @@ class Row(html.HTMLElement):
         updates of cell. Generally you won't need to change this value.
         It is also used for inline edit of the cell.
         Default: ``"cell_update"``.
+
+    .. attribute:: template_path
+
+        The template used to render the row.
+        Default: ``"horizon/common/_data_table_row.html"``.
     """
     ajax = False
     ajax_action_name = "row_update"
     ajax_cell_action_name = "cell_update"
+    template_path = "horizon/common/_data_table_row.html"
 
     def __init__(self, table, datum=None):
         super(Row, self).__init__()
@@ -671,8 +680,8 @@ class Row(html.HTMLElement):
             return ''
 
     def render(self):
-        return render_to_string("horizon/common/_data_table_row.html",
-                                {"row": self})
+        row_template = self.table._get_template(self.template_path)
+        return row_template.render({"row": self})
 
     def get_cells(self):
         """Returns the bound cells for this row in order."""
@@ -712,7 +721,14 @@ class Row(html.HTMLElement):
 
 
 class Cell(html.HTMLElement):
-    """Represents a single cell in the table."""
+    """Represents a single cell in the table.
+
+    .. attribute:: template_path
+
+        The template used to render the cell.
+        Default: ``"horizon/common/_data_table_cell.html"``.
+    """
+    template_path = "horizon/common/_data_table_cell.html"
 
     def __init__(self, datum, column, row, attrs=None, classes=None):
         self.classes = classes or getattr(self, "classes", [])
@@ -835,12 +851,15 @@ class Cell(html.HTMLElement):
 
     @property
     def url(self):
+        # The URL is needed for both the value and the CSS classes of the
+        # cell, only compute it once.
+        if hasattr(self, '_url'):
+            return self._url
+
+        self._url = None
         if self.column.link:
-            url = self.column.get_link_url(self.datum)
-            if url:
-                return url
-        else:
-            return None
+            self._url = self.column.get_link_url(self.datum) or None
+        return self._url
 
     @property
     def status(self):
@@ -908,8 +927,23 @@ class Cell(html.HTMLElement):
                                           self)
 
     def render(self):
-        return render_to_string("horizon/common/_data_table_cell.html",
-                                {"cell": self})
+        if (self.template_path == Cell.template_path and
+                not self.inline_edit_available):
+            return self._render_plain()
+        cell_template = self.row.table._get_template(self.template_path)
+        return cell_template.render({"cell": self})
+
+    def _render_plain(self):
+        """Renders a cell without inline editing through string building.
+
+        The output is the same as the default cell template, which is
+        otherwise rendered for every cell of the table.
+        """
+        value = conditional_escape(
+            force_text(localize(template_localtime(self.value))))
+        if self.wrap_list:
+            value = "<ul>%s</ul>" % value
+        return mark_safe("<td%s>%s</td>" % (self.attr_string, value))
 
 
 class DataTableOptions(object):
@@ -1322,6 +1356,7 @@ class DataTable(object):
                 columns.append((key, column))
         self.columns = collections.OrderedDict(columns)
         self._populate_data_cache()
+        self._templates = {}
 
         # Associate these actions with this table
         for action in self.base_actions.values():
@@ -1438,6 +1473,13 @@ class DataTable(object):
             return True
         return False
 
+    def _get_template(self, template_path):
+        """Returns the compiled template, loading it once per table."""
+        if template_path not in self._templates:
+            self._templates[template_path] = template.loader.get_template(
+                template_path)
+        return self._templates[template_path]
+
     def render(self):
         """Renders the table using the template from the table options."""
         table_template = template.loader.get_template(self._meta.template)
@@ -1480,6 +1522,38 @@ class DataTable(object):
         """
         return self._filter_first_message
 
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+        # The id index is rebuilt lazily on the next lookup.
+        self._object_index = None
+
+    @staticmethod
+    def _object_id_to_text(obj_id):
+        if not isinstance(obj_id, six.text_type):
+            obj_id = str(obj_id)
+            if six.PY2:
+                obj_id = obj_id.decode('utf-8')
+        return obj_id
+
+    def _get_object_index(self):
+        """Returns a dict mapping the unicode id of each datum to its matches.
+
+        The index is built on first use and discarded whenever ``data`` is
+        reassigned. Modifying the ``data`` list in place is not tracked.
+        """
+        if self._object_index is None:
+            index = {}
+            for datum in self.data or []:
+                obj_id = self._object_id_to_text(self.get_object_id(datum))
+                index.setdefault(obj_id, []).append(datum)
+            self._object_index = index
+        return self._object_index
+
     def get_object_by_id(self, lookup):
         """Returns the data object whose ID matches ``loopup`` parameter.
 
@@ -1492,19 +1566,8 @@ class DataTable(object):
 
         Uses :meth:`~horizon.tables.DataTable.get_object_id` internally.
         """
-        if not isinstance(lookup, six.text_type):
-            lookup = str(lookup)
-            if six.PY2:
-                lookup = lookup.decode('utf-8')
-        matches = []
-        for datum in self.data:
-            obj_id = self.get_object_id(datum)
-            if not isinstance(obj_id, six.text_type):
-                obj_id = str(obj_id)
-                if six.PY2:
-                    obj_id = obj_id.decode('utf-8')
-            if obj_id == lookup:
-                matches.append(datum)
+        lookup = self._object_id_to_text(lookup)
+        matches = self._get_object_index().get(lookup, [])
         if len(matches) > 1:
             raise ValueError("Multiple matches were returned for that id: %s."
                              % matches)
@@ -1622,7 +1685,7 @@ class DataTable(object):
         else:
             template_path = self._meta.row_actions_dropdown_template
 
-        row_actions_template = template.loader.get_template(template_path)
+        row_actions_template = self._get_template(template_path)
         bound_actions = self.get_row_actions(datum)
         extra_context = {"row_actions": bound_actions,
                          "row_id": self.get_object_id(datum)}
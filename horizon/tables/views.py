@@ -13,9 +13,18 @@
 #    under the License.
 
 from collections import defaultdict
+from collections import OrderedDict
+import itertools
+import json
 
+from django import http
 from django import shortcuts
+from django.utils.encoding import force_text
+from django.utils.html import strip_tags
+from django.utils.safestring import SafeData
 
+from horizon import exceptions
+from horizon.utils import csvbase
 from horizon import views
 
 from horizon.templatetags.horizon import has_permissions
@@ -392,3 +401,92 @@ class PagedTableMixin(object):
             if marker:
                 return marker, "desc"
             return None, "desc"
+
+
+class DataTableExportMixin(object):
+    """A mixin exporting every row of the table of a DataTableView.
+
+    Requesting the view with ``?format=csv`` or ``?format=jsonl`` streams
+    the rows of all the pages of the table, not only of the current one, as
+    CSV or as JSON lines. The pages are retrieved one at a time while the
+    response is sent, through the ``get_data`` and ``has_more_data`` methods
+    of the view, so only a single page is ever kept in memory.
+    """
+    export_formats = ('csv', 'jsonl')
+    export_filename = None
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get('format')
+        if export_format in self.export_formats:
+            return self.export(export_format)
+        return super(DataTableExportMixin, self).get(request, *args, **kwargs)
+
+    def get_export_columns(self, table):
+        return [column for column in table.get_columns()
+                if column.auto not in ('multi_select', 'actions')]
+
+    def get_export_value(self, column, datum):
+        value = column.get_data(datum)
+        if value is None:
+            return ''
+        if isinstance(value, SafeData):
+            return strip_tags(value)
+        return force_text(value)
+
+    def iter_export_data(self):
+        """Yields the data of every page of the table, one page at a time."""
+        table = self.get_table()
+        meta = table._meta
+        request = self.request
+        original_query = request.GET
+        query = original_query.copy()
+        query.pop(meta.prev_pagination_param, None)
+        query.pop(meta.pagination_param, None)
+        try:
+            while True:
+                request.GET = query
+                self._data = {}
+                table._populate_data_cache()
+                data = self._get_data_dict()[meta.name]
+                for datum in data:
+                    yield datum
+                if not data or not self.has_more_data(table):
+                    break
+                marker = table.get_object_id(data[-1])
+                if marker == query.get(meta.pagination_param):
+                    break
+                query = query.copy()
+                query[meta.pagination_param] = marker
+        finally:
+            request.GET = original_query
+            self._data = {}
+
+    def _iter_csv(self, columns):
+        header = [force_text(column.verbose_name) for column in columns]
+        rows = ([self.get_export_value(column, datum) for column in columns]
+                for datum in self.iter_export_data())
+        return csvbase.iter_csv_lines(itertools.chain([header], rows))
+
+    def _iter_jsonl(self, columns):
+        for datum in self.iter_export_data():
+            row = OrderedDict(
+                (column.name, self.get_export_value(column, datum))
+                for column in columns)
+            yield json.dumps(row) + '\n'
+
+    def export(self, export_format):
+        if not self.get_tables():
+            raise exceptions.NotAuthorized
+        table = self.get_table()
+        columns = self.get_export_columns(table)
+        if export_format == 'csv':
+            content = self._iter_csv(columns)
+            content_type = 'text/csv'
+        else:
+            content = self._iter_jsonl(columns)
+            content_type = 'application/x-ndjson'
+        response = http.StreamingHttpResponse(csvbase.iter_chunks(content),
+                                              content_type=content_type)
+        response['Content-Disposition'] = 'attachment; filename="%s.%s"' % (
+            self.export_filename or table.name, export_format)
+        return response
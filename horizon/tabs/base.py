@@ -13,16 +13,27 @@
 #    under the License.
 
 from collections import OrderedDict
+import logging
 import sys
+import time
 
+import futurist
+from futurist import waiters
 import six
 
+from django.conf import settings
 from django.template.loader import render_to_string
 from django.template import TemplateSyntaxError
+from django.utils import translation
+from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
+from horizon import messages
+from horizon.utils import functions as utils
 from horizon.utils import html
 
+LOG = logging.getLogger(__name__)
+
 SEPARATOR = "__"
 CSS_TAB_GROUP_CLASSES = ["nav", "nav-tabs", "ajax-tabs"]
 CSS_ACTIVE_TAB_CLASSES = ["active"]
@@ -76,12 +87,45 @@ class TabGroup(html.HTMLElement):
         Read-only property which is set to the value of the current active tab.
         This may not be the same as the value of ``selected`` if no
         specific tab was requested via the ``GET`` parameter.
+
+    .. attribute:: concurrent
+
+        Boolean to control whether :meth:`load_tab_data` loads the data of
+        the tabs concurrently, and whether a
+        :class:`~horizon.tabs.TableTab` with several tables fetches their
+        data concurrently. Only enable it when the tabs are thread-safe,
+        which is usually the case when they only call APIs.
+        Default: ``False``
+
+    .. attribute:: max_workers
+
+        Maximum number of threads used when ``concurrent`` is enabled.
+        Defaults to the ``TAB_LOAD_MAX_WORKERS`` setting, or 10.
+
+    .. attribute:: tab_timeout
+
+        Number of seconds, counted from the start of :meth:`load_tab_data`,
+        to wait for the data of each tab when ``concurrent`` is enabled.
+        A tab whose data is not loaded in time is shown as failed.
+        Defaults to the ``TAB_LOAD_TIMEOUT`` setting, or ``None`` to wait
+        until every tab is loaded.
+
+    .. attribute:: defer_inactive_tabs
+
+        Boolean to control whether only the active tab is rendered into
+        the page. The other tabs are then loaded via AJAX when they are
+        selected, as if their ``preload`` attribute was ``False``.
+        Default: ``False``
     """
     slug = None
     template_name = "horizon/common/_tab_group.html"
     param_name = 'tab'
     sticky = False
     show_single_tab = False
+    concurrent = False
+    max_workers = None
+    tab_timeout = None
+    defer_inactive_tabs = False
     _selected = None
     _active = None
 
@@ -118,13 +162,63 @@ class TabGroup(html.HTMLElement):
 
     def load_tab_data(self):
         """Preload all data that for the tabs that will be displayed."""
-        for tab in self._tabs.values():
-            if tab.load and not tab.data_loaded:
+        tabs = [tab for tab in self._tabs.values()
+                if tab.load and not tab.data_loaded]
+        max_workers = min(self.get_max_workers(), len(tabs))
+        if not self.concurrent or max_workers <= 1:
+            for tab in tabs:
                 try:
                     tab._data = tab.get_context_data(self.request)
                 except Exception:
                     tab._data = False
                     exceptions.handle(self.request)
+            return
+
+        timeout = self.get_tab_timeout()
+        start = time.time()
+        executor = futurist.ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            language = translation.get_language()
+            futures = [(tab, executor.submit(utils.call_with_language,
+                                             language, tab.get_context_data,
+                                             self.request))
+                       for tab in tabs]
+            # Errors are handled here, in the request thread and in the
+            # tab order, exactly as when loading the tabs one by one.
+            for tab, future in futures:
+                if timeout is not None:
+                    remaining = max(timeout - (time.time() - start), 0)
+                    done = waiters.wait_for_all([future], remaining).done
+                    if not done:
+                        LOG.warning('Timed out after %(timeout)s seconds '
+                                    'loading the "%(tab)s" tab.',
+                                    {'timeout': timeout, 'tab': tab.slug})
+                        tab._data = False
+                        messages.warning(
+                            self.request,
+                            _('Unable to load the "%s" tab in time.')
+                            % tab.name)
+                        continue
+                try:
+                    tab._data = future.result()
+                except Exception:
+                    tab._data = False
+                    exceptions.handle(self.request)
+        finally:
+            # Do not wait for the tabs which timed out.
+            executor.shutdown(wait=False)
+
+    def get_max_workers(self):
+        """Returns the number of threads to load the tabs with."""
+        if self.max_workers is not None:
+            return self.max_workers
+        return getattr(settings, 'TAB_LOAD_MAX_WORKERS', 10)
+
+    def get_tab_timeout(self):
+        """Returns the number of seconds to wait for the data of a tab."""
+        if self.tab_timeout is not None:
+            return self.tab_timeout
+        return getattr(settings, 'TAB_LOAD_TIMEOUT', None)
 
     def get_id(self):
         """Returns the id for this tab group.
@@ -290,7 +384,8 @@ class Tab(html.HTMLElement):
 
     @property
     def load(self):
-        load_preloaded = self.preload or self.is_active() or \
+        preload = self.preload and not self.tab_group.defer_inactive_tabs
+        load_preloaded = preload or self.is_active() or \
             self.get_id() in self.request.GET.get("loaded", "")
         return load_preloaded and self._allowed and self._enabled
 
@@ -447,6 +542,7 @@ class TableTab(Tab):
         """
         # We only want the data to be loaded once, so we track if we have...
         if not self._table_data_loaded:
+            data_funcs = []
             for table_name, table in self._tables.items():
                 # Fetch the data function.
                 func_name = "get_%s_data" % table_name
@@ -457,9 +553,24 @@ class TableTab(Tab):
                         "You must define a %(func_name)s method on"
                         " %(cls_name)s."
                         % {'func_name': func_name, 'cls_name': cls_name})
+                data_funcs.append(data_func)
+
+            # Load the data.
+            max_workers = min(self.tab_group.get_max_workers(),
+                              len(data_funcs))
+            if self.tab_group.concurrent and max_workers > 1:
+                language = translation.get_language()
+                with futurist.ThreadPoolExecutor(
+                        max_workers=max_workers) as executor:
+                    futures = [executor.submit(utils.call_with_language,
+                                               language, data_func)
+                               for data_func in data_funcs]
+                table_data = [future.result() for future in futures]
+            else:
+                table_data = [data_func() for data_func in data_funcs]
 
-                # Load the data.
-                table.data = data_func()
+            for table, data in zip(self._tables.values(), table_data):
+                table.data = data
                 table._meta.has_prev_data = self.has_prev_data(table)
                 table._meta.has_more_data = self.has_more_data(table)
                 table._meta.limit_count = self.get_limit_count(table)
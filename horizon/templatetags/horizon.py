@@ -18,14 +18,18 @@ from collections import OrderedDict
 
 from django.conf import settings
 from django import template
+from django.template import loader
 from django.template import Node
 from django.utils.encoding import force_text
+from django.utils.safestring import mark_safe
 from django.utils import translation
 from django.utils.translation import ugettext_lazy as _
 
 from horizon.base import Horizon
 from horizon import conf
 from horizon.contrib import bootstrap_datepicker
+from horizon.utils.memoized import get_request_scope
+from horizon.utils.memoized import get_shared_backend
 
 
 register = template.Library()
@@ -53,43 +57,128 @@ def has_permissions_on_list(components, user):
             in components if has_permissions(user, component)]
 
 
-@register.inclusion_tag('horizon/_sidebar.html', takes_context=True)
+# Namespace of the shared cache holding the navigation computed for each
+# token and the sidebar rendered for each token, language and panel.
+NAV_CACHE = 'horizon.templatetags.horizon.nav'
+
+
+def _is_visible(component, context):
+    nav = component.nav(context) if callable(component.nav) else component.nav
+    return bool(nav and component.can_access(context))
+
+
+def _compute_nav(context):
+    """Returns the slugs of the dashboards and panels the user can access.
+
+    Each dashboard is a ``(slug, in_sidebar, in_main_nav, groups)`` tuple,
+    groups being ``(slug, panel_slugs)`` tuples of its non empty panel
+    groups.
+    """
+    nav = []
+    for dash in Horizon.get_dashboards():
+        groups = []
+        for group in dash.get_panel_groups().values():
+            panels = [panel.slug for panel in group
+                      if _is_visible(panel, context)]
+            if panels:
+                groups.append((group.slug, panels))
+        dash_nav = dash.nav(context) if callable(dash.nav) else dash.nav
+        # The main navigation lists the dashboards with a callable nav
+        # whatever it returns.
+        access = bool((callable(dash.nav) or dash_nav) and
+                      dash.can_access(context))
+        nav.append((dash.slug, bool(dash_nav) and access, access, groups))
+    return nav
+
+
+def _get_nav_cache_scope(request):
+    timeout = getattr(settings, 'NAV_CACHE_TIMEOUT', 300)
+    scope = get_request_scope(request)
+    if not timeout or scope[0] is None:
+        return None, None
+    return scope, timeout
+
+
+def get_nav(context):
+    """Returns the dashboards and panels the user can access.
+
+    Each dashboard is a ``(dashboard, in_sidebar, in_main_nav, groups)``
+    tuple, ``groups`` being an ordered dict of its non empty panel groups
+    and their panels. The result of the ``nav`` and ``can_access`` checks
+    is kept in the shared cache per token for ``NAV_CACHE_TIMEOUT``
+    seconds.
+    """
+    scope, timeout = _get_nav_cache_scope(context['request'])
+    nav = None
+    if scope is not None:
+        nav = get_shared_backend().get(NAV_CACHE, ('nav',) + scope, None)
+    if nav is None:
+        nav = _compute_nav(context)
+        if scope is not None:
+            get_shared_backend().set(NAV_CACHE, ('nav',) + scope, nav,
+                                     timeout)
+
+    dashboards = dict((dash.slug, dash) for dash in Horizon.get_dashboards())
+    components = []
+    for dash_slug, in_sidebar, in_main_nav, groups in nav:
+        dash = dashboards.get(dash_slug)
+        if dash is None:
+            continue
+        panel_groups = dash.get_panel_groups()
+        allowed_groups = OrderedDict()
+        for group_slug, panel_slugs in groups:
+            group = panel_groups.get(group_slug)
+            if group is None:
+                continue
+            panels = dict((panel.slug, panel) for panel in group)
+            allowed_groups[group] = [panels[slug] for slug in panel_slugs
+                                     if slug in panels]
+        components.append((dash, in_sidebar, in_main_nav, allowed_groups))
+    return components
+
+
+@register.simple_tag(takes_context=True)
 def horizon_nav(context):
+    """Renders the sidebar navigation.
+
+    The sidebar is kept in the shared cache per token, language and
+    current panel for ``NAV_CACHE_TIMEOUT`` seconds.
+    """
     if 'request' not in context:
-        return {}
-    current_dashboard = context['request'].horizon.get('dashboard', None)
+        return ''
+    request = context['request']
+    current_dashboard = request.horizon.get('dashboard', None)
+    current_panel = request.horizon.get('panel', None)
+    scope, timeout = _get_nav_cache_scope(request)
+    if scope is not None:
+        cache_key = ('sidebar',) + scope + (
+            translation.get_language(),
+            getattr(current_dashboard, 'slug', None),
+            getattr(current_panel, 'slug', None))
+        sidebar = get_shared_backend().get(NAV_CACHE, cache_key, None)
+        if sidebar is not None:
+            return mark_safe(sidebar)
+
     current_panel_group = None
-    current_panel = context['request'].horizon.get('panel', None)
     dashboards = []
-    for dash in Horizon.get_dashboards():
-        panel_groups = dash.get_panel_groups()
-        non_empty_groups = []
-        for group in panel_groups.values():
-            allowed_panels = []
-            for panel in group:
-                if (callable(panel.nav) and panel.nav(context) and
-                        panel.can_access(context)):
-                    allowed_panels.append(panel)
-                elif (not callable(panel.nav) and panel.nav and
-                        panel.can_access(context)):
-                    allowed_panels.append(panel)
-                if panel == current_panel:
+    for dash, in_sidebar, in_main_nav, groups in get_nav(context):
+        if in_sidebar:
+            dashboards.append((dash, groups))
+        if current_panel is not None and current_panel_group is None:
+            for group in dash.get_panel_groups().values():
+                if current_panel in group:
                     current_panel_group = group.slug
-            if allowed_panels:
-                non_empty_groups.append((group, allowed_panels))
-        if (callable(dash.nav) and dash.nav(context) and
-                dash.can_access(context)):
-            dashboards.append((dash, OrderedDict(non_empty_groups)))
-        elif (not callable(dash.nav) and dash.nav and
-                dash.can_access(context)):
-            dashboards.append((dash, OrderedDict(non_empty_groups)))
-    return {'components': dashboards,
-            'user': context['request'].user,
-            'current': current_dashboard,
-            'current_panel_group': current_panel_group,
-            'current_panel': current_panel.slug if current_panel else '',
-            'request': context['request'],
-            'system_name': context['system_name']}
+    sidebar = loader.render_to_string('horizon/_sidebar.html', {
+        'components': dashboards,
+        'user': request.user,
+        'current': current_dashboard,
+        'current_panel_group': current_panel_group,
+        'current_panel': current_panel.slug if current_panel else '',
+        'request': request,
+        'system_name': context.get('system_name')})
+    if scope is not None:
+        get_shared_backend().set(NAV_CACHE, cache_key, sidebar, timeout)
+    return mark_safe(sidebar)
 
 
 @register.inclusion_tag('horizon/_nav_list.html', takes_context=True)
@@ -98,13 +187,8 @@ def horizon_main_nav(context):
     if 'request' not in context:
         return {}
     current_dashboard = context['request'].horizon.get('dashboard', None)
-    dashboards = []
-    for dash in Horizon.get_dashboards():
-        if dash.can_access(context):
-            if callable(dash.nav) and dash.nav(context):
-                dashboards.append(dash)
-            elif dash.nav:
-                dashboards.append(dash)
+    dashboards = [dash for dash, in_sidebar, in_main_nav, groups
+                  in get_nav(context) if in_main_nav]
     return {'components': dashboards,
             'user': context['request'].user,
             'current': current_dashboard,
@@ -117,19 +201,11 @@ def horizon_dashboard_nav(context):
     if 'request' not in context:
         return {}
     dashboard = context['request'].horizon['dashboard']
-    panel_groups = dashboard.get_panel_groups()
     non_empty_groups = []
-
-    for group in panel_groups.values():
-        allowed_panels = []
-        for panel in group:
-            if (callable(panel.nav) and panel.nav(context) and
-                    panel.can_access(context)):
-                allowed_panels.append(panel)
-            elif (not callable(panel.nav) and panel.nav and
-                    panel.can_access(context)):
-                allowed_panels.append(panel)
-        if allowed_panels:
+    for dash, in_sidebar, in_main_nav, groups in get_nav(context):
+        if dash != dashboard:
+            continue
+        for group, allowed_panels in groups.items():
             if group.name is None:
                 non_empty_groups.append((dashboard.name, allowed_panels))
             else:
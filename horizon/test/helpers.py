@@ -59,6 +59,7 @@ except ImportError as e:
 from mox3 import mox
 
 from horizon import middleware
+from horizon.utils import memoized
 
 
 # Makes output of failing mox tests much easier to read.
@@ -125,6 +126,8 @@ class TestCase(django_test.TestCase):
     def setUp(self):
         super(TestCase, self).setUp()
         self.mox = mox.Mox()
+        memoized.clear_shared_cache()
+        memoized.get_client_pool().clear()
         self._setup_test_data()
         self._setup_factory()
         self._setup_user()
@@ -27,6 +27,7 @@ from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.exceptions import ImproperlyConfigured
 from django.core import urlresolvers
+import mock
 
 import horizon
 from horizon import base
@@ -37,6 +38,7 @@ from horizon.test.test_dashboards.cats.kittens.panel import Kittens
 from horizon.test.test_dashboards.cats.tigers.panel import Tigers
 from horizon.test.test_dashboards.dogs.dashboard import Dogs
 from horizon.test.test_dashboards.dogs.puppies.panel import Puppies
+from horizon.utils import memoized
 
 
 class MyDash(horizon.Dashboard):
@@ -539,3 +541,32 @@ class RbacHorizonTests(test.TestCase):
                                  ['<Panel: rbac_panel_yes>'])
 
         self.assertTrue(dogs.can_access(context))
+
+    def test_can_access_cached_per_token(self):
+        self.request.user.token = mock.Mock(id='token-id')
+        context = {'request': self.request}
+        dogs = horizon.get_dashboard("dogs")
+
+        with mock.patch.object(dogs, 'allowed',
+                               return_value=True) as mock_allowed:
+            self.assertTrue(dogs.can_access(context))
+            self.assertTrue(dogs.can_access(context))
+            self.request.user.token = mock.Mock(id='other-token-id')
+            self.assertTrue(dogs.can_access(context))
+
+        self.assertEqual(2, mock_allowed.call_count)
+
+    def test_can_access_cached_in_one_entry_per_token(self):
+        self.request.user.token = mock.Mock(id='token-id')
+        context = {'request': self.request}
+        dogs = horizon.get_dashboard("dogs")
+        cats = horizon.get_dashboard("cats")
+
+        with mock.patch.object(dogs, 'allowed', return_value=True), \
+                mock.patch.object(cats, 'allowed', return_value=False):
+            self.assertTrue(dogs.can_access(context))
+            self.assertFalse(cats.can_access(context))
+
+        allowed = memoized.get_shared_backend().get(
+            base.ACCESS_CACHE, memoized.get_request_scope(self.request))
+        self.assertEqual([False, True], sorted(allowed.values()))
@@ -15,6 +15,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+
 from django.core.urlresolvers import reverse
 from django import forms
 from django import http
@@ -23,9 +25,11 @@ from django.template import defaultfilters
 from django.test.utils import override_settings
 from django.utils.translation import ungettext_lazy
 
+import mock
 from mox3.mox import IsA
 import six
 
+from horizon import exceptions
 from horizon import tables
 from horizon.tables import formset as table_formset
 from horizon.tables import views as table_views
@@ -723,6 +727,16 @@ class DataTableTests(test.TestCase):
         self.assertNotContains(resp_optional, '<ul>')
         self.assertNotContains(resp_optional, '</ul>')
 
+    def test_plain_cell_rendering_matches_template(self):
+        self.table = MyTableWrapList(self.request, TEST_DATA_7)
+        row = self.table.get_rows()[0]
+        cell_template = self.table._get_template(tables.Cell.template_path)
+        for name in ('value', 'optional', 'status'):
+            cell = row.cells[name]
+            self.assertFalse(cell.inline_edit_available)
+            self.assertHTMLEqual(cell_template.render({"cell": cell}),
+                                 cell.render())
+
     def test_inline_edit_available_cell_rendering(self):
         self.table = MyTable(self.request, TEST_DATA_2)
         row = self.table.get_rows()[0]
@@ -1432,6 +1446,64 @@ class DataTableTests(test.TestCase):
         resp = http.HttpResponse(table.render())
         self.assertContains(resp, value)
 
+    def test_batch_action_concurrent(self):
+        called = []
+
+        class MyConcurrentBatchAction(MyBatchAction):
+            concurrent = True
+            max_workers = 2
+
+            def action(self, request, object_id):
+                called.append(object_id)
+                if object_id == '2':
+                    raise Exception('Batch failed.')
+
+        req = self.factory.post('/my_url/')
+        self.table = MyTable(req, TEST_DATA)
+        action = MyConcurrentBatchAction()
+        action.associate_with_table(self.table)
+        handled = action.handle(self.table, req, ['1', '2', '3'])
+
+        self.assertEqual(302, handled.status_code)
+        self.assertEqual(['1', '2', '3'], sorted(called))
+        self.assertEqual(['1', '3'], action.success_ids)
+        self.assertEqual([u"Unable to batch item: object_2",
+                          u"Batched Items: object_1, object_3"],
+                         [m.message for m in req._messages])
+
+    def test_get_object_by_id(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        self.assertEqual(TEST_DATA[2], self.table.get_object_by_id('3'))
+        self.assertEqual(TEST_DATA[2], self.table.get_object_by_id(3))
+        self.assertRaises(exceptions.Http302,
+                          self.table.get_object_by_id, '5')
+
+        # Reassigning the data invalidates the id index.
+        self.table.data = TEST_DATA_2
+        self.assertEqual(TEST_DATA_2[0], self.table.get_object_by_id('1'))
+        self.assertRaises(exceptions.Http302,
+                          self.table.get_object_by_id, '3')
+
+        self.table.data = TEST_DATA + TEST_DATA_2
+        self.assertRaises(ValueError, self.table.get_object_by_id, '1')
+
+    def test_get_object_by_id_large_table(self):
+        data = [FakeObject(str(i), 'object_%d' % i, 'value', 'up')
+                for i in range(10000)]
+        self.table = MyTable(self.request, data)
+        self.table.get_object_id = mock.Mock(wraps=lambda datum: datum.id)
+
+        self.assertIs(data[0], self.table.get_object_by_id(data[0].id))
+        index = self.table._object_index
+        self.assertEqual(len(data), len(index))
+        for datum in data:
+            self.assertIs(datum, self.table.get_object_by_id(datum.id))
+
+        # Every lookup goes through the index built by the first one, so
+        # each object id is computed once rather than once per lookup.
+        self.assertIs(index, self.table._object_index)
+        self.assertEqual(len(data), self.table.get_object_id.call_count)
+
 
 class SingleTableView(table_views.DataTableView):
     table_class = MyTable
@@ -1469,6 +1541,34 @@ class MultiTableView(tables.MultiTableView):
         return TEST_DATA
 
 
+class ExportTable(tables.DataTable):
+    id = tables.Column('id', verbose_name="Id")
+    name = tables.Column('name', verbose_name="Name")
+
+    class Meta(object):
+        name = "export_table"
+        multi_select = True
+        row_actions = (MyAction,)
+
+
+class PagedExportTableView(table_views.DataTableExportMixin,
+                           table_views.DataTableView):
+    table_class = ExportTable
+    template_name = "horizon/common/_detail_table.html"
+    page_size = 2
+
+    def get_data(self):
+        marker = self.request.GET.get(ExportTable._meta.pagination_param)
+        start = 0
+        if marker:
+            start = [datum.id for datum in TEST_DATA].index(marker) + 1
+        self._more = start + self.page_size < len(TEST_DATA)
+        return list(TEST_DATA[start:start + self.page_size])
+
+    def has_more_data(self, table):
+        return self._more
+
+
 class DataTableViewTests(test.TestCase):
     def _prepare_view(self, cls, *args, **kwargs):
         req = self.factory.get('/my_url/')
@@ -1574,6 +1674,51 @@ class DataTableViewTests(test.TestCase):
         self.assertEqual(req.session.get(self.fil_value_param), 'down')
         self.assertEqual(req.session.get(self.fil_field_param), 'status')
 
+    def _export(self, export_format):
+        req = self.factory.get('/my_url/', {'format': export_format,
+                                            'marker': '2'})
+        req.user = self.user
+        view = PagedExportTableView()
+        view.request = req
+        view.args = ()
+        view.kwargs = {}
+        res = view.get(req)
+        content = b''.join(res.streaming_content).decode('utf-8')
+        # The query of the request is restored once the export is done.
+        self.assertEqual('2', req.GET['marker'])
+        return res, content
+
+    def test_export_csv_all_pages(self):
+        res, content = self._export('csv')
+
+        self.assertEqual('text/csv', res['Content-Type'])
+        self.assertEqual('attachment; filename="export_table.csv"',
+                         res['Content-Disposition'])
+        self.assertEqual(u'Id,Name\r\n'
+                         u'1,object_1\r\n'
+                         u'2,object_2\r\n'
+                         u'3,object_3\r\n'
+                         u'4,\xf6bject_4\r\n', content)
+
+    def test_export_jsonl_all_pages(self):
+        res, content = self._export('jsonl')
+
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([{'id': datum.id, 'name': datum.name}
+                          for datum in TEST_DATA], rows)
+
+    def test_export_unknown_format(self):
+        req = self.factory.get('/my_url/', {'format': 'xml'})
+        req.user = self.user
+        view = PagedExportTableView()
+        view.request = req
+        view.args = ()
+        view.kwargs = {}
+
+        res = view.get(req)
+
+        self.assertFalse(res.streaming)
+
 
 class FormsetTableTests(test.TestCase):
 
@@ -15,10 +15,12 @@
 #    under the License.
 
 import copy
+import threading
 
 from django.conf import settings
 from django import http
 
+import mock
 import six
 
 from horizon import exceptions
@@ -27,6 +29,7 @@ from horizon import tabs as horizon_tabs
 from horizon.test import helpers as test
 
 from horizon.test.tests.tables import MyTable
+from horizon.test.tests.tables import NoActionsTable
 from horizon.test.tests.tables import TEST_DATA
 
 
@@ -75,6 +78,24 @@ class Group(horizon_tabs.TabGroup):
         self._assert_tabs_not_available = True
 
 
+class TabTwo(BaseTestTab):
+    slug = "tab_two"
+    name = "Tab Two"
+    template_name = "_tab.html"
+
+
+class ConcurrentGroup(horizon_tabs.TabGroup):
+    slug = "concurrent_tab_group"
+    tabs = (TabOne, TabTwo, TabDelayed)
+    concurrent = True
+
+
+class DeferredGroup(horizon_tabs.TabGroup):
+    slug = "deferred_tab_group"
+    tabs = (TabOne, TabTwo)
+    defer_inactive_tabs = True
+
+
 class TabWithTable(horizon_tabs.TableTab):
     table_classes = (MyTable,)
     name = "Tab With My Table"
@@ -110,6 +131,19 @@ class RedirectExceptionTab(horizon_tabs.Tab):
         raise exc
 
 
+class TabWithTwoTables(horizon_tabs.TableTab):
+    table_classes = (MyTable, NoActionsTable)
+    name = "Tab With Two Tables"
+    slug = "tab_with_two_tables"
+    template_name = "horizon/common/_detail_table.html"
+
+    def get_my_table_data(self):
+        return TEST_DATA
+
+    def get_no_actions_table_data(self):
+        return TEST_DATA[:1]
+
+
 class TableTabGroup(horizon_tabs.TabGroup):
     slug = "tab_group"
     tabs = [TabWithTable]
@@ -314,6 +348,56 @@ class TabTests(test.TestCase):
         req = self.factory.post('/', {'action': action_string})
         self.assertRaises(exceptions.Http302, view, req)
 
+    def test_concurrent_load_tab_data(self):
+        tg = ConcurrentGroup(self.request)
+        tg.load_tab_data()
+        self.assertEqual({"tab": tg.get_tab("tab_one")},
+                         tg.get_tab("tab_one")._data)
+        self.assertEqual({"tab": tg.get_tab("tab_two")},
+                         tg.get_tab("tab_two")._data)
+        # Tabs which are not preloaded are still left alone.
+        self.assertFalse(tg.get_tab("tab_delayed").data_loaded)
+
+    @mock.patch.object(horizon_tabs.base.messages, 'warning')
+    def test_concurrent_load_tab_data_timeout(self, mock_warning):
+        release = threading.Event()
+        tg = ConcurrentGroup(self.request)
+        tg.tab_timeout = 0.1
+        tab_two = tg.get_tab("tab_two")
+
+        def slow_context_data(request):
+            release.wait()
+            return {}
+
+        try:
+            with mock.patch.object(tab_two, 'get_context_data',
+                                   side_effect=slow_context_data):
+                tg.load_tab_data()
+        finally:
+            release.set()
+
+        self.assertTrue(tg.get_tab("tab_one").data_loaded)
+        self.assertFalse(tab_two._data)
+        self.assertEqual(1, mock_warning.call_count)
+
+    def test_defer_inactive_tabs(self):
+        tg = DeferredGroup(self.request)
+        self.assertTrue(tg.get_tab("tab_one").load)
+        self.assertFalse(tg.get_tab("tab_two").load)
+
+        self.request.GET['tab'] = "deferred_tab_group__tab_two"
+        tg = DeferredGroup(self.request)
+        self.assertFalse(tg.get_tab("tab_one").load)
+        self.assertTrue(tg.get_tab("tab_two").load)
+
+    def test_concurrent_table_tab(self):
+        tab_group = ConcurrentGroup(self.request)
+        tab = TabWithTwoTables(tab_group, self.request)
+        tab.load_table_data()
+        self.assertEqual(TEST_DATA, tab._tables["my_table"].data)
+        self.assertEqual(TEST_DATA[:1],
+                         tab._tables["no_actions_table"].data)
+
 
 class TabExceptionTests(test.TestCase):
     def setUp(self):
@@ -331,6 +415,15 @@ class TabExceptionTests(test.TestCase):
         res = view(req)
         self.assertMessageCount(res, error=1)
 
+    @mock.patch.object(TableTabGroup, 'concurrent', True)
+    def test_concurrent_tab_view_exception(self):
+        TabWithTableView.tab_group_class.tabs.append(RecoverableErrorTab)
+        view = TabWithTableView.as_view()
+        req = self.factory.get("/")
+        res = view(req)
+        self.assertMessageCount(res, error=1)
+        self.assertContains(res, "<table", 1)
+
     def test_tab_302_exception(self):
         TabWithTableView.tab_group_class.tabs.append(RedirectExceptionTab)
         view = TabWithTableView.as_view()
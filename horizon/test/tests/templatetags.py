@@ -21,7 +21,9 @@ import re
 from django.conf import settings
 from django.template import Context
 from django.template import Template
+from django.test.utils import override_settings
 from django.utils.text import normalize_newlines
+import mock
 
 from horizon.test import helpers as test
 # The following imports are required to register the dashboards.
@@ -150,3 +152,22 @@ class TemplateTagTests(test.TestCase):
                                             template_text=text,
                                             context={'request': self.request})
         self.assertEqual(single_line(rendered_str), single_line(expected))
+
+    @override_settings(NAV_CACHE_TIMEOUT=300)
+    def test_horizon_main_nav_cached(self):
+        self.request.user.token = mock.Mock(id='token-id')
+        text = "{% horizon_main_nav %}"
+        context = {'request': self.request}
+
+        with mock.patch.object(Cats, 'can_access',
+                               return_value=True) as mock_can_access:
+            first = self.render_template(tag_require='horizon',
+                                         template_text=text,
+                                         context=context)
+            second = self.render_template(tag_require='horizon',
+                                          template_text=text,
+                                          context=context)
+
+        self.assertEqual(first, second)
+        self.assertIn('/cats/', first)
+        mock_can_access.assert_called_once_with(mock.ANY)
@@ -15,12 +15,15 @@
 import datetime
 import os
 
+from django.contrib.auth.signals import user_logged_out
 from django.core.exceptions import ValidationError
 import django.template
 from django.template import defaultfilters
+import mock
 
 from horizon import forms
 from horizon.test import helpers as test
+from horizon.utils import csvbase
 from horizon.utils import filters
 # we have to import the filter in order to register it
 from horizon.utils.filters import parse_isotime  # noqa: F401
@@ -299,6 +302,40 @@ class ValidatorsTests(test.TestCase):
                               mdata)
 
 
+class CsvStreamingTests(test.TestCase):
+
+    class UsageCsvResponse(csvbase.BaseCsvStreamingResponse):
+        columns = ['Name', 'Hours']
+        chunk_size = 20
+
+        def get_row_data(self):
+            for i in range(5):
+                yield ('instance-%s' % i, i)
+
+    def test_streaming_response_chunks(self):
+        res = self.UsageCsvResponse(self.request, None, {}, 'text/csv')
+
+        chunks = list(res.streaming_content)
+
+        self.assertEqual(b'Name,Hours\r\ninstance-0,0\r\n', chunks[0])
+        self.assertEqual(b'Name,Hours\r\n' +
+                         b''.join(b'instance-%d,%d\r\n' % (i, i)
+                                  for i in range(5)),
+                         b''.join(chunks))
+        self.assertEqual(3, len(chunks))
+
+    def test_iter_csv_lines(self):
+        lines = list(csvbase.iter_csv_lines([('a', 1), (u'\xf6', None)]))
+
+        self.assertEqual([csvbase.encode(u'a,1\r\n'),
+                          csvbase.encode(u'\xf6,None\r\n')], lines)
+
+    def test_iter_chunks(self):
+        self.assertEqual(['abc', 'de'],
+                         list(csvbase.iter_chunks(['a', 'bc', 'd', 'e'],
+                                                  chunk_size=3)))
+
+
 class SecretKeyTests(test.TestCase):
     def test_generate_secret_key(self):
         key = secret_key.generate_key(32)
@@ -467,6 +504,166 @@ class MemoizedTests(test.TestCase):
             # check that some_other_func returned a memoized list.
             self.assertIs(output1, output2)
 
+    def _scoped_request(self, token_id, project_id='p1'):
+        request = self.factory.get('/')
+        request.user.token = type('Token', (object,), {'id': token_id})()
+        request.user.project_id = project_id
+        return request
+
+    def test_memoized_shared_across_requests(self):
+        calls = []
+
+        @memoized.memoized_shared(timeout=60)
+        def list_things(request, param):
+            calls.append(param)
+            return [param]
+
+        output1 = list_things(self._scoped_request('t1'), 'a')
+        output2 = list_things(self._scoped_request('t1'), 'a')
+        self.assertIs(output1, output2)
+        self.assertEqual(['a'], calls)
+
+        list_things(self._scoped_request('t1'), 'b')
+        list_things(self._scoped_request('t2'), 'a')
+        list_things(self._scoped_request('t1', 'p2'), 'a')
+        self.assertEqual(['a', 'b', 'a', 'a'], calls)
+
+    def test_memoized_shared_request_keyword(self):
+        calls = []
+
+        @memoized.memoized_shared(timeout=60)
+        def list_things(request, **params):
+            calls.append(params)
+            return [params]
+
+        output1 = list_things(request=self._scoped_request('t1'), id=('a',))
+        output2 = list_things(request=self._scoped_request('t1'), id=('a',))
+        list_things(request=self._scoped_request('t2'), id=('a',))
+        self.assertIs(output1, output2)
+        self.assertEqual(2, len(calls))
+
+    def test_memoized_shared_timeout(self):
+        calls = []
+
+        @memoized.memoized_shared(timeout=60)
+        def list_things(request):
+            calls.append(request)
+            return True
+
+        request = self._scoped_request('t1')
+        with mock.patch('time.time', return_value=1000):
+            list_things(request)
+            list_things(request)
+        with mock.patch('time.time', return_value=1061):
+            list_things(request)
+        self.assertEqual(2, len(calls))
+
+    def test_memoized_shared_invalidation(self):
+        calls = []
+
+        @memoized.memoized_shared(timeout=60)
+        def list_things(request):
+            calls.append(request)
+            return True
+
+        @memoized.invalidates_shared(list_things)
+        def create_thing(request):
+            return True
+
+        request = self._scoped_request('t1')
+        list_things(request)
+        list_things(request)
+        create_thing(self._scoped_request('t2'))
+        list_things(request)
+        self.assertEqual(2, len(calls))
+
+        list_things.invalidate()
+        list_things(request)
+        self.assertEqual(3, len(calls))
+
+    def test_memoized_process(self):
+        calls = []
+
+        @memoized.memoized_process
+        def get_backend():
+            calls.append(None)
+            return memoized.LocalMemoryBackend()
+
+        backend = get_backend()
+        self.assertIs(backend, get_backend())
+        self.assertEqual(1, len(calls))
+
+    def test_local_memory_backend_lru_eviction(self):
+        backend = memoized.LocalMemoryBackend(max_entries=2)
+        backend.set('ns', 'a', 1, None)
+        backend.set('ns', 'b', 2, None)
+        # Reading 'a' makes 'b' the least recently used entry.
+        self.assertEqual(1, backend.get('ns', 'a'))
+        backend.set('ns', 'c', 3, None)
+        self.assertIs(memoized._NOT_FOUND, backend.get('ns', 'b'))
+        self.assertEqual(1, backend.get('ns', 'a'))
+        self.assertEqual(3, backend.get('ns', 'c'))
+
+        backend.invalidate('ns')
+        self.assertIs(memoized._NOT_FOUND, backend.get('ns', 'a'))
+
+    def test_local_memory_backend_zero_timeout(self):
+        backend = memoized.LocalMemoryBackend()
+        backend.set('ns', 'a', 1, None)
+        backend.set('ns', 'a', 2, 0)
+        self.assertIs(memoized._NOT_FOUND, backend.get('ns', 'a'))
+
+    def test_client_pool_lru_eviction_and_counters(self):
+        pool = memoized.ClientPool(max_entries=2)
+        self.assertEqual('a', pool.get('a', lambda: 'a'))
+        self.assertEqual('b', pool.get('b', lambda: 'b'))
+        # Reading 'a' makes 'b' the least recently used client.
+        self.assertEqual('a', pool.get('a', lambda: 'other'))
+        pool.get('c', lambda: 'c')
+        self.assertEqual('new b', pool.get('b', lambda: 'new b'))
+        self.assertEqual({'size': 2, 'max_entries': 2, 'hits': 1,
+                          'misses': 4, 'evictions': 2}, pool.stats())
+
+    def test_client_pool_token_expiration(self):
+        pool = memoized.ClientPool()
+        with mock.patch('time.time', return_value=1000):
+            pool.get('a', lambda: 'a', token_id='t1', expires=1060)
+            self.assertEqual('a', pool.get('a', lambda: 'new a'))
+        with mock.patch('time.time', return_value=1060):
+            self.assertEqual('new a', pool.get('a', lambda: 'new a'))
+        self.assertEqual(1, pool.stats()['evictions'])
+
+    def test_client_pool_evicted_on_logout(self):
+        pool = memoized.get_client_pool()
+        pool.get('a', lambda: 'a', token_id='t1')
+        pool.get('b', lambda: 'b', token_id='t2')
+        request = self._scoped_request('t1')
+        user_logged_out.send(sender=request.user.__class__,
+                             request=request, user=request.user)
+        self.assertEqual('new a', pool.get('a', lambda: 'new a'))
+        self.assertEqual('b', pool.get('b', lambda: 'new b'))
+
+    def test_pooled_client(self):
+        calls = []
+
+        def get_auth_params(request):
+            return (request.user.token.id, request.user.project_id)
+
+        @memoized.pooled_client(get_auth_params)
+        def some_client(auth_params, version=None):
+            calls.append((auth_params, version))
+            return object()
+
+        request = self._scoped_request('t1')
+        request.user.token.expires = (datetime.datetime.utcnow() +
+                                      datetime.timedelta(hours=1))
+        client = some_client(request)
+        self.assertIs(client, some_client(self._scoped_request('t1')))
+        self.assertIsNot(client, some_client(request, version='2'))
+        self.assertIsNot(client, some_client(self._scoped_request('t2')))
+        self.assertEqual([(('t1', 'p1'), None), (('t1', 'p1'), '2'),
+                          (('t2', 'p1'), None)], calls)
+
 
 class GetConfigValueTests(test.TestCase):
     key = 'key'
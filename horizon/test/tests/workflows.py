@@ -12,6 +12,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
 from django import forms
 from django import http
 import mock
@@ -99,6 +101,32 @@ class AdminForbiddenAction(workflows.Action):
         policy_rules = (('action', 'forbidden'),)
 
 
+class TestConcurrentAction(workflows.Action):
+    flavor = forms.ChoiceField(label="Flavor")
+    image = forms.ChoiceField(label="Image")
+    network = forms.ChoiceField(label="Network")
+
+    images_requested = threading.Event()
+
+    class Meta(object):
+        name = "Test Concurrent Action"
+        slug = "test_concurrent_action"
+
+    def populate_flavor_choices(self, request, context):
+        # The image choices are only populated meanwhile when the hooks
+        # run concurrently.
+        if not self.images_requested.wait(5):
+            return []
+        return [("flavor_id", "flavor")]
+
+    def populate_image_choices(self, request, context):
+        self.images_requested.set()
+        return [("image_id", "image")]
+
+    def populate_network_choices(self, request, context):
+        raise exceptions.NotAvailable("Networks are unavailable.")
+
+
 class TestStepOne(workflows.Step):
     action_class = TestActionOne
     contributes = ("project_id", "user_id")
@@ -146,6 +174,17 @@ class TestWorkflow(workflows.Workflow):
     default_steps = (TestStepOne, TestStepTwo)
 
 
+class TestConcurrentStep(workflows.Step):
+    action_class = TestConcurrentAction
+    contributes = ("flavor", "image", "network")
+
+
+class TestConcurrentWorkflow(workflows.Workflow):
+    slug = "test_concurrent_workflow"
+    default_steps = (TestStepOne, TestConcurrentStep)
+    concurrent = True
+
+
 class TestWorkflowView(workflows.WorkflowView):
     workflow_class = TestWorkflow
     template_name = "workflow.html"
@@ -308,6 +347,25 @@ class WorkflowsTests(test.TestCase):
         self.assertContains(output, six.text_type(TestActionTwo.name))
         self.assertContains(output, six.text_type(TestActionThree.name))
 
+    @mock.patch.object(exceptions, 'handle')
+    def test_workflow_concurrent_choices(self, mock_handle):
+        TestConcurrentAction.images_requested.clear()
+        req = self.factory.get("/foo")
+        flow = TestConcurrentWorkflow(req)
+        action = flow.get_step("test_action_one").action
+        self.assertEqual([(PROJECT_ID, "test_project")],
+                         action.fields['project_id'].choices)
+
+        action = flow.get_step("test_concurrent_action").action
+        self.assertEqual([("flavor_id", "flavor")],
+                         action.fields['flavor'].choices)
+        self.assertEqual([("image_id", "image")],
+                         action.fields['image'].choices)
+        # The failing hook only leaves its own field without choices.
+        self.assertEqual([], action.fields['network'].choices)
+        mock_handle.assert_called_once_with(
+            req, 'Unable to retrieve the choices of the "Network" field.')
+
     def test_has_permissions(self):
         self.assertQuerysetEqual(TestWorkflow._cls_registry, [])
         TestWorkflow.register(AdminStep)
@@ -23,6 +23,49 @@ import six
 
 from six import StringIO
 
+# Approximate number of characters sent to the client at once by the
+# streaming responses.
+CHUNK_SIZE = 64 * 1024
+
+
+def encode(value):
+    value = six.text_type(value)
+    if six.PY2:
+        # csv and StringIO cannot work with mixed encodings,
+        # so encode all with utf-8
+        value = value.encode('utf-8')
+    return value
+
+
+def iter_csv_lines(rows):
+    """Yields the CSV line of each row, without keeping them in memory."""
+    out = StringIO()
+    csv_writer = writer(out)
+    for row in rows:
+        csv_writer.writerow([encode(value) for value in row])
+        yield out.getvalue()
+        out.seek(0)
+        out.truncate()
+
+
+def iter_chunks(strings, chunk_size=CHUNK_SIZE):
+    """Joins the given strings into chunks of about chunk_size characters.
+
+    This keeps the number of writes to the client low when streaming many
+    small lines.
+    """
+    chunk = []
+    size = 0
+    for string in strings:
+        chunk.append(string)
+        size += len(string)
+        if size >= chunk_size:
+            yield ''.join(chunk)
+            chunk = []
+            size = 0
+    if chunk:
+        yield ''.join(chunk)
+
 
 class CsvDataMixin(object):
 
@@ -62,12 +105,7 @@ class CsvDataMixin(object):
             self.writer.writerow([self.encode(col) for col in args])
 
     def encode(self, value):
-        value = six.text_type(value)
-        if six.PY2:
-            # csv and StringIO cannot work with mixed encodings,
-            # so encode all with utf-8
-            value = value.encode('utf-8')
-        return value
+        return encode(value)
 
 
 class BaseCsvResponse(CsvDataMixin, HttpResponse):
@@ -104,7 +142,14 @@ class BaseCsvResponse(CsvDataMixin, HttpResponse):
 
 class BaseCsvStreamingResponse(CsvDataMixin, StreamingHttpResponse):
 
-    """Base CSV Streaming class. Provides streaming response for CSV data."""
+    """Base CSV Streaming class. Provides streaming response for CSV data.
+
+    The rows returned by ``get_row_data`` are only retrieved while the
+    response is sent and are written in chunks of about ``chunk_size``
+    characters, so ``get_row_data`` can be a generator consuming paginated
+    API results lazily.
+    """
+    chunk_size = CHUNK_SIZE
 
     def __init__(self, request, template, context, content_type, **kwargs):
         super(BaseCsvStreamingResponse, self).__init__()
@@ -124,7 +169,9 @@ class BaseCsvStreamingResponse(CsvDataMixin, StreamingHttpResponse):
 
     def buffer(self):
         buf = self.out.getvalue()
-        self.out.truncate(0)
+        # Rewind as well, or the next rows are written after the old end.
+        self.out.seek(0)
+        self.out.truncate()
         return buf
 
     def get_content(self):
@@ -132,11 +179,14 @@ class BaseCsvStreamingResponse(CsvDataMixin, StreamingHttpResponse):
             self.out.write(self.encode(self.header))
 
         self.write_csv_header()
-        yield self.buffer()
 
         for row in self.get_row_data():
             self.write_csv_row(row)
-            yield self.buffer()
+            if self.out.tell() >= self.chunk_size:
+                yield self.buffer()
+        buf = self.buffer()
+        if buf:
+            yield buf
 
     def get_row_data(self):
         return []
@@ -51,6 +51,16 @@ def add_logout_reason(request, response, reason, status='success'):
         response.set_cookie('logout_status', status, max_age=10)
 
 
+def call_with_language(language, func, *args, **kwargs):
+    """Call func with the translations of the given language activated.
+
+    Translations are activated per thread, so functions run in worker threads
+    have to be given the language of the request thread explicitly.
+    """
+    with translation.override(language):
+        return func(*args, **kwargs)
+
+
 def logout_with_message(request, msg, redirect=True, status='success'):
     """Send HttpResponseRedirect to LOGOUT_URL.
 
@@ -12,7 +12,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import calendar
+import collections
+import datetime
 import functools
+import hashlib
+import threading
+import time
 import warnings
 import weakref
 
@@ -170,3 +176,427 @@ def memoized_with_request(request_func, request_index=0):
 
         return wrapped
     return wrapper
+
+
+def memoized_process(func):
+    """Decorator creating the object returned by ``func`` once per process.
+
+    ``func`` takes no argument. The first call of the decorated function
+    calls it under a lock, and every later call returns the same object.
+    It suits the caches and thread pools of the worker process, which read
+    their size from the settings.
+
+    short example::
+
+        @memoized_process
+        def get_decision_cache():
+            return LocalMemoryBackend(max_entries=getattr(
+                settings, 'POLICY_CHECK_CACHE_MAX_ENTRIES', 10000))
+    """
+    lock = threading.Lock()
+    instances = []
+
+    @functools.wraps(func)
+    def wrapped():
+        if not instances:
+            with lock:
+                if not instances:
+                    instances.append(func())
+        return instances[0]
+    return wrapped
+
+
+class ClientPool(object):
+    """Bounded pool of API clients shared by the requests of a worker.
+
+    Clients are kept in least-recently-used order and the oldest ones are
+    evicted once ``max_entries`` is exceeded. Each client is tagged with
+    the token it was created for, so that it is dropped as soon as that
+    token expires or its user logs out, see :meth:`evict_token`.
+
+    The ``hits``, ``misses`` and ``evictions`` counters are maintained for
+    monitoring and returned together by :meth:`stats`.
+    """
+    def __init__(self, max_entries=100):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clients = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, factory, token_id=None, expires=None):
+        """Return the client stored under key, or create it with factory.
+
+        ``expires`` is the timestamp after which the client must not be
+        used anymore, usually the expiration time of ``token_id``.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._clients.pop(key, None)
+            if entry is not None:
+                if entry[1] is None or entry[1] > now:
+                    self._clients[key] = entry
+                    self.hits += 1
+                    return entry[2]
+                self.evictions += 1
+            self.misses += 1
+        # The client is built outside of the lock, as it may take a while.
+        client = factory()
+        with self._lock:
+            entry = self._clients.pop(key, None)
+            if entry is None:
+                entry = (token_id, expires, client)
+            # Another thread may have stored a client for the same key in
+            # the meantime, in which case that one is kept.
+            self._clients[key] = entry
+            while len(self._clients) > self.max_entries:
+                self._clients.popitem(last=False)
+                self.evictions += 1
+            return entry[2]
+
+    def evict_token(self, token_id):
+        """Drop every client created for the given token."""
+        with self._lock:
+            for key in [key for key, entry in self._clients.items()
+                        if entry[0] == token_id]:
+                del self._clients[key]
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._clients),
+                    'max_entries': self.max_entries,
+                    'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions}
+
+
+_client_pool = None
+_client_pool_lock = threading.Lock()
+
+
+def _evict_logged_out_user(sender, user=None, **kwargs):
+    token = getattr(user, 'token', None)
+    if _client_pool is not None and getattr(token, 'id', None):
+        _client_pool.evict_token(token.id)
+
+
+def get_client_pool():
+    """Return the :class:`ClientPool` of the worker process.
+
+    Its size is set by the ``API_CLIENT_POOL_MAX_ENTRIES`` setting.
+    """
+    global _client_pool
+    if _client_pool is None:
+        from django.conf import settings
+        from django.contrib.auth.signals import user_logged_out
+
+        with _client_pool_lock:
+            if _client_pool is None:
+                _client_pool = ClientPool(getattr(
+                    settings, 'API_CLIENT_POOL_MAX_ENTRIES', 100))
+                user_logged_out.connect(
+                    _evict_logged_out_user,
+                    dispatch_uid='horizon.utils.memoized.client_pool')
+    return _client_pool
+
+
+def get_token_expiration(token):
+    """Return the expiration timestamp of a token, if it has one."""
+    expires = getattr(token, 'expires', None)
+    if expires is None:
+        return None
+    if isinstance(expires, datetime.datetime):
+        # Naive datetimes are in UTC, like the ones parsed from keystone.
+        return calendar.timegm(expires.utctimetuple())
+    return expires
+
+
+def pooled_client(request_func, request_index=0):
+    """Decorator for API client factories keeping clients in a pool.
+
+    It works like :func:`memoized_with_request`: the request argument at
+    ``request_index`` is replaced by the result of ``request_func`` on
+    that request, which must include the token id. The clients are however
+    kept in the bounded pool returned by :func:`get_client_pool` instead of
+    an unbounded cache, and are evicted once the token of the request
+    expires or its user logs out.
+
+    short example::
+
+        def get_auth_params_from_request(request):
+            return (request.user.token.id, base.url_for(request, 'image'))
+
+        @pooled_client(get_auth_params_from_request)
+        def glanceclient(request_auth_params, version=None):
+            token_id, url = request_auth_params
+            return glance_client.Client(version, url, token=token_id)
+    """
+    def wrapper(func):
+        namespace = '%s.%s' % (func.__module__, func.__name__)
+
+        @functools.wraps(func)
+        def wrapped(*args, **kwargs):
+            args = list(args)
+            request = args[request_index]
+            args[request_index] = request_func(request)
+            key = (namespace, tuple(args), tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                warnings.warn(
+                    "The key %r is not hashable and cannot be memoized." %
+                    (key,), UnhashableKeyWarning, 2)
+                return func(*args, **kwargs)
+            token = getattr(getattr(request, 'user', None), 'token', None)
+            return get_client_pool().get(
+                key, lambda: func(*args, **kwargs),
+                token_id=getattr(token, 'id', None),
+                expires=get_token_expiration(token))
+
+        return wrapped
+    return wrapper
+
+
+_NOT_FOUND = object()
+
+
+class LocalMemoryBackend(object):
+    """In-process cache backend for :func:`memoized_shared`.
+
+    Entries are kept in least-recently-used order and the oldest ones are
+    evicted once ``max_entries`` is exceeded. Cached values are shared by
+    all threads of the worker process and are never copied or pickled.
+    """
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, namespace, key, default=_NOT_FOUND):
+        now = time.time()
+        with self._lock:
+            try:
+                expires, value = self._data.pop((namespace, key))
+            except KeyError:
+                return default
+            if expires is not None and expires <= now:
+                return default
+            # Re-insert the entry to mark it as the most recently used.
+            self._data[(namespace, key)] = (expires, value)
+            return value
+
+    def set(self, namespace, key, value, timeout):
+        # Like Django's cache, a timeout of 0 does not cache the value and
+        # None caches it forever.
+        if timeout is not None and timeout <= 0:
+            with self._lock:
+                self._data.pop((namespace, key), None)
+            return
+        expires = time.time() + timeout if timeout is not None else None
+        with self._lock:
+            self._data.pop((namespace, key), None)
+            self._data[(namespace, key)] = (expires, value)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def invalidate(self, namespace):
+        with self._lock:
+            for cache_key in [k for k in self._data if k[0] == namespace]:
+                del self._data[cache_key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class DjangoCacheBackend(object):
+    """Backend for :func:`memoized_shared` built on Django's cache framework.
+
+    This allows cached results to be shared between WSGI worker processes,
+    but requires the results of the decorated functions to be picklable.
+    Invalidation is implemented with a generation counter per namespace,
+    so that no key enumeration is required from the cache server.
+    """
+    def __init__(self, alias='default', key_prefix='horizon:memoized'):
+        from django.core.cache import caches
+        self._cache = caches[alias]
+        self.key_prefix = key_prefix
+
+    def _generation_key(self, namespace):
+        return '%s:generation:%s' % (self.key_prefix, namespace)
+
+    def _make_key(self, namespace, key):
+        generations = self._cache.get_many([self._generation_key(None),
+                                            self._generation_key(namespace)])
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return '%s:%s:%s:%s:%s' % (
+            self.key_prefix, namespace,
+            generations.get(self._generation_key(None), 0),
+            generations.get(self._generation_key(namespace), 0),
+            digest)
+
+    def get(self, namespace, key, default=_NOT_FOUND):
+        return self._cache.get(self._make_key(namespace, key), default)
+
+    def set(self, namespace, key, value, timeout):
+        self._cache.set(self._make_key(namespace, key), value, timeout)
+
+    def invalidate(self, namespace):
+        generation_key = self._generation_key(namespace)
+        try:
+            self._cache.incr(generation_key)
+        except ValueError:
+            self._cache.set(generation_key, 1, None)
+
+    def clear(self):
+        # Never clear the whole cache, it may be shared with sessions.
+        self.invalidate(None)
+
+
+@memoized_process
+def get_shared_backend():
+    """Return the backend configured by ``MEMOIZED_SHARED_BACKEND``.
+
+    The setting follows the format of Django's ``CACHES`` entries::
+
+        MEMOIZED_SHARED_BACKEND = {
+            'BACKEND': 'horizon.utils.memoized.LocalMemoryBackend',
+            'OPTIONS': {'max_entries': 1000},
+        }
+    """
+    from django.conf import settings
+    from django.utils.module_loading import import_string
+
+    config = getattr(settings, 'MEMOIZED_SHARED_BACKEND', {})
+    backend_class = import_string(config.get(
+        'BACKEND', 'horizon.utils.memoized.LocalMemoryBackend'))
+    return backend_class(**config.get('OPTIONS', {}))
+
+
+def clear_shared_cache():
+    """Drop every result cached by :func:`memoized_shared`."""
+    get_shared_backend().clear()
+
+
+def get_request_scope(request):
+    """Return the part of the request the shared cache is keyed on.
+
+    Results are only shared between requests made with the same token
+    against the same project and region.
+    """
+    user = getattr(request, 'user', None)
+    token = getattr(user, 'token', None)
+    return (getattr(token, 'id', None),
+            getattr(user, 'project_id', None),
+            getattr(user, 'services_region', None))
+
+
+def _get_namespace(target):
+    return getattr(target, 'shared_namespace', target)
+
+
+def invalidate_shared(*targets):
+    """Invalidate the results cached by :func:`memoized_shared`.
+
+    Each target is either a function decorated with :func:`memoized_shared`
+    or its namespace name, which avoids import cycles between API modules.
+    Invalidation applies to all requests, not only to the current scope,
+    because the same resources are usually visible from many tokens.
+    """
+    backend = get_shared_backend()
+    for target in targets:
+        backend.invalidate(_get_namespace(target))
+
+
+def invalidates_shared(*targets):
+    """Decorator for functions which modify resources cached elsewhere.
+
+    The given targets are invalidated with :func:`invalidate_shared` once
+    the decorated function returns, or raises, as a failed call could have
+    still changed something.
+
+    short example::
+
+        @invalidates_shared(port_list,
+                            'openstack_dashboard.api.nova.server_list')
+        def port_create(request, network_id, **kwargs):
+            ...
+    """
+    def wrapper(func):
+        @functools.wraps(func)
+        def wrapped(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                invalidate_shared(*targets)
+        return wrapped
+    return wrapper
+
+
+def memoized_shared(timeout=60, namespace=None, request_index=0,
+                    scope_func=get_request_scope):
+    """Decorator caching the results of API calls across requests.
+
+    Unlike :func:`memoized`, which only caches results during the lifetime
+    of a single request object, the results are kept for ``timeout``
+    seconds and reused by any later request with the same scope (token,
+    project and region by default, see :func:`get_request_scope`).
+
+    The request argument at ``request_index``, or the ``request`` keyword
+    argument, is replaced in the cache key by ``scope_func(request)``,
+    while the decorated function still receives the request itself.
+
+    Results are stored under ``namespace``, which defaults to the dotted
+    path of the decorated function. Functions modifying the underlying
+    resources should invalidate it with :func:`invalidates_shared`, or by
+    calling the ``invalidate()`` attribute of the decorated function.
+
+    short example::
+
+        @memoized_shared(timeout=300)
+        def flavor_list(request, is_public=True):
+            return novaclient(request).flavors.list(is_public=is_public)
+
+        @invalidates_shared(flavor_list)
+        def flavor_create(request, name, memory, vcpu, disk):
+            ...
+    """
+    def wrapper(func):
+        func_namespace = namespace or '%s.%s' % (func.__module__,
+                                                 func.__name__)
+
+        @functools.wraps(func)
+        def wrapped(*args, **kwargs):
+            scoped_args = list(args)
+            scoped_kwargs = dict(kwargs)
+            if len(args) > request_index:
+                scoped_args[request_index] = scope_func(args[request_index])
+            else:
+                # The request is passed by keyword, such as by
+                # list_resources_with_long_filters in the neutron API.
+                scoped_kwargs['request'] = scope_func(kwargs['request'])
+            key = (tuple(scoped_args), tuple(sorted(scoped_kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                warnings.warn(
+                    "The key %r is not hashable and cannot be memoized." %
+                    (key,), UnhashableKeyWarning, 2)
+                return func(*args, **kwargs)
+            backend = get_shared_backend()
+            value = backend.get(func_namespace, key)
+            if value is _NOT_FOUND:
+                value = func(*args, **kwargs)
+                backend.set(func_namespace, key, value, timeout)
+            return value
+
+        wrapped.shared_namespace = func_namespace
+        wrapped.invalidate = lambda: invalidate_shared(func_namespace)
+        return wrapped
+    return wrapper
@@ -16,7 +16,9 @@ import copy
 from importlib import import_module
 import inspect
 import logging
+import threading
 
+from django.conf import settings
 from django.core import urlresolvers
 from django import forms
 from django.forms.forms import NON_FIELD_ERRORS
@@ -25,19 +27,27 @@ from django.template.defaultfilters import linebreaks
 from django.template.defaultfilters import safe
 from django.template.defaultfilters import slugify
 from django.utils.encoding import force_text
+from django.utils import translation
 from django.utils.translation import ugettext_lazy as _
+import futurist
 from openstack_auth import policy
 import six
 
 from horizon import base
 from horizon import exceptions
 from horizon.templatetags.horizon import has_permissions
+from horizon.utils import functions as utils
 from horizon.utils import html
 
 
 LOG = logging.getLogger(__name__)
 
 
+# Holds the populate hooks collected while a workflow instantiates the actions
+# of its steps, see Workflow.populate_choices.
+_deferred_choices = threading.local()
+
+
 class WorkflowContext(dict):
     def __init__(self, workflow, *args, **kwargs):
         super(WorkflowContext, self).__init__(*args, **kwargs)
@@ -170,10 +180,17 @@ class Action(forms.Form):
         return "<%s: %s>" % (self.__class__.__name__, self.slug)
 
     def _populate_choices(self, request, context):
+        # Workflows populating the choices of all their steps at once only
+        # collect the hooks here, see Workflow.populate_choices.
+        pending = getattr(_deferred_choices, 'pending', None)
         for field_name, bound_field in self.fields.items():
             meth = getattr(self, "populate_%s_choices" % field_name, None)
             if meth is not None and callable(meth):
-                bound_field.choices = meth(request, context)
+                if pending is not None:
+                    pending.append((self, field_name, bound_field.choices,
+                                    meth, request, context))
+                else:
+                    bound_field.choices = meth(request, context)
 
     def get_help_text(self, extra_context=None):
         """Returns the help text for this step."""
@@ -621,6 +638,19 @@ class Workflow(html.HTMLElement):
         Whether to present the workflow as a wizard, with "prev" and "next"
         buttons and validation after every step.
 
+    .. attribute:: concurrent
+
+        Boolean to control whether the ``populate_<field>_choices`` methods
+        of the actions of all the steps are called concurrently when the
+        workflow is initialized, see :meth:`populate_choices`. Only enable it
+        when those methods are thread-safe, which is usually the case when
+        they only call APIs. Default: ``False``
+
+    .. attribute:: max_workers
+
+        Maximum number of threads used when ``concurrent`` is enabled.
+        Defaults to the ``WORKFLOW_POPULATE_MAX_WORKERS`` setting, or 10.
+
     """
     slug = None
     default_steps = ()
@@ -631,6 +661,8 @@ class Workflow(html.HTMLElement):
     redirect_param_name = "next"
     multipart = False
     wizard = False
+    concurrent = False
+    max_workers = None
     _registerable_class = Step
 
     def __str__(self):
@@ -676,6 +708,9 @@ class Workflow(html.HTMLElement):
         self.context_seed = clean_seed
         self.context.update(clean_seed)
 
+        if request and self.concurrent and self.get_max_workers() > 1:
+            self.populate_choices()
+
         if request and request.method == "POST":
             for step in self.steps:
                 valid = step.action.is_valid()
@@ -686,6 +721,58 @@ class Workflow(html.HTMLElement):
                     data = request.POST
                 self.context = step.contribute(data, self.context)
 
+    def get_max_workers(self):
+        """Returns the number of threads to populate the choices with."""
+        if self.max_workers is not None:
+            return self.max_workers
+        return getattr(settings, 'WORKFLOW_POPULATE_MAX_WORKERS', 10)
+
+    def populate_choices(self):
+        """Instantiates the actions of all steps and populates their choices.
+
+        The ``populate_<field>_choices`` methods of all the actions are run
+        concurrently, so that the workflow is ready about as soon as the
+        slowest of them returns rather than after all of them in turn.
+
+        A method raising an exception only leaves its own field without
+        choices. The exception is handled with
+        :func:`horizon.exceptions.handle` in the request thread, in the order
+        of the steps and fields.
+        """
+        _deferred_choices.pending = pending = []
+        try:
+            for step in self.steps:
+                step.action
+        finally:
+            del _deferred_choices.pending
+        if not pending:
+            return
+
+        language = translation.get_language()
+        max_workers = min(self.get_max_workers(), len(pending))
+        with futurist.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(utils.call_with_language, language,
+                                       meth, request, context)
+                       for action, name, choices, meth, request, context
+                       in pending]
+
+        for (action, name, choices, meth, request, context), future in zip(
+                pending, futures):
+            field = action.fields.get(name)
+            try:
+                populated = future.result()
+            except Exception:
+                label = getattr(field, 'label', None) or name
+                exceptions.handle(self.request,
+                                  _('Unable to retrieve the choices of '
+                                    'the "%s" field.') % label)
+                continue
+            # The action may have removed the field or set its choices
+            # itself once the hook was collected, like it would have
+            # overridden the populated choices otherwise.
+            if field is not None and field.choices == choices:
+                field.choices = populated
+
     @property
     def steps(self):
         if getattr(self, "_ordered_steps", None) is None:
@@ -18,10 +18,13 @@
 
 from collections import Sequence
 import functools
+import time
 
 from django.conf import settings
 
 from horizon import exceptions
+from horizon.utils.memoized import get_shared_backend
+from horizon.utils.memoized import get_token_expiration
 
 import semantic_version
 import six
@@ -104,26 +107,63 @@ class APIVersionManager(object):
         self._active = None
 
 
+class _ResourceAttribute(object):
+    """Non-data descriptor reading one ``_attrs`` entry from the resource.
+
+    Being a non-data descriptor, a value assigned to the same name on the
+    wrapper instance still takes precedence, as it did before.
+    """
+
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return getattr(instance._apiresource, self.name)
+
+
+class APIResourceWrapperMeta(type):
+    """Generates a descriptor for each entry of ``_attrs``.
+
+    Names already defined by the class or one of its bases, such as
+    properties and methods, are left alone so that they keep precedence
+    over the wrapped resource.
+    """
+
+    def __init__(cls, name, bases, attrs):
+        super(APIResourceWrapperMeta, cls).__init__(name, bases, attrs)
+        for attr in cls._attrs:
+            if not any(attr in klass.__dict__ for klass in cls.__mro__):
+                setattr(cls, attr, _ResourceAttribute(attr))
+
+
+@six.add_metaclass(APIResourceWrapperMeta)
 class APIResourceWrapper(object):
     """Simple wrapper for api objects.
 
     Define _attrs on the child class and pass in the
     api object as the only argument to the constructor
     """
+    # Instances only get a __dict__ when a subclass without __slots__ has
+    # an attribute assigned, so plain wrappers stay small.
+    __slots__ = ('_apiresource',)
     _attrs = []
-    _apiresource = None  # Make sure _apiresource is there even in __init__.
 
     def __init__(self, apiresource):
         self._apiresource = apiresource
 
-    def __getattribute__(self, attr):
-        try:
-            return object.__getattribute__(self, attr)
-        except AttributeError:
-            if attr not in self._attrs:
-                raise
-            # __getattr__ won't find properties
-            return getattr(self._apiresource, attr)
+    def __getattr__(self, attr):
+        # Only reached when the normal lookup fails, e.g. when a property
+        # named in _attrs raises AttributeError. Generated attributes have
+        # already asked the resource, so do not ask it twice.
+        if (attr == '_apiresource' or attr not in self._attrs or
+                isinstance(getattr(type(self), attr, None),
+                           _ResourceAttribute)):
+            raise AttributeError(attr)
+        return getattr(self._apiresource, attr)
 
     def __repr__(self):
         return "<%s: %s>" % (self.__class__.__name__,
@@ -149,18 +189,19 @@ class APIDictWrapper(object):
     consistent with api resource objects from novaclient.
     """
 
-    _apidict = {}  # Make sure _apidict is there even in __init__.
+    __slots__ = ('_apidict',)
 
     def __init__(self, apidict):
         self._apidict = apidict
 
-    def __getattribute__(self, attr):
+    def __getattr__(self, attr):
+        # Only reached when the normal lookup fails.
+        if attr == '_apidict':
+            raise AttributeError(attr)
         try:
-            return object.__getattribute__(self, attr)
-        except AttributeError:
-            if attr not in self._apidict:
-                raise
             return self._apidict[attr]
+        except KeyError:
+            raise AttributeError(attr)
 
     def __getitem__(self, item):
         try:
@@ -329,42 +370,129 @@ def get_url_for_service(service, region, endpoint_type):
     return None
 
 
+class ServiceCatalogIndex(object):
+    """Index of the endpoint URLs of a service catalog.
+
+    Looking up a URL with :func:`get_url_for_service` scans the catalog and
+    the endpoints of the service on every call. The index resolves every
+    (service type, region, endpoint type) combination once, including the
+    fallback to ``fallback_endpoint_type``, so that :func:`url_for` and
+    :func:`is_service_enabled` become dictionary lookups.
+    """
+    # Regions of the identity service endpoints are ignored when there is
+    # no endpoint in the requested region, see get_url_for_service.
+    ANY_REGION = '*'
+
+    def __init__(self, catalog, fallback_endpoint_type=None,
+                 endpoint_types=()):
+        self.fallback_endpoint_type = fallback_endpoint_type
+        self._services = {}
+        self._regions = {}
+        self._urls = {}
+        for service in catalog or []:
+            if 'type' in service:
+                self._services.setdefault(service['type'], service)
+        endpoint_types = set(endpoint_types) | set(ENDPOINT_TYPE_TO_INTERFACE)
+        for service_type, service in self._services.items():
+            regions = set(_get_endpoint_region(endpoint)
+                          for endpoint in service.get('endpoints', []))
+            self._regions[service_type] = regions
+            if service_type == 'identity':
+                regions = regions | set([self.ANY_REGION])
+            for region in regions:
+                for endpoint_type in endpoint_types:
+                    self._resolve(service_type, region, endpoint_type)
+
+    def _resolve(self, service_type, region, endpoint_type):
+        service = self._services[service_type]
+        # The ANY_REGION key is resolved with a region no endpoint has, so
+        # that the identity service falls back to any of its endpoints.
+        lookup_region = (object() if region == self.ANY_REGION
+                         else region)
+        url = get_url_for_service(service, lookup_region, endpoint_type)
+        if not url and self.fallback_endpoint_type:
+            url = get_url_for_service(service, lookup_region,
+                                      self.fallback_endpoint_type)
+        self._urls[(service_type, region, endpoint_type)] = url
+        return url
+
+    def url_for(self, service_type, region, endpoint_type):
+        regions = self._regions.get(service_type)
+        if regions is None:
+            return None
+        if region not in regions:
+            if service_type != 'identity':
+                return None
+            region = self.ANY_REGION
+        try:
+            return self._urls[(service_type, region, endpoint_type)]
+        except KeyError:
+            # Endpoint types other than the configured ones are resolved
+            # on first use.
+            return self._resolve(service_type, region, endpoint_type)
+
+    def is_service_enabled(self, service_type, region):
+        regions = self._regions.get(service_type)
+        if not regions:
+            return False
+        return service_type == 'identity' or region in regions
+
+
+CATALOG_INDEX_CACHE = 'openstack_dashboard.api.base.catalog_index'
+# Used for tokens without an expiration time.
+DEFAULT_CATALOG_INDEX_TIMEOUT = 3600
+
+
+def get_catalog_index(request):
+    """Return the :class:`ServiceCatalogIndex` of the request user.
+
+    The index is kept on the user object for the rest of the request and in
+    the shared cache for the later requests made with the same token, as
+    the catalog of a token never changes.
+    """
+    user = request.user
+    fallback_endpoint_type = getattr(settings, 'SECONDARY_ENDPOINT_TYPE',
+                                     None)
+    index = getattr(user, '_catalog_index', None)
+    if (index is not None and
+            index.fallback_endpoint_type == fallback_endpoint_type):
+        return index
+    token = getattr(user, 'token', None)
+    token_id = getattr(token, 'id', None)
+    key = (token_id, fallback_endpoint_type)
+    backend = get_shared_backend()
+    index = backend.get(CATALOG_INDEX_CACHE, key, None) if token_id else None
+    if index is None:
+        endpoint_type = getattr(settings, 'OPENSTACK_ENDPOINT_TYPE',
+                                'internalURL')
+        index = ServiceCatalogIndex(user.service_catalog,
+                                    fallback_endpoint_type,
+                                    endpoint_types=(endpoint_type,))
+        if token_id:
+            expires = get_token_expiration(token)
+            timeout = (max(int(expires - time.time()), 1) if expires
+                       else DEFAULT_CATALOG_INDEX_TIMEOUT)
+            backend.set(CATALOG_INDEX_CACHE, key, index, timeout)
+    user._catalog_index = index
+    return index
+
+
 def url_for(request, service_type, endpoint_type=None, region=None):
     endpoint_type = endpoint_type or getattr(settings,
                                              'OPENSTACK_ENDPOINT_TYPE',
                                              'internalURL')
-    fallback_endpoint_type = getattr(settings, 'SECONDARY_ENDPOINT_TYPE', None)
-
-    catalog = request.user.service_catalog
-    service = get_service_from_catalog(catalog, service_type)
-    if service:
-        if not region:
-            region = request.user.services_region
-        url = get_url_for_service(service,
-                                  region,
-                                  endpoint_type)
-        if not url and fallback_endpoint_type:
-            url = get_url_for_service(service,
-                                      region,
-                                      fallback_endpoint_type)
-        if url:
-            return url
+    if not region:
+        region = request.user.services_region
+    url = get_catalog_index(request).url_for(service_type, region,
+                                             endpoint_type)
+    if url:
+        return url
     raise exceptions.ServiceCatalogException(service_type)
 
 
 def is_service_enabled(request, service_type):
-    service = get_service_from_catalog(request.user.service_catalog,
-                                       service_type)
-    if service:
-        region = request.user.services_region
-        for endpoint in service.get('endpoints', []):
-            if 'type' not in service:
-                continue
-            # ignore region for identity
-            if service['type'] == 'identity' or \
-               _get_endpoint_region(endpoint) == region:
-                return True
-    return False
+    return get_catalog_index(request).is_service_enabled(
+        service_type, request.user.services_region)
 
 
 def _get_endpoint_region(endpoint):
@@ -33,8 +33,10 @@ from cinderclient.v2.contrib import list_extensions as cinder_list_extensions
 
 from horizon import exceptions
 from horizon.utils import functions as utils
+from horizon.utils.memoized import invalidates_shared
 from horizon.utils.memoized import memoized
 from horizon.utils.memoized import memoized_with_request
+from horizon.utils.memoized import pooled_client
 
 from openstack_dashboard.api import base
 from openstack_dashboard.api import microversions
@@ -48,6 +50,10 @@ LOG = logging.getLogger(__name__)
 VOLUME_STATE_AVAILABLE = "available"
 DEFAULT_QUOTA_NAME = 'default'
 
+# Namespaces of the shared caches invalidated by volume changes.
+QUOTA_USAGE_CACHES = ('openstack_dashboard.usage.quotas.'
+                      'tenant_quota_usages',)
+
 # Available consumer choices associated with QOS Specs
 CONSUMER_CHOICES = (
     ('back-end', _('back-end')),
@@ -192,7 +198,7 @@ def get_auth_params_from_request(request):
     )
 
 
-@memoized_with_request(get_auth_params_from_request)
+@pooled_client(get_auth_params_from_request)
 def cinderclient(request_auth_params, version=None):
     if version is None:
         api_version = VERSIONS.get_active_version()
@@ -356,6 +362,7 @@ def volume_get(request, volume_id):
 
 
 @profiler.trace
+@invalidates_shared(*QUOTA_USAGE_CACHES)
 def volume_create(request, size, name, description, volume_type,
                   snapshot_id=None, metadata=None, image_id=None,
                   availability_zone=None, source_volid=None):
@@ -374,11 +381,13 @@ def volume_create(request, size, name, description, volume_type,
 
 
 @profiler.trace
+@invalidates_shared(*QUOTA_USAGE_CACHES)
 def volume_extend(request, volume_id, new_size):
     return cinderclient(request).volumes.extend(volume_id, new_size)
 
 
 @profiler.trace
+@invalidates_shared(*QUOTA_USAGE_CACHES)
 def volume_delete(request, volume_id):
     return cinderclient(request).volumes.delete(volume_id)
 
@@ -490,6 +499,7 @@ def volume_snapshot_list_paged(request, search_opts=None, marker=None,
 
 
 @profiler.trace
+@invalidates_shared(*QUOTA_USAGE_CACHES)
 def volume_snapshot_create(request, volume_id, name,
                            description=None, force=False):
     data = {'name': name,
@@ -502,6 +512,7 @@ def volume_snapshot_create(request, volume_id, name,
 
 
 @profiler.trace
+@invalidates_shared(*QUOTA_USAGE_CACHES)
 def volume_snapshot_delete(request, snapshot_id):
     return cinderclient(request).volume_snapshots.delete(snapshot_id)
 
@@ -704,6 +715,7 @@ def volume_backup_list_paged(request, marker=None, paginate=False,
 
 
 @profiler.trace
+@invalidates_shared(*QUOTA_USAGE_CACHES)
 def volume_backup_create(request,
                          volume_id,
                          container_name,
@@ -723,6 +735,7 @@ def volume_backup_create(request,
 
 
 @profiler.trace
+@invalidates_shared(*QUOTA_USAGE_CACHES)
 def volume_backup_delete(request, backup_id):
     return cinderclient(request).backups.delete(backup_id)
 
@@ -770,6 +783,7 @@ def tenant_quota_get(request, tenant_id):
 
 
 @profiler.trace
+@invalidates_shared(*QUOTA_USAGE_CACHES)
 def tenant_quota_update(request, tenant_id, **kwargs):
     return cinderclient(request).quotas.update(tenant_id, **kwargs)
 
@@ -820,6 +834,7 @@ def volume_type_get_with_qos_association(request, volume_type_id):
 
 
 @profiler.trace
+@invalidates_shared(*QUOTA_USAGE_CACHES)
 def default_quota_update(request, **kwargs):
     cinderclient(request).quota_classes.update(DEFAULT_QUOTA_NAME, **kwargs)
 
@@ -19,22 +19,28 @@
 from __future__ import absolute_import
 
 import collections
+import io
 import itertools
 import json
 import logging
 import os
+import threading
 
 from django.conf import settings
 from django.core.files.uploadedfile import InMemoryUploadedFile
-from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.utils.translation import ugettext_lazy as _
 
+import futurist
 import glanceclient as glance_client
 import six
-from six.moves import _thread as thread
 
+from horizon import exceptions
 from horizon.utils import functions as utils
+from horizon.utils.memoized import get_shared_backend
 from horizon.utils.memoized import memoized
+from horizon.utils.memoized import memoized_process
+from horizon.utils.memoized import pooled_client
 from openstack_dashboard.api import base
 from openstack_dashboard.contrib.developer.profiler import api as profiler
 
@@ -68,18 +74,22 @@ class Image(base.APIResourceWrapper):
     def __init__(self, apiresource):
         super(Image, self).__init__(apiresource)
 
-    def __getattribute__(self, attr):
+    def __getattr__(self, attr):
         # Because Glance v2 treats custom properties as normal
         # attributes, we need to be more flexible than the resource
-        # wrappers usually allow. In v1 they were defined under a
-        # "properties" attribute.
-        if VERSIONS.active >= 2 and attr == "properties":
+        # wrappers usually allow.
+        if attr == '_apiresource':
+            raise AttributeError(attr)
+        return getattr(self._apiresource, attr)
+
+    @property
+    def properties(self):
+        # In v1 custom properties are defined under a "properties"
+        # attribute.
+        if VERSIONS.active >= 2:
             return {k: v for (k, v) in self._apiresource.items()
                     if self.property_visible(k)}
-        try:
-            return object.__getattribute__(self, attr)
-        except AttributeError:
-            return getattr(self._apiresource, attr)
+        return self._apiresource.properties
 
     @property
     def name(self):
@@ -130,11 +140,19 @@ class Image(base.APIResourceWrapper):
         return not self.__eq__(other_image)
 
 
-@memoized
-def glanceclient(request, version=None):
+def get_auth_params_from_request(request):
+    """Extracts properties needed by glanceclient from the request object.
+
+    These will be used to pool the glanceclient instances.
+    """
+    return (request.user.token.id, base.url_for(request, 'image'))
+
+
+@pooled_client(get_auth_params_from_request)
+def glanceclient(request_auth_params, version=None):
     api_version = VERSIONS.get_active_version()
 
-    url = base.url_for(request, 'image')
+    token_id, url = request_auth_params
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
 
@@ -142,10 +160,10 @@ def glanceclient(request, version=None):
     # to stop hardcoding a version in this file. Once that's done we
     # can get rid of the deprecated 'version' parameter.
     if version is None:
-        return api_version['client'].Client(url, token=request.user.token.id,
+        return api_version['client'].Client(url, token=token_id,
                                             insecure=insecure, cacert=cacert)
     else:
-        return glance_client.Client(version, url, token=request.user.token.id,
+        return glance_client.Client(version, url, token=token_id,
                                     insecure=insecure, cacert=cacert)
 
 
@@ -416,6 +434,237 @@ class ExternallyUploadedImage(Image):
         return self._token_id
 
 
+# Namespace of the shared cache holding the state of the image uploads, so
+# that their progress can be queried and they can be cancelled from any
+# worker process.
+IMAGE_UPLOAD_CACHE = 'openstack_dashboard.api.glance.image_uploads'
+
+# Number of bytes uploaded between two updates of the shared state.
+IMAGE_UPLOAD_PROGRESS_INTERVAL = 1024 * 1024
+
+# Time during which the state of a finished upload can still be queried.
+IMAGE_UPLOAD_STATE_TIMEOUT = 3600
+
+IMAGE_UPLOAD_FINISHED = ('done', 'failed', 'cancelled')
+
+# The uploads of the worker process which are not finished, by image id.
+_image_uploads = {}
+_image_uploads_lock = threading.Lock()
+
+
+class ImageUploadCancelled(Exception):
+    """Raised by the data of an upload once the upload has been cancelled."""
+
+
+class ImageUpload(object):
+    """Upload of the data of an image to glance by an upload worker.
+
+    Its state, as returned by :meth:`to_dict`, is kept in the shared cache
+    under the image id while it runs and for
+    ``IMAGE_UPLOAD_STATE_TIMEOUT`` seconds once it is finished.
+    """
+
+    def __init__(self, request, image_id, data):
+        self.request = request
+        self.image_id = image_id
+        self.user_id = request.user.id
+        self.project_id = request.user.project_id
+        self.name = getattr(data, 'name', None)
+        self.size = getattr(data, 'size', None)
+        self.file = _detach_uploaded_file(data)
+        self.bytes_uploaded = 0
+        self.status = 'queued'
+        self.error = None
+        self.cancel_requested = False
+        self.future = None
+        self._bytes_published = 0
+
+    def to_dict(self):
+        return {
+            'image_id': self.image_id,
+            'user_id': self.user_id,
+            'project_id': self.project_id,
+            'name': self.name,
+            'size': self.size,
+            'bytes_uploaded': self.bytes_uploaded,
+            'status': self.status,
+            'error': self.error,
+            'cancel_requested': self.cancel_requested,
+        }
+
+    def publish(self):
+        """Stores the state of the upload in the shared cache.
+
+        A cancellation requested from another worker process through the
+        shared state is picked up at the same time.
+        """
+        backend = get_shared_backend()
+        state = backend.get(IMAGE_UPLOAD_CACHE, self.image_id, None)
+        if state is not None and state.get('cancel_requested'):
+            self.cancel_requested = True
+        backend.set(IMAGE_UPLOAD_CACHE, self.image_id, self.to_dict(),
+                    IMAGE_UPLOAD_STATE_TIMEOUT)
+        self._bytes_published = self.bytes_uploaded
+
+    def read(self, size=-1):
+        """Reads the next chunk of the data, as the glance client does."""
+        if self.cancel_requested:
+            raise ImageUploadCancelled()
+        chunk = self.file.read(size)
+        self.bytes_uploaded += len(chunk)
+        if (self.bytes_uploaded - self._bytes_published >=
+                IMAGE_UPLOAD_PROGRESS_INTERVAL):
+            self.publish()
+        return chunk
+
+    def tell(self):
+        return self.file.tell()
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        return self.file.seek(offset, whence)
+
+    def close(self):
+        """Closes the data of the upload and removes its temporary file."""
+        filename = getattr(self.file, 'name', None)
+        try:
+            self.file.close()
+            if (isinstance(filename, six.string_types) and
+                    os.path.isfile(filename)):
+                os.remove(filename)
+        except Exception as e:
+            LOG.warning('Failed to remove temporary image file '
+                        '%(file)s (%(e)s)',
+                        {'file': filename or self.file, 'e': e})
+
+
+def _detach_uploaded_file(data):
+    """Returns the file of an uploaded file which is not closed by Django.
+
+    Django closes the uploaded files of a request once its response is
+    sent, which removes their temporary file. The file of the upload is
+    replaced by an empty one instead of copying its content.
+    """
+    if isinstance(data, (TemporaryUploadedFile, InMemoryUploadedFile)):
+        data_file = data.file
+        data.file = io.BytesIO()
+        return data_file
+    return data
+
+
+@memoized_process
+def _get_image_upload_executor():
+    """Returns the pool of upload workers of the worker process.
+
+    Its size is set by the ``IMAGE_UPLOAD_MAX_WORKERS`` setting, the
+    uploads exceeding it are queued.
+    """
+    return futurist.ThreadPoolExecutor(
+        max_workers=getattr(settings, 'IMAGE_UPLOAD_MAX_WORKERS', 4))
+
+
+def _check_image_upload_limit(request):
+    limit = getattr(settings, 'IMAGE_UPLOAD_MAX_PER_USER', 2)
+    if not limit:
+        return
+    with _image_uploads_lock:
+        uploads = [upload for upload in _image_uploads.values()
+                   if upload.user_id == request.user.id]
+    if len(uploads) >= limit:
+        raise exceptions.Conflict(
+            _('Too many image uploads are in progress. Please wait for '
+              'one of them to finish before uploading another image.'))
+
+
+def _finish_image_upload(upload, status, error=None):
+    upload.close()
+    upload.status = status
+    upload.error = error
+    with _image_uploads_lock:
+        _image_uploads.pop(upload.image_id, None)
+    upload.publish()
+
+
+def _cancel_image_upload(upload):
+    _finish_image_upload(upload, 'cancelled')
+    try:
+        glanceclient(upload.request).images.delete(upload.image_id)
+    except Exception:
+        LOG.warning('Failed to delete the image %s of a cancelled upload',
+                    upload.image_id, exc_info=True)
+
+
+def _upload_image_data(upload):
+    """Uploads the data of an image, run by an upload worker."""
+    upload.status = 'uploading'
+    upload.publish()
+    if upload.cancel_requested:
+        _cancel_image_upload(upload)
+        return
+    try:
+        if VERSIONS.active < 2:
+            glanceclient(upload.request).images.update(
+                upload.image_id, data=upload, purge_props=False)
+        else:
+            glanceclient(upload.request).images.upload(upload.image_id,
+                                                       upload)
+    except Exception as e:
+        # The glance client may wrap the exceptions raised while reading.
+        if upload.cancel_requested:
+            _cancel_image_upload(upload)
+        else:
+            LOG.exception('Failed to upload the data of the image %s',
+                          upload.image_id)
+            _finish_image_upload(upload, 'failed', six.text_type(e))
+    else:
+        _finish_image_upload(upload, 'done')
+
+
+def _start_image_upload(request, image_id, data):
+    upload = ImageUpload(request, image_id, data)
+    with _image_uploads_lock:
+        _image_uploads[image_id] = upload
+    upload.publish()
+    upload.future = _get_image_upload_executor().submit(_upload_image_data,
+                                                        upload)
+    return upload
+
+
+def image_upload_get(request, image_id):
+    """Returns the state of the upload of the data of an image.
+
+    Only the user who started the upload gets it, None is returned for
+    the other users and for unknown uploads.
+    """
+    state = get_shared_backend().get(IMAGE_UPLOAD_CACHE, image_id, None)
+    if state is None or state['user_id'] != request.user.id:
+        return None
+    return state
+
+
+def image_upload_cancel(request, image_id):
+    """Cancels the upload of the data of an image.
+
+    An upload still queued is cancelled at once, a running one stops
+    before reading its next chunk and the image is deleted. Returns the
+    state of the upload, or None as :func:`image_upload_get` does.
+    """
+    state = image_upload_get(request, image_id)
+    if state is None or state['status'] in IMAGE_UPLOAD_FINISHED:
+        return state
+    with _image_uploads_lock:
+        upload = _image_uploads.get(image_id)
+    if upload is None:
+        # The upload runs in another worker process.
+        state['cancel_requested'] = True
+        get_shared_backend().set(IMAGE_UPLOAD_CACHE, image_id, state,
+                                 IMAGE_UPLOAD_STATE_TIMEOUT)
+        return state
+    upload.cancel_requested = True
+    if upload.future is not None and upload.future.cancel():
+        _cancel_image_upload(upload)
+    return upload.to_dict()
+
+
 @profiler.trace
 def image_create(request, **kwargs):
     """Create image.
@@ -431,13 +680,20 @@ def image_create(request, **kwargs):
     asynchronously.
 
     In the case of 'data' the process of uploading the data may take
-    some time and is handed off to a separate thread.
+    some time and is handed off to the pool of upload workers. Its
+    progress is returned by :func:`image_upload_get` and it can be
+    cancelled with :func:`image_upload_cancel`. A user can only run
+    ``IMAGE_UPLOAD_MAX_PER_USER`` uploads at a time in a worker process,
+    :class:`horizon.exceptions.Conflict` is raised beyond.
     """
     data = kwargs.pop('data', None)
     location = None
     if VERSIONS.active >= 2:
         location = kwargs.pop('location', None)
 
+    if data and not isinstance(data, six.string_types):
+        _check_image_upload_limit(request)
+
     image = glanceclient(request).images.create(**kwargs)
     if location is not None:
         glanceclient(request).images.add_location(image.id, location, {})
@@ -447,36 +703,7 @@ def image_create(request, **kwargs):
             # The image data is meant to be uploaded externally, return a
             # special wrapper to bypass the web server in a subsequent upload
             return ExternallyUploadedImage(image, request)
-        elif isinstance(data, TemporaryUploadedFile):
-            # Hack to fool Django, so we can keep file open in the new thread.
-            data.file.close_called = True
-        elif isinstance(data, InMemoryUploadedFile):
-            # Clone a new file for InMemeoryUploadedFile.
-            # Because the old one will be closed by Django.
-            data = SimpleUploadedFile(data.name,
-                                      data.read(),
-                                      data.content_type)
-        if VERSIONS.active < 2:
-            thread.start_new_thread(image_update,
-                                    (request, image.id),
-                                    {'data': data})
-        else:
-            def upload():
-                try:
-                    return glanceclient(request).images.upload(image.id, data)
-                finally:
-                    if data:
-                        try:
-                            os.remove(data.file.name)
-                        except Exception as e:
-                            filename = str(data.file)
-                            if hasattr(data.file, 'name'):
-                                filename = data.file.name
-                            msg = (('Failed to remove temporary image file '
-                                    '%(file)s (%(e)s)') %
-                                   dict(file=filename, e=str(e)))
-                            LOG.warning(msg)
-            thread.start_new_thread(upload, ())
+        _start_image_upload(request, image.id, data)
 
     return Image(image)
 
@@ -19,6 +19,7 @@
 
 import collections
 import logging
+import time
 
 from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
@@ -33,6 +34,7 @@ from openstack_auth import utils as auth_utils
 from horizon import exceptions
 from horizon import messages
 from horizon.utils import functions as utils
+from horizon.utils import memoized
 
 from openstack_dashboard.api import base
 from openstack_dashboard.contrib.developer.profiler import api as profiler
@@ -44,6 +46,13 @@ DEFAULT_ROLE = None
 DEFAULT_DOMAIN = getattr(settings, 'OPENSTACK_KEYSTONE_DEFAULT_DOMAIN',
                          'Default')
 
+# Namespace of the shared cache holding the projects of each user and token.
+AUTHORIZED_TENANT_CACHE = 'openstack_dashboard.api.keystone.authorized_tenants'
+
+# The details of a project needed by the project switcher.
+AuthorizedTenant = collections.namedtuple(
+    'AuthorizedTenant', ('id', 'name', 'enabled', 'description', 'domain_id'))
+
 
 # Set up our data structure for managing Identity API versions, and
 # add a couple utility methods to it.
@@ -152,7 +161,9 @@ def keystoneclient(request, admin=False):
     as a keyword argument.
 
     The client is cached so that subsequent API calls during the same
-    request/response cycle don't have to be re-authenticated.
+    request/response cycle don't have to be re-authenticated. It is also
+    kept in the client pool of the worker and reused by later requests made
+    with the same token.
     """
     api_version = VERSIONS.get_active_version()
     user = request.user
@@ -191,15 +202,26 @@ def keystoneclient(request, admin=False):
         # cert failures on querying Keystone admin endpoints
         insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', True)
         cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
-        LOG.debug("Creating a new keystoneclient connection to %s.", endpoint)
         remote_addr = request.environ.get('REMOTE_ADDR', '')
-        conn = api_version['client'].Client(token=token_id,
-                                            endpoint=endpoint,
-                                            original_ip=remote_addr,
-                                            insecure=insecure,
-                                            cacert=cacert,
-                                            auth_url=endpoint,
-                                            debug=settings.DEBUG)
+
+        def create_client():
+            LOG.debug("Creating a new keystoneclient connection to %s.",
+                      endpoint)
+            return api_version['client'].Client(token=token_id,
+                                                endpoint=endpoint,
+                                                original_ip=remote_addr,
+                                                insecure=insecure,
+                                                cacert=cacert,
+                                                auth_url=endpoint,
+                                                debug=settings.DEBUG)
+
+        # The client is also reused by later requests made with the same
+        # token, until the token expires or its user logs out.
+        conn = memoized.get_client_pool().get(
+            (api_version['client'].Client, token_id, endpoint, remote_addr),
+            create_client,
+            token_id=user.token.id,
+            expires=memoized.get_token_expiration(user.token))
         setattr(request, cache_attr, conn)
     return conn
 
@@ -399,6 +421,36 @@ def tenant_list(request, paginate=False, marker=None, domain=None, user=None,
     return tenants, has_more_data
 
 
+@profiler.trace
+def authorized_tenant_list(request):
+    """Return the projects the current user is authorized on.
+
+    The projects are kept as AuthorizedTenant records in the shared cache,
+    per user and token, until the token expires.
+    """
+    user = request.user
+    token = getattr(user, 'token', None)
+    key = (user.id, getattr(token, 'id', None))
+    backend = memoized.get_shared_backend()
+    tenants = backend.get(AUTHORIZED_TENANT_CACHE, key, None)
+    if tenants is not None:
+        return tenants
+
+    tenants = [AuthorizedTenant(id=tenant.id,
+                                name=tenant.name,
+                                enabled=getattr(tenant, 'enabled', True),
+                                description=getattr(tenant, 'description',
+                                                    None),
+                                domain_id=getattr(tenant, 'domain_id', None))
+               for tenant in user.authorized_tenants]
+    expires = memoized.get_token_expiration(token)
+    if key[1] and expires is not None:
+        timeout = int(expires - time.time())
+        if timeout > 0:
+            backend.set(AUTHORIZED_TENANT_CACHE, key, tenants, timeout)
+    return tenants
+
+
 @profiler.trace
 def tenant_update(request, project, name=None, description=None,
                   enabled=None, domain=None, **kwargs):
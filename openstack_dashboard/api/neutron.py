@@ -23,20 +23,28 @@
 from __future__ import absolute_import
 
 import collections
+import contextlib
 import copy
+import itertools
 import logging
+import threading
 
 import netaddr
 
 from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
+import futurist
 from neutronclient.common import exceptions as neutron_exc
 from neutronclient.v2_0 import client as neutron_client
 import six
 
 from horizon import exceptions
 from horizon import messages
+from horizon.utils.memoized import get_shared_backend
+from horizon.utils.memoized import invalidates_shared
 from horizon.utils.memoized import memoized
+from horizon.utils.memoized import memoized_shared
+from horizon.utils.memoized import pooled_client
 from openstack_dashboard.api import base
 from openstack_dashboard.api import nova
 from openstack_dashboard.contrib.developer.profiler import api as profiler
@@ -52,6 +60,29 @@ QOS_TYPE_SCHEDULER = "scheduler"
 OFF_STATE = 'OFF'
 ON_STATE = 'ON'
 
+# Concurrent requests used to list resources with long filters, and how
+# long the URI length accepted by an endpoint is remembered for.
+LONG_FILTER_MAX_WORKERS = 8
+URI_BUDGET_CACHE = 'openstack_dashboard.api.neutron.uri_budget'
+URI_BUDGET_TIMEOUT = 3600
+
+# Namespaces of the shared caches invalidated by resource changes.
+TOPOLOGY_CACHES = ('openstack_dashboard.dashboards.project.'
+                   'network_topology.views.topology',)
+SUBNET_CACHES = ('openstack_dashboard.api.neutron.subnet_list',
+                 ) + TOPOLOGY_CACHES
+PORT_CACHES = ('openstack_dashboard.api.neutron.port_list',
+               'openstack_dashboard.api.neutron.floating_ip_target_list',
+               ) + TOPOLOGY_CACHES
+FLOATING_IP_CACHES = ('openstack_dashboard.api.neutron.'
+                      'tenant_floating_ip_list',)
+QUOTA_USAGE_CACHES = ('openstack_dashboard.usage.quotas.'
+                      'tenant_quota_usages',)
+
+# Subnets retrieved by the network listings of network_list_for_tenant, by
+# id, so that its sub-queries retrieve each subnet once.
+_shared_subnets = threading.local()
+
 ROUTER_INTERFACE_OWNERS = (
     'network:router_interface',
     'network:router_interface_distributed',
@@ -480,6 +511,24 @@ class FloatingIpTarget(base.APIDictWrapper):
         super(FloatingIpTarget, self).__init__(target)
 
 
+class FloatingIpTargetList(list):
+    """List of floating IP association targets indexed by instance and port.
+
+    ``by_instance`` and ``by_port`` map instance ids and port ids to the
+    ids of their targets, in the order of the list.
+    """
+
+    def __init__(self, targets=()):
+        super(FloatingIpTargetList, self).__init__(targets)
+        self.by_instance = {}
+        self.by_port = {}
+        for target in self:
+            self.by_instance.setdefault(target['instance_id'],
+                                        []).append(target['id'])
+            self.by_port.setdefault(target['port_id'],
+                                    []).append(target['id'])
+
+
 class FloatingIpManager(object):
     """Manager class to implement Floating IP methods
 
@@ -651,13 +700,22 @@ class FloatingIpManager(object):
         'id' and 'name' attributes must be defined in each object.
         FloatingIpTarget.id can be passed as port_id in associate().
         FloatingIpTarget.name is displayed in Floating Ip Association Form.
+
+        The targets are returned in a FloatingIpTargetList, which
+        ``get_target_id_by_instance`` and ``list_target_id_by_instance``
+        look up without going through the whole list.
         """
         tenant_id = self.request.user.tenant_id
-        ports = port_list(self.request, tenant_id=tenant_id)
-        servers, has_more = nova.server_list(self.request, detailed=False)
+        # The server names are retrieved from nova while the ports and
+        # their reachability are retrieved from neutron.
+        with futurist.ThreadPoolExecutor(max_workers=1) as e:
+            servers = e.submit(nova.server_list, self.request,
+                               detailed=False)
+            ports = port_list(self.request, tenant_id=tenant_id)
+            reachable_subnets = self._get_reachable_subnets(ports)
+        servers, has_more = servers.result()
         server_dict = collections.OrderedDict(
             [(s.id, s.name) for s in servers])
-        reachable_subnets = self._get_reachable_subnets(ports)
 
         targets = []
         for p in ports:
@@ -671,7 +729,7 @@ class FloatingIpManager(object):
                     continue
                 targets.append(FloatingIpTarget(p, ip['ip_address'],
                                                 server_name))
-        return targets
+        return FloatingIpTargetList(targets)
 
     def _target_ports_by_instance(self, instance_id):
         if not instance_id:
@@ -690,6 +748,10 @@ class FloatingIpManager(object):
             information is retrieved from a back-end inside the method.
         """
         if target_list is not None:
+            by_instance = getattr(target_list, 'by_instance', None)
+            if by_instance is not None:
+                targets = by_instance.get(instance_id)
+                return targets[0] if targets else None
             targets = [target for target in target_list
                        if target['instance_id'] == instance_id]
             if not targets:
@@ -715,6 +777,9 @@ class FloatingIpManager(object):
             is retrieved from a back-end inside the method.
         """
         if target_list is not None:
+            by_instance = getattr(target_list, 'by_instance', None)
+            if by_instance is not None:
+                return list(by_instance.get(instance_id, []))
             return [target['id'] for target in target_list
                     if target['instance_id'] == instance_id]
         else:
@@ -764,17 +829,81 @@ def get_ipver_str(ip_version):
     return IP_VERSION_DICT.get(ip_version, '')
 
 
-@memoized
-def neutronclient(request):
+def get_auth_params_from_request(request):
+    """Extracts properties needed by neutronclient from the request object.
+
+    These will be used to pool the neutronclient instances.
+    """
+    return (request.user.token.id,
+            base.url_for(request, 'identity'),
+            base.url_for(request, 'network'))
+
+
+@pooled_client(get_auth_params_from_request)
+def neutronclient(request_auth_params):
+    token_id, auth_url, network_url = request_auth_params
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
-    c = neutron_client.Client(token=request.user.token.id,
-                              auth_url=base.url_for(request, 'identity'),
-                              endpoint_url=base.url_for(request, 'network'),
+    c = neutron_client.Client(token=token_id,
+                              auth_url=auth_url,
+                              endpoint_url=network_url,
                               insecure=insecure, ca_cert=cacert)
     return c
 
 
+def _get_uri_budget_key(list_method, filter_attr, params):
+    # The maximum URI length is a property of the neutron endpoint, while
+    # the base URI length depends on the listed resource and filter name.
+    request = params.get('request') or getattr(
+        getattr(list_method, '__self__', None), 'request', None)
+    endpoint = None
+    if request is not None:
+        try:
+            endpoint = base.url_for(request, 'network')
+        except exceptions.ServiceCatalogException:
+            pass
+    return (endpoint, getattr(list_method, '__name__', None), filter_attr)
+
+
+def _list_resources_in_chunks(list_method, filter_attr, filter_values,
+                              allowed_filter_len, **params):
+    # Length of each query filter is:
+    # <key>=<value>& (e.g., id=<uuid>)
+    # The length will be key_len + value_maxlen + 2
+    val_maxlen = max(len(val) for val in filter_values)
+    filter_maxlen = len(filter_attr) + val_maxlen + 2
+    chunk_size = max(allowed_filter_len // filter_maxlen, 1)
+    # Tuples keep the chunks hashable for the listings cached by
+    # memoized_shared.
+    chunks = [tuple(filter_values[i:i + chunk_size])
+              for i in range(0, len(filter_values), chunk_size)]
+
+    def _list_chunk(chunk):
+        chunk_params = dict(params)
+        chunk_params[filter_attr] = chunk
+        return list_method(**chunk_params)
+
+    max_workers = min(len(chunks), LONG_FILTER_MAX_WORKERS)
+    if max_workers > 1:
+        with futurist.ThreadPoolExecutor(max_workers=max_workers) as e:
+            futures = [e.submit(_list_chunk, chunk) for chunk in chunks]
+        results = [future.result() for future in futures]
+    else:
+        results = [_list_chunk(chunk) for chunk in chunks]
+
+    # Merge the chunks in order, dropping resources returned twice.
+    resources = []
+    seen_ids = set()
+    for resource in itertools.chain.from_iterable(results):
+        resource_id = getattr(resource, 'id', None)
+        if resource_id is not None:
+            if resource_id in seen_ids:
+                continue
+            seen_ids.add(resource_id)
+        resources.append(resource)
+    return resources
+
+
 @profiler.trace
 def list_resources_with_long_filters(list_method,
                                      filter_attr, filter_values, **params):
@@ -783,7 +912,11 @@ def list_resources_with_long_filters(list_method,
     If filter parameters are long, list resources API request leads to
     414 error (URL is too long). For such case, this method split
     list parameters specified by a list_field argument into chunks
-    and call the specified list_method repeatedly.
+    and call the specified list_method concurrently for each of them.
+
+    The number of filter characters accepted by the neutron endpoint is
+    remembered in the shared cache, so that later calls with long filters
+    are split right away instead of paying for the rejected request again.
 
     :param list_method: Method used to retrieve resource list.
     :param filter_attr: attribute name to be filtered. The value corresponding
@@ -798,6 +931,28 @@ def list_resources_with_long_filters(list_method,
         without any changes. You can specify more filter conditions
         in addition to a pair of filter_attr and filter_values.
     """
+    if not isinstance(filter_values, (list, tuple, set, frozenset)):
+        params[filter_attr] = filter_values
+        return list_method(**params)
+
+    # We consider only the filter condition from (filter_attr,
+    # filter_values) and do not consider other filter conditions
+    # which may be specified in **params.
+    values = []
+    seen_values = set()
+    for val in filter_values:
+        if val not in seen_values:
+            seen_values.add(val)
+            values.append(val)
+    all_filter_len = sum(len(filter_attr) + len(val) + 2 for val in values)
+
+    budget_key = _get_uri_budget_key(list_method, filter_attr, params)
+    backend = get_shared_backend()
+    allowed_filter_len = backend.get(URI_BUDGET_CACHE, budget_key, None)
+    if allowed_filter_len is not None and all_filter_len > allowed_filter_len:
+        return _list_resources_in_chunks(list_method, filter_attr, values,
+                                         allowed_filter_len, **params)
+
     try:
         params[filter_attr] = filter_values
         return list_method(**params)
@@ -805,29 +960,13 @@ def list_resources_with_long_filters(list_method,
         # The URI is too long because of too many filter values.
         # Use the excess attribute of the exception to know how many
         # filter values can be inserted into a single request.
-
-        # We consider only the filter condition from (filter_attr,
-        # filter_values) and do not consider other filter conditions
-        # which may be specified in **params.
-        if not isinstance(filter_values, (list, tuple, set, frozenset)):
-            filter_values = [filter_values]
-
-        # Length of each query filter is:
-        # <key>=<value>& (e.g., id=<uuid>)
-        # The length will be key_len + value_maxlen + 2
-        all_filter_len = sum(len(filter_attr) + len(val) + 2
-                             for val in filter_values)
-        allowed_filter_len = all_filter_len - uri_len_exc.excess
-
-        val_maxlen = max(len(val) for val in filter_values)
-        filter_maxlen = len(filter_attr) + val_maxlen + 2
-        chunk_size = allowed_filter_len // filter_maxlen
-
-        resources = []
-        for i in range(0, len(filter_values), chunk_size):
-            params[filter_attr] = filter_values[i:i + chunk_size]
-            resources.extend(list_method(**params))
-        return resources
+        sent_filter_len = sum(len(filter_attr) + len(val) + 2
+                              for val in filter_values)
+        allowed_filter_len = sent_filter_len - uri_len_exc.excess
+        backend.set(URI_BUDGET_CACHE, budget_key, allowed_filter_len,
+                    URI_BUDGET_TIMEOUT)
+        return _list_resources_in_chunks(list_method, filter_attr, values,
+                                         allowed_filter_len, **params)
 
 
 @profiler.trace
@@ -850,19 +989,61 @@ def trunk_show(request, trunk_id):
     return Trunk(trunk)
 
 
+@contextlib.contextmanager
+def _sharing_subnets():
+    """Shares the subnets retrieved by the network listings in the block."""
+    outer = getattr(_shared_subnets, 'subnets', None)
+    if outer is None:
+        _shared_subnets.subnets = {}
+    try:
+        yield
+    finally:
+        if outer is None:
+            _shared_subnets.subnets = None
+
+
+def _expand_subnets(request, networks):
+    """Replaces the subnet ids of network dicts by their Subnet.
+
+    Only the subnets the networks refer to are retrieved, filtered by id
+    and split into as many calls as the URI length requires.
+    """
+    subnet_dict = getattr(_shared_subnets, 'subnets', None)
+    if subnet_dict is None:
+        subnet_dict = {}
+    subnet_ids = set(subnet_id for n in networks
+                     for subnet_id in n.get('subnets', [])
+                     if isinstance(subnet_id, six.string_types) and
+                     subnet_id not in subnet_dict)
+    if subnet_ids:
+        # NOTE: A tuple keeps the filter hashable for @memoized_shared.
+        subnets = list_resources_with_long_filters(
+            subnet_list, 'id', tuple(sorted(subnet_ids)), request=request)
+        subnet_dict.update((s['id'], s) for s in subnets)
+    for n in networks:
+        subnets = []
+        for subnet in n.get('subnets', []):
+            if not isinstance(subnet, six.string_types):
+                subnets.append(subnet)
+            # Due to potential timing issues, we can't assume the
+            # subnet_dict data is in sync with the network data.
+            elif subnet in subnet_dict:
+                subnets.append(subnet_dict[subnet])
+        n['subnets'] = subnets
+
+
 @profiler.trace
-def network_list(request, **params):
+def network_list(request, expand_subnet=True, **params):
+    """Returns the networks matching params.
+
+    The subnet ids of the networks are replaced by their Subnet, unless
+    expand_subnet is False, which saves listing the subnets when only the
+    networks themselves are needed.
+    """
     LOG.debug("network_list(): params=%s", params)
     networks = neutronclient(request).list_networks(**params).get('networks')
-    # Get subnet list to expand subnet info in network list.
-    subnets = subnet_list(request)
-    subnet_dict = dict([(s['id'], s) for s in subnets])
-    # Expand subnet list from subnet_id to values.
-    for n in networks:
-        # Due to potential timing issues, we can't assume the subnet_dict data
-        # is in sync with the network data.
-        n['subnets'] = [subnet_dict[s] for s in n.get('subnets', []) if
-                        s in subnet_dict]
+    if expand_subnet:
+        _expand_subnets(request, networks)
     return [Network(n) for n in networks]
 
 
@@ -882,29 +1063,32 @@ def network_list_for_tenant(request, tenant_id, include_external=False,
     if shared is not None:
         del params['shared']
 
-    if shared in (None, False):
-        # If a user has admin role, network list returned by Neutron API
-        # contains networks that do not belong to that tenant.
-        # So we need to specify tenant_id when calling network_list().
-        networks += network_list(request, tenant_id=tenant_id,
-                                 shared=False, **params)
-
-    if shared in (None, True):
-        # In the current Neutron API, there is no way to retrieve
-        # both owner networks and public networks in a single API call.
-        networks += network_list(request, shared=True, **params)
-    params['router:external'] = params.get('router:external', True)
-    if params['router:external'] and include_external:
-        if shared is not None:
-            params['shared'] = shared
-        fetched_net_ids = [n.id for n in networks]
-        # Retrieves external networks when router:external is not specified
-        # in (filtering) params or router:external=True filter is specified.
-        # When router:external=False is specified there is no need to query
-        # networking API because apparently nothing will match the filter.
-        ext_nets = network_list(request, **params)
-        networks += [n for n in ext_nets if
-                     n.id not in fetched_net_ids]
+    # The sub-queries share the subnets they retrieve.
+    with _sharing_subnets():
+        if shared in (None, False):
+            # If a user has admin role, network list returned by Neutron API
+            # contains networks that do not belong to that tenant.
+            # So we need to specify tenant_id when calling network_list().
+            networks += network_list(request, tenant_id=tenant_id,
+                                     shared=False, **params)
+
+        if shared in (None, True):
+            # In the current Neutron API, there is no way to retrieve
+            # both owner networks and public networks in a single API call.
+            networks += network_list(request, shared=True, **params)
+        params['router:external'] = params.get('router:external', True)
+        if params['router:external'] and include_external:
+            if shared is not None:
+                params['shared'] = shared
+            fetched_net_ids = [n.id for n in networks]
+            # Retrieves external networks when router:external is not
+            # specified in (filtering) params or router:external=True filter
+            # is specified. When router:external=False is specified there is
+            # no need to query networking API because apparently nothing will
+            # match the filter.
+            ext_nets = network_list(request, **params)
+            networks += [n for n in ext_nets if
+                         n.id not in fetched_net_ids]
 
     return networks
 
@@ -937,6 +1121,7 @@ def network_get(request, network_id, expand_subnet=True, **params):
 
 
 @profiler.trace
+@invalidates_shared(*(QUOTA_USAGE_CACHES + TOPOLOGY_CACHES))
 def network_create(request, **kwargs):
     """Create a  network object.
 
@@ -954,6 +1139,7 @@ def network_create(request, **kwargs):
 
 
 @profiler.trace
+@invalidates_shared(*TOPOLOGY_CACHES)
 def network_update(request, network_id, **kwargs):
     LOG.debug("network_update(): netid=%(network_id)s, params=%(params)s",
               {'network_id': network_id, 'params': kwargs})
@@ -964,13 +1150,14 @@ def network_update(request, network_id, **kwargs):
 
 
 @profiler.trace
+@invalidates_shared(*(SUBNET_CACHES + PORT_CACHES + QUOTA_USAGE_CACHES))
 def network_delete(request, network_id):
     LOG.debug("network_delete(): netid=%s", network_id)
     neutronclient(request).delete_network(network_id)
 
 
 @profiler.trace
-@memoized
+@memoized_shared(timeout=30)
 def subnet_list(request, **params):
     LOG.debug("subnet_list(): params=%s", params)
     subnets = neutronclient(request).list_subnets(**params).get('subnets')
@@ -987,6 +1174,7 @@ def subnet_get(request, subnet_id, **params):
 
 
 @profiler.trace
+@invalidates_shared(*(SUBNET_CACHES + QUOTA_USAGE_CACHES))
 def subnet_create(request, network_id, **kwargs):
     """Create a subnet on a specified network.
 
@@ -1016,6 +1204,7 @@ def subnet_create(request, network_id, **kwargs):
 
 
 @profiler.trace
+@invalidates_shared(*SUBNET_CACHES)
 def subnet_update(request, subnet_id, **kwargs):
     LOG.debug("subnet_update(): subnetid=%(subnet_id)s, kwargs=%(kwargs)s",
               {'subnet_id': subnet_id, 'kwargs': kwargs})
@@ -1026,6 +1215,7 @@ def subnet_update(request, subnet_id, **kwargs):
 
 
 @profiler.trace
+@invalidates_shared(*(SUBNET_CACHES + PORT_CACHES + QUOTA_USAGE_CACHES))
 def subnet_delete(request, subnet_id):
     LOG.debug("subnet_delete(): subnetid=%s", subnet_id)
     neutronclient(request).delete_subnet(subnet_id)
@@ -1107,7 +1297,7 @@ def subnetpool_delete(request, subnetpool_id):
 
 
 @profiler.trace
-@memoized
+@memoized_shared(timeout=10)
 def port_list(request, **params):
     LOG.debug("port_list(): params=%s", params)
     ports = neutronclient(request).list_ports(**params).get('ports')
@@ -1130,6 +1320,7 @@ def unescape_port_kwargs(**kwargs):
 
 
 @profiler.trace
+@invalidates_shared(*(PORT_CACHES + QUOTA_USAGE_CACHES))
 def port_create(request, network_id, **kwargs):
     """Create a port on a specified network.
 
@@ -1152,12 +1343,14 @@ def port_create(request, network_id, **kwargs):
 
 
 @profiler.trace
+@invalidates_shared(*(PORT_CACHES + QUOTA_USAGE_CACHES))
 def port_delete(request, port_id):
     LOG.debug("port_delete(): portid=%s", port_id)
     neutronclient(request).delete_port(port_id)
 
 
 @profiler.trace
+@invalidates_shared(*PORT_CACHES)
 def port_update(request, port_id, **kwargs):
     LOG.debug("port_update(): portid=%(port_id)s, kwargs=%(kwargs)s",
               {'port_id': port_id, 'kwargs': kwargs})
@@ -1168,6 +1361,7 @@ def port_update(request, port_id, **kwargs):
 
 
 @profiler.trace
+@invalidates_shared(*(QUOTA_USAGE_CACHES + TOPOLOGY_CACHES))
 def router_create(request, **kwargs):
     LOG.debug("router_create():, kwargs=%s", kwargs)
     body = {'router': {}}
@@ -1179,6 +1373,7 @@ def router_create(request, **kwargs):
 
 
 @profiler.trace
+@invalidates_shared(*TOPOLOGY_CACHES)
 def router_update(request, r_id, **kwargs):
     LOG.debug("router_update(): router_id=%(r_id)s, kwargs=%(kwargs)s",
               {'r_id': r_id, 'kwargs': kwargs})
@@ -1210,11 +1405,14 @@ def router_list_on_l3_agent(request, l3_agent_id, **params):
 
 
 @profiler.trace
+@invalidates_shared(*(PORT_CACHES + FLOATING_IP_CACHES +
+                      QUOTA_USAGE_CACHES))
 def router_delete(request, router_id):
     neutronclient(request).delete_router(router_id)
 
 
 @profiler.trace
+@invalidates_shared(*PORT_CACHES)
 def router_add_interface(request, router_id, subnet_id=None, port_id=None):
     body = {}
     if subnet_id:
@@ -1226,6 +1424,7 @@ def router_add_interface(request, router_id, subnet_id=None, port_id=None):
 
 
 @profiler.trace
+@invalidates_shared(*PORT_CACHES)
 def router_remove_interface(request, router_id, subnet_id=None, port_id=None):
     body = {}
     if subnet_id:
@@ -1235,6 +1434,7 @@ def router_remove_interface(request, router_id, subnet_id=None, port_id=None):
     neutronclient(request).remove_interface_router(router_id, body)
 
 
+@invalidates_shared(*PORT_CACHES)
 def router_add_gateway(request, router_id, network_id,
                        ip_address=None, enable_snat=None):
     body = {'network_id': network_id}
@@ -1246,6 +1446,7 @@ def router_add_gateway(request, router_id, network_id,
 
 
 @profiler.trace
+@invalidates_shared(*PORT_CACHES)
 def router_remove_gateway(request, router_id):
     neutronclient(request).remove_gateway_router(router_id)
 
@@ -1293,6 +1494,7 @@ def tenant_quota_get(request, tenant_id):
 
 
 @profiler.trace
+@invalidates_shared(*QUOTA_USAGE_CACHES)
 def tenant_quota_update(request, tenant_id, **kwargs):
     quotas = {'quota': kwargs}
     return neutronclient(request).update_quota(tenant_id, quotas)
@@ -1347,7 +1549,7 @@ def floating_ip_pools_list(request):
     return FloatingIpManager(request).list_pools()
 
 
-@memoized
+@memoized_shared(timeout=10)
 def tenant_floating_ip_list(request, all_tenants=False):
     return FloatingIpManager(request).list(all_tenants=all_tenants)
 
@@ -1356,23 +1558,35 @@ def tenant_floating_ip_get(request, floating_ip_id):
     return FloatingIpManager(request).get(floating_ip_id)
 
 
+@invalidates_shared(*(FLOATING_IP_CACHES + QUOTA_USAGE_CACHES))
 def tenant_floating_ip_allocate(request, pool=None, tenant_id=None, **params):
     return FloatingIpManager(request).allocate(pool, tenant_id, **params)
 
 
+@invalidates_shared(*(FLOATING_IP_CACHES + QUOTA_USAGE_CACHES))
 def tenant_floating_ip_release(request, floating_ip_id):
     return FloatingIpManager(request).release(floating_ip_id)
 
 
+@invalidates_shared(*FLOATING_IP_CACHES)
 def floating_ip_associate(request, floating_ip_id, port_id):
     return FloatingIpManager(request).associate(floating_ip_id, port_id)
 
 
+@invalidates_shared(*FLOATING_IP_CACHES)
 def floating_ip_disassociate(request, floating_ip_id):
     return FloatingIpManager(request).disassociate(floating_ip_id)
 
 
+@profiler.trace
+@memoized_shared(timeout=10)
 def floating_ip_target_list(request):
+    """Returns the floating IP association targets of the project.
+
+    The targets are kept in the shared cache, so that opening the
+    association dialog again does not list the ports, the servers and the
+    routers of the project again.
+    """
     return FloatingIpManager(request).list_targets()
 
 
@@ -1403,10 +1617,12 @@ def security_group_get(request, sg_id):
     return SecurityGroupManager(request).get(sg_id)
 
 
+@invalidates_shared(*QUOTA_USAGE_CACHES)
 def security_group_create(request, name, desc):
     return SecurityGroupManager(request).create(name, desc)
 
 
+@invalidates_shared(*QUOTA_USAGE_CACHES)
 def security_group_delete(request, sg_id):
     return SecurityGroupManager(request).delete(sg_id)
 
@@ -1438,6 +1654,33 @@ def server_update_security_groups(request, instance_id,
         instance_id, new_security_group_ids)
 
 
+@profiler.trace
+def _servers_get_ports(request, server_ids):
+    # NOTE(e0ne): we need tuple here to work with @memoized decorator.
+    # @memoized works with hashable arguments only.
+    return list_resources_with_long_filters(
+        port_list, 'device_id', tuple(server_ids), request=request)
+
+
+@profiler.trace
+def _servers_get_floating_ips(request, port_ids, all_tenants):
+    fips = FloatingIpManager(request)
+    if not fips.is_supported():
+        return []
+    return list_resources_with_long_filters(
+        fips.list, 'port_id', tuple(port_ids), all_tenants=all_tenants)
+
+
+@profiler.trace
+def _servers_get_networks(request, network_ids):
+    # NOTE(e0ne): we need frozenset here to work with @memoized decorator.
+    # @memoized works with hashable arguments only
+    # Only the network names are used, their subnets are not expanded.
+    return list_resources_with_long_filters(
+        network_list, 'id', frozenset(network_ids), request=request,
+        expand_subnet=False)
+
+
 # TODO(pkarikh) need to uncomment when osprofiler will have no
 # issues with unicode in:
 # openstack_dashboard/test/test_data/nova_data.py#L470 data
@@ -1447,39 +1690,43 @@ def servers_update_addresses(request, servers, all_tenants=False):
 
        Should be used when up to date networking information is required,
        and Nova's networking info caching mechanism is not fast enough.
+
+       The floating IPs and networks of the ports are retrieved
+       concurrently, as both only depend on the ports of the servers.
     """
 
     # Get all (filtered for relevant servers) information from Neutron
     try:
-        # NOTE(e0ne): we need tuple here to work with @memoized decorator.
-        # @memoized works with hashable arguments only.
-        ports = list_resources_with_long_filters(
-            port_list, 'device_id',
-            tuple([instance.id for instance in servers]),
-            request=request)
-        fips = FloatingIpManager(request)
-        if fips.is_supported():
-            floating_ips = list_resources_with_long_filters(
-                fips.list, 'port_id', tuple([port.id for port in ports]),
-                all_tenants=all_tenants)
+        ports = _servers_get_ports(request,
+                                   [instance.id for instance in servers])
+
+        # Map instance to its ports, and gather the ids the other lookups
+        # are filtered on.
+        instances_ports = collections.defaultdict(list)
+        port_ids = []
+        network_ids = set()
+        for port in ports:
+            instances_ports[port.device_id].append(port)
+            port_ids.append(port.id)
+            network_ids.add(port.network_id)
+
+        if ports:
+            with futurist.ThreadPoolExecutor(max_workers=2) as e:
+                floating_ips = e.submit(_servers_get_floating_ips, request,
+                                        port_ids, all_tenants)
+                networks = e.submit(_servers_get_networks, request,
+                                    network_ids)
+            floating_ips = floating_ips.result()
+            networks = networks.result()
         else:
             floating_ips = []
-        # NOTE(e0ne): we need frozenset here to work with @memoized decorator.
-        # @memoized works with hashable arguments only
-        networks = list_resources_with_long_filters(
-            network_list, 'id', frozenset([port.network_id for port in ports]),
-            request=request)
+            networks = []
     except Exception as e:
         LOG.error('Unable to connect to Neutron: %s', e)
         error_message = _('Unable to connect to Neutron.')
         messages.error(request, error_message)
         return
 
-    # Map instance to its ports
-    instances_ports = collections.defaultdict(list)
-    for port in ports:
-        instances_ports[port.device_id].append(port)
-
     # Map port to its floating ips
     ports_floating_ips = collections.defaultdict(list)
     for fip in floating_ips:
@@ -30,6 +30,7 @@ import logging
 from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
 
+import futurist
 import novaclient as nc
 from novaclient import api_versions
 from novaclient import client as nova_client
@@ -45,8 +46,11 @@ from novaclient.v2 import wrs_providernets
 from horizon import exceptions
 from horizon import exceptions as horizon_exceptions
 from horizon.utils import functions as utils
+from horizon.utils.memoized import invalidates_shared
 from horizon.utils.memoized import memoized
+from horizon.utils.memoized import memoized_shared
 from horizon.utils.memoized import memoized_with_request
+from horizon.utils.memoized import pooled_client
 
 from openstack_dashboard.api import base
 from openstack_dashboard.api import microversions
@@ -66,6 +70,21 @@ DEFAULT_QUOTA_NAME = 'default'
 INSECURE = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
 CACERT = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
 
+# Namespaces of the shared caches invalidated by flavor and server changes.
+FLAVOR_CACHES = ('openstack_dashboard.api.nova.flavor_get',
+                 'openstack_dashboard.api.nova.flavor_list')
+QUOTA_USAGE_CACHES = ('openstack_dashboard.usage.quotas.'
+                      'tenant_quota_usages',)
+SERVER_CACHES = ('openstack_dashboard.api.neutron.port_list',
+                 'openstack_dashboard.api.neutron.floating_ip_target_list',
+                 'openstack_dashboard.api.neutron.tenant_floating_ip_list',
+                 'openstack_dashboard.dashboards.project.network_topology.'
+                 'views.topology') + QUOTA_USAGE_CACHES
+
+# Concurrent requests used to retrieve the server groups which are listed
+# without their details.
+SERVER_GROUP_GET_MAX_WORKERS = 8
+
 
 @memoized
 def get_microversion(request, feature):
@@ -173,6 +192,17 @@ class Server(base.APIResourceWrapper):
         return getattr(self, 'wrs-if:nics', [])
 
 
+class ServerGroup(base.APIResourceWrapper):
+    """Simple wrapper around novaclient.server_groups.ServerGroup."""
+
+    _attrs = ['id', 'name', 'policies', 'members', 'metadata', 'project_id',
+              'user_id']
+
+    @property
+    def member_count(self):
+        return len(self.members or [])
+
+
 class Hypervisor(base.APIDictWrapper):
     """Simple wrapper around novaclient.hypervisors.Hypervisor."""
 
@@ -250,7 +280,7 @@ class FlavorExtraSpec(object):
 def get_auth_params_from_request(request):
     """Extracts properties needed by novaclient call from the request object.
 
-    These will be used to memoize the calls to novaclient.
+    These will be used to pool the novaclient instances.
     """
     return (
         request.user.username,
@@ -263,13 +293,14 @@ def get_auth_params_from_request(request):
 
 
 def novaclient(request_auth_params, version=None):
-    # WRS: fix uncontrolled memoized growth
+    # WRS: fix uncontrolled memoized growth, the clients are pooled per
+    # version string rather than per APIVersion instance.
     if version and type(version) is not str:
         version = version.get_string()
     return _novaclient(request_auth_params, version)
 
 
-@memoized_with_request(get_auth_params_from_request)
+@pooled_client(get_auth_params_from_request)
 def _novaclient(request_auth_params, version=None):
     (
         username,
@@ -359,6 +390,7 @@ def server_serial_console(request, instance_id, console_type='serial'):
 
 
 @profiler.trace
+@invalidates_shared(*FLAVOR_CACHES)
 def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
                   ephemeral=0, swap=0, metadata=None, is_public=True,
                   rxtx_factor=1):
@@ -373,11 +405,13 @@ def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
 
 
 @profiler.trace
+@invalidates_shared(*FLAVOR_CACHES)
 def flavor_delete(request, flavor_id):
     novaclient(request).flavors.delete(flavor_id)
 
 
 @profiler.trace
+@memoized_shared(timeout=300)
 def flavor_get(request, flavor_id, get_extras=False):
     flavor = novaclient(request).flavors.get(flavor_id)
     if get_extras:
@@ -386,7 +420,7 @@ def flavor_get(request, flavor_id, get_extras=False):
 
 
 @profiler.trace
-@memoized
+@memoized_shared(timeout=300)
 def flavor_list(request, is_public=True, get_extras=False):
     """Get the list of available instance sizes (flavors)."""
     flavors = novaclient(request).flavors.list(is_public=is_public)
@@ -459,6 +493,7 @@ def flavor_access_list(request, flavor=None):
 
 
 @profiler.trace
+@invalidates_shared(*FLAVOR_CACHES)
 def add_tenant_to_flavor(request, flavor, tenant):
     """Add a tenant to the given flavor access list."""
     return novaclient(request).flavor_access.add_tenant_access(
@@ -466,6 +501,7 @@ def add_tenant_to_flavor(request, flavor, tenant):
 
 
 @profiler.trace
+@invalidates_shared(*FLAVOR_CACHES)
 def remove_tenant_from_flavor(request, flavor, tenant):
     """Remove a tenant from the given flavor access list."""
     return novaclient(request).flavor_access.remove_tenant_access(
@@ -485,6 +521,7 @@ def flavor_get_extras(request, flavor_id, raw=False, flavor=None):
 
 
 @profiler.trace
+@invalidates_shared(*FLAVOR_CACHES)
 def flavor_extra_delete(request, flavor_id, keys):
     """Unset the flavor extra spec keys."""
     flavor = novaclient(request).flavors.get(flavor_id)
@@ -492,6 +529,7 @@ def flavor_extra_delete(request, flavor_id, keys):
 
 
 @profiler.trace
+@invalidates_shared(*FLAVOR_CACHES)
 def flavor_extra_set(request, flavor_id, metadata):
     """Set the flavor extra spec keys."""
     flavor = novaclient(request).flavors.get(flavor_id)
@@ -531,6 +569,7 @@ def keypair_get(request, keypair_id):
 
 
 @profiler.trace
+@invalidates_shared(*SERVER_CACHES)
 def server_create(request, name, image, flavor, key_name, user_data,
                   security_groups, block_device_mapping=None,
                   block_device_mapping_v2=None, nics=None,
@@ -550,6 +589,7 @@ def server_create(request, name, image, flavor, key_name, user_data,
 
 
 @profiler.trace
+@invalidates_shared(*SERVER_CACHES)
 def server_delete(request, instance_id):
     novaclient(request).servers.delete(instance_id)
 
@@ -600,6 +640,46 @@ def server_list(request, search_opts=None, detailed=True):
     return (servers, has_more_data)
 
 
+@profiler.trace
+def _server_list_page(nova_client, detailed, search_opts, marker, limit):
+    return nova_client.servers.list(detailed, search_opts,
+                                    marker=marker, limit=limit)
+
+
+def server_iter(request, search_opts=None, detailed=True, page_size=None):
+    """Lazily iterates over all the servers matching ``search_opts``.
+
+    Unlike :func:`server_list`, which returns a single page bounded by
+    ``API_RESULT_LIMIT``, this walks Nova's marker pagination and only
+    requests the next page of ``page_size`` servers once the previous one
+    has been consumed, so callers can stop early or process servers
+    incrementally without holding all of them in memory.
+    """
+    nova_client = get_novaclient_with_locked_status(request)
+    search_opts = dict(search_opts or {})
+    search_opts.pop('paginate', None)
+    search_opts.pop('limit', None)
+    marker = search_opts.pop('marker', None)
+    if page_size is None:
+        page_size = getattr(settings, 'API_RESULT_LIMIT', 1000)
+
+    if search_opts.get('all_tenants', False):
+        search_opts['all_tenants'] = True
+    else:
+        search_opts['project_id'] = request.user.tenant_id
+
+    while True:
+        # Nova cuts the pages short at its own osapi_max_limit, so only an
+        # empty page marks the end of the list.
+        servers = _server_list_page(nova_client, detailed, search_opts,
+                                    marker, page_size)
+        if not servers:
+            return
+        for server in servers:
+            yield Server(server, request)
+        marker = servers[-1].id
+
+
 @profiler.trace
 def server_console_output(request, instance_id, tail_length=None):
     """Gets console output of an instance."""
@@ -677,17 +757,20 @@ def server_live_migrate(request, instance_id, host, block_migration=False,
 
 
 @profiler.trace
+@invalidates_shared(*QUOTA_USAGE_CACHES)
 def server_resize(request, instance_id, flavor, disk_config=None, **kwargs):
     novaclient(request).servers.resize(instance_id, flavor,
                                        disk_config, **kwargs)
 
 
 @profiler.trace
+@invalidates_shared(*QUOTA_USAGE_CACHES)
 def server_confirm_resize(request, instance_id):
     novaclient(request).servers.confirm_resize(instance_id)
 
 
 @profiler.trace
+@invalidates_shared(*QUOTA_USAGE_CACHES)
 def server_revert_resize(request, instance_id):
     novaclient(request).servers.revert_resize(instance_id)
 
@@ -730,6 +813,7 @@ def tenant_quota_get(request, tenant_id):
 
 
 @profiler.trace
+@invalidates_shared(*QUOTA_USAGE_CACHES)
 def tenant_quota_update(request, tenant_id, **kwargs):
     if kwargs:
         novaclient(request).quotas.update(tenant_id, **kwargs)
@@ -741,6 +825,7 @@ def default_quota_get(request, tenant_id):
 
 
 @profiler.trace
+@invalidates_shared(*QUOTA_USAGE_CACHES)
 def default_quota_update(request, **kwargs):
     novaclient(request).quota_classes.update(
         DEFAULT_QUOTA_NAME, **kwargs)
@@ -973,7 +1058,38 @@ def server_group_get(request, server_group_id):
     return novaclient(request).server_groups.get(server_group_id)
 
 
+def _has_server_group_details(server_group):
+    # Looking the attributes up would lazy load a server group missing them.
+    info = getattr(server_group, '_info', None) or vars(server_group)
+    return 'policies' in info and 'members' in info
+
+
+@profiler.trace
+def server_group_list_detailed(request, all_projects=False):
+    """Returns the server groups with their policies and members.
+
+    The server groups returned by the list API normally include both
+    already. Those which do not are retrieved with concurrent
+    server_group_get calls, rather than one after another.
+    """
+    if all_projects:
+        server_groups = server_group_list(request, all_projects=True)
+    else:
+        server_groups = server_group_list(request)
+    incomplete = [sg for sg in server_groups
+                  if not _has_server_group_details(sg)]
+    if incomplete:
+        max_workers = min(len(incomplete), SERVER_GROUP_GET_MAX_WORKERS)
+        with futurist.ThreadPoolExecutor(max_workers=max_workers) as e:
+            futures = dict((sg.id, e.submit(server_group_get, request, sg.id))
+                           for sg in incomplete)
+        server_groups = [futures[sg.id].result() if sg.id in futures else sg
+                         for sg in server_groups]
+    return [ServerGroup(sg) for sg in server_groups]
+
+
 @profiler.trace
+@invalidates_shared(*QUOTA_USAGE_CACHES)
 def server_group_create(request, name, project_id, metadata, policies):
     return novaclient(request).server_groups.create(name,
                                                     project_id,
@@ -982,6 +1098,7 @@ def server_group_create(request, name, project_id, metadata, policies):
 
 
 @profiler.trace
+@invalidates_shared(*QUOTA_USAGE_CACHES)
 def server_group_delete(request, server_group_id):
     return novaclient(request).server_groups.delete(server_group_id)
 
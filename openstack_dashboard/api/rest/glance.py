@@ -18,6 +18,8 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views import generic
 from six.moves import zip as izip
 
+from horizon import exceptions
+
 from openstack_dashboard import api
 from openstack_dashboard.api.rest import urls
 from openstack_dashboard.api.rest import utils as rest_utils
@@ -111,6 +113,38 @@ class ImageProperties(generic.View):
         )
 
 
+@urls.register
+class ImageUpload(generic.View):
+    """API for the upload of the data of an image through Horizon."""
+    url_regex = r'glance/images/(?P<image_id>[^/]+)/upload/$'
+
+    @rest_utils.ajax()
+    def get(self, request, image_id):
+        """Get the progress of the upload of the data of an image.
+
+        The result has the properties "size" and "bytes_uploaded", the
+        size being null when it is not known, and "status", which is one of
+        "queued", "uploading", "done", "failed" or "cancelled". The
+        progress is only available to the user who started the upload.
+
+        http://localhost/api/glance/images/cc758c90-3d98-4ea1-af44-aab405c9c915/upload/
+        """
+        upload = api.glance.image_upload_get(request, image_id)
+        if upload is None:
+            raise rest_utils.AjaxError(404, 'No upload of image %s' % image_id)
+        return upload
+
+    @rest_utils.ajax()
+    def delete(self, request, image_id):
+        """Cancel the upload of the data of an image.
+
+        The image is deleted once the upload is stopped. This method
+        returns HTTP 204 (no content) on success.
+        """
+        if api.glance.image_upload_cancel(request, image_id) is None:
+            raise rest_utils.AjaxError(404, 'No upload of image %s' % image_id)
+
+
 class UploadObjectForm(forms.Form):
     data = forms.FileField(required=False)
 
@@ -174,7 +208,10 @@ class Images(generic.View):
         meta = create_image_metadata(request.DATA)
         meta['data'] = data['data']
 
-        image = api.glance.image_create(request, **meta)
+        try:
+            image = api.glance.image_create(request, **meta)
+        except exceptions.Conflict as e:
+            return rest_utils.JSONResponse(str(e), e.status_code)
         return rest_utils.CreatedResponse(
             '/api/glance/images/%s' % image.name,
             image.to_dict()
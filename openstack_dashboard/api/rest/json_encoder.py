@@ -15,15 +15,77 @@ import json
 import json.encoder as encoder
 
 from django.utils.translation import ugettext_lazy as _
+from oslo_serialization import jsonutils
 import six
 
 
+def to_primitive(o):
+    """Converts the objects the JSON encoders do not support.
+
+    API wrappers are encoded through their ``to_dict()`` method, so that the
+    REST views can return them as they are.
+    """
+    to_dict = getattr(o, 'to_dict', None)
+    if callable(to_dict):
+        return to_dict()
+    return jsonutils.to_primitive(o)
+
+
+def _iterencode_value(o, json_encoder):
+    if isinstance(o, (list, tuple)):
+        yield '['
+        for i, item in enumerate(o):
+            if i:
+                yield json_encoder.item_separator
+            yield json_encoder.encode(item)
+        yield ']'
+    else:
+        yield json_encoder.encode(o)
+
+
+def iterencode(o, json_encoder):
+    """Yields the JSON of o, encoding the items of its lists one at a time.
+
+    Only the outer dictionary and the lists it holds are split, each of their
+    items is encoded at once by ``json_encoder``, so that the C accelerated
+    encoder of the standard library is still used for them.
+    """
+    if not isinstance(o, dict):
+        for chunk in _iterencode_value(o, json_encoder):
+            yield chunk
+        return
+    items = o.items()
+    if json_encoder.sort_keys:
+        items = sorted(items)
+    yield '{'
+    for i, (key, value) in enumerate(items):
+        if i:
+            yield json_encoder.item_separator
+        yield json_encoder.encode(six.text_type(key))
+        yield json_encoder.key_separator
+        for chunk in _iterencode_value(value, json_encoder):
+            yield chunk
+    yield '}'
+
+
 class NaNJSONEncoder(json.JSONEncoder):
     def __init__(self, nan_str='NaN', inf_str='1e+999', **kwargs):
         self.nan_str = nan_str
         self.inf_str = inf_str
         super(NaNJSONEncoder, self).__init__(**kwargs)
 
+    def _c_iterencode(self, o):
+        kwargs = {'skipkeys': self.skipkeys,
+                  'ensure_ascii': self.ensure_ascii,
+                  'check_circular': self.check_circular,
+                  'allow_nan': False,
+                  'sort_keys': self.sort_keys,
+                  'separators': (self.item_separator, self.key_separator),
+                  'default': self.default}
+        if six.PY2:
+            kwargs['encoding'] = self.encoding
+        return json.JSONEncoder(**kwargs).iterencode(o, _one_shot=True)
+
     def iterencode(self, o, _one_shot=False):
         """JSON encoder with NaN and float inf support.
 
@@ -34,6 +96,17 @@ class NaNJSONEncoder(json.JSONEncoder):
         convince Javascript JSON.parse() to create a Javascript Infinity
         object if we feed a token `1e+999` to it.
         """
+        # The C accelerated encoder cannot output the special floats, so it
+        # is only used until one is found. Python 2 falls back to the lazy
+        # Python encoder when sorting the keys, so the whole string is built
+        # here for its ValueError to be caught.
+        if (_one_shot and self.indent is None and
+                encoder.c_make_encoder is not None):
+            try:
+                return [''.join(self._c_iterencode(o))]
+            except ValueError:
+                pass
+
         if self.check_circular:
             markers = {}
         else:
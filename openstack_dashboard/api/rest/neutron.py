@@ -124,7 +124,7 @@ class Ports(generic.View):
     """
     url_regex = r'neutron/ports/$'
 
-    @rest_utils.ajax()
+    @rest_utils.ajax(streaming=True)
     def get(self, request):
         """Get a list of ports for a network
 
@@ -134,7 +134,8 @@ class Ports(generic.View):
         # see
         # https://github.com/openstack/neutron/blob/master/neutron/api/v2/attributes.py
         result = api.neutron.port_list(request, **request.GET.dict())
-        return{'items': [n.to_dict() for n in result]}
+        # The ports are converted by their to_dict() while being encoded.
+        return {'items': result}
 
 
 @urls.register
@@ -293,7 +293,7 @@ class Servers(generic.View):
         'config_drive', 'scheduler_hints', 'min_inst_count'
     ]
 
-    @rest_utils.ajax()
+    @rest_utils.ajax(streaming=True)
     def get(self, request):
         """Get a list of servers.
 
@@ -304,7 +304,8 @@ class Servers(generic.View):
         http://localhost/api/nova/servers
         """
         servers = api.nova.server_list(request)[0]
-        return {'items': [s.to_dict() for s in servers]}
+        # The servers are converted by their to_dict() while being encoded.
+        return {'items': servers}
 
     @rest_utils.ajax(data_required=True)
     def post(self, request):
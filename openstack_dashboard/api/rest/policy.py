@@ -48,3 +48,35 @@ class Policy(generic.View):
         result = policy.check(rules, request, policy_target)
 
         return {"allowed": result}
+
+
+@urls.register
+class PolicyBatch(generic.View):
+    '''API for checking many policy rules at once.'''
+
+    url_regex = r'policy/batch/$'
+
+    @rest_utils.ajax(data_required=True)
+    def post(self, request):
+        '''Check several groups of policy rules.
+
+        The POST application/json object holds a "checks" object mapping
+        names to objects with the "rules" and the optional "target" keys,
+        as accepted by the policy API.
+
+        The action returns an object with one key: "allowed" and the value
+        is an object mapping each name to the result of its policy check,
+        True or False.
+        '''
+
+        checks = []
+        try:
+            for name, check in request.DATA['checks'].items():
+                rules = tuple([tuple(rule) for rule in check['rules']])
+                checks.append((name, rules, check.get('target') or {}))
+        except Exception:
+            raise rest_utils.AjaxError(400, 'unexpected parameter format')
+
+        return {"allowed": dict(
+            (name, policy.check(rules, request, policy_target))
+            for name, rules, policy_target in checks)}
@@ -22,6 +22,9 @@ from django.utils import decorators
 from oslo_serialization import jsonutils
 
 from horizon import exceptions
+from horizon.utils import csvbase
+
+from openstack_dashboard.api.rest import json_encoder as encoders
 
 LOG = logging.getLogger(__name__)
 
@@ -64,7 +67,8 @@ class JSONResponse(_RestResponse):
             content = ''
         else:
             content = jsonutils.dumps(data, sort_keys=settings.DEBUG,
-                                      cls=json_encoder)
+                                      cls=json_encoder,
+                                      default=encoders.to_primitive)
 
         super(JSONResponse, self).__init__(
             status=status,
@@ -73,8 +77,32 @@ class JSONResponse(_RestResponse):
         )
 
 
+class StreamingJSONResponse(http.StreamingHttpResponse):
+    """JSON response encoded while it is sent.
+
+    The items of the lists of the response data, such as its "items", are
+    encoded one at a time, so that the whole JSON of a large listing is never
+    held in memory.
+    """
+    def __init__(self, data, status=200, json_encoder=json.JSONEncoder):
+        encoder = json_encoder(sort_keys=settings.DEBUG,
+                               default=encoders.to_primitive)
+        super(StreamingJSONResponse, self).__init__(
+            csvbase.iter_chunks(encoders.iterencode(data, encoder)),
+            status=status,
+            content_type='application/json',
+        )
+
+    @property
+    def json(self):
+        # Keep the content, so that the response can still be sent.
+        content = b''.join(self.streaming_content)
+        self.streaming_content = [content]
+        return json.loads(content.decode('utf-8'))
+
+
 def ajax(authenticated=True, data_required=False,
-         json_encoder=json.JSONEncoder):
+         json_encoder=json.JSONEncoder, streaming=False):
     """Decorator to allow the wrappered view to exist in an AJAX environment.
 
     Provide a decorator to wrap a view method so that it may exist in an
@@ -91,6 +119,9 @@ def ajax(authenticated=True, data_required=False,
     If data_required is true then we'll assert that there is a JSON body
     present.
 
+    If streaming is true then the returned data is encoded while it is sent,
+    which should be used by the views returning large listings.
+
     The wrapped view method should return either:
 
     - JSON serialisable data
@@ -130,6 +161,9 @@ def ajax(authenticated=True, data_required=False,
                     return data
                 elif data is None:
                     return JSONResponse('', status=204)
+                if streaming:
+                    return StreamingJSONResponse(data,
+                                                 json_encoder=json_encoder)
                 return JSONResponse(data, json_encoder=json_encoder)
             except http_errors as e:
                 # exception was raised with a specific HTTP status
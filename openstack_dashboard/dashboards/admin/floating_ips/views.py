@@ -14,6 +14,7 @@
 #    under the License.
 
 from collections import OrderedDict
+import copy
 
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
@@ -91,6 +92,9 @@ class IndexView(tables.DataTableView):
             pools = get_floatingip_pools(self.request)
             pool_dict = dict([(obj.id, obj.name) for obj in pools])
 
+            # The floating IPs may be shared through the API cache, so the
+            # display fields are set on copies of them.
+            floating_ips = [copy.copy(ip) for ip in floating_ips]
             for ip in floating_ips:
                 ip.instance_name = instances_dict.get(ip.instance_id)
                 ip.pool_name = pool_dict.get(ip.pool, ip.pool)
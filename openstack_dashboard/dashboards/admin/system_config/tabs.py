@@ -256,3 +256,5 @@ class ConfigTabs(tabs.TabGroup):
             iStorageTab, iStoragePoolsTab, SDNControllerTab,
             CeilometerConfigTab)
     sticky = True
+    # Every tab queries a different sysinv resource, load them in parallel.
+    concurrent = True
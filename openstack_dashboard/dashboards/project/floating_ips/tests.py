@@ -90,7 +90,7 @@ class FloatingIpViewTests(test.TestCase):
             for ip in p.fixed_ips:
                 targets.append(api.neutron.FloatingIpTarget(
                     p, ip['ip_address'], server_dict[p.device_id]))
-        return targets
+        return api.neutron.FloatingIpTargetList(targets)
 
     @staticmethod
     def _get_target_id(port):
@@ -118,6 +118,8 @@ class FloatingIpViewTests(test.TestCase):
         choices = dict(workflow.steps[0].action.fields['ip_id'].choices)
         # Verify that our "associated" floating IP isn't in the choices list.
         self.assertFalse(set(associated_fips) & set(choices.keys()))
+        self.assertEqual(self._get_target_id(compute_port),
+                         workflow.steps[0].action.initial['instance_id'])
 
     @test.create_stubs({api.neutron: ('floating_ip_associate',
                                       'floating_ip_target_list',
@@ -279,6 +281,12 @@ class FloatingIpViewTests(test.TestCase):
         url = 'horizon:project:floating_ips:allocate'
         self.assertEqual(url, allocate_action.url)
 
+        # The floating IPs returned by the API may be cached, so the view
+        # leaves them untouched.
+        for ip in floating_ips:
+            self.assertNotIn('instance_name', vars(ip))
+            self.assertNotIn('pool_name', vars(ip))
+
     @test.create_stubs({api.neutron: ('tenant_floating_ip_list',
                                       'floating_ip_pools_list',),
                         api.nova: ('server_list',),
@@ -21,6 +21,8 @@
 Views for managing floating IPs.
 """
 
+import copy
+
 from django.core.urlresolvers import reverse_lazy
 from django.utils.translation import ugettext_lazy as _
 
@@ -126,6 +128,9 @@ class IndexView(tables.DataTableView):
 
             instances_dict = dict([(obj.id, obj.name) for obj in instances])
 
+        # The floating IPs may be shared through the API cache, so the
+        # display fields are set on copies of them.
+        floating_ips = [copy.copy(ip) for ip in floating_ips]
         for ip in floating_ips:
             ip.instance_name = instances_dict.get(ip.instance_id)
             ip.pool_name = pool_dict.get(ip.pool, ip.pool)
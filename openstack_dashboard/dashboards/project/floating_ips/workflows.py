@@ -59,11 +59,17 @@ class AssociateIPAction(workflows.Action):
             self.initial['instance_id'] = target_id
         elif q_port_id:
             targets = self._get_target_list()
-            for target in targets:
-                if (hasattr(target, 'port_id') and
-                        target.port_id == q_port_id):
-                    self.initial['instance_id'] = target.id
-                    break
+            by_port = getattr(targets, 'by_port', None)
+            if by_port is not None:
+                target_ids = by_port.get(q_port_id)
+                if target_ids:
+                    self.initial['instance_id'] = target_ids[0]
+            else:
+                for target in targets:
+                    if (hasattr(target, 'port_id') and
+                            target.port_id == q_port_id):
+                        self.initial['instance_id'] = target.id
+                        break
 
     def populate_ip_id_choices(self, request, context):
         ips = []
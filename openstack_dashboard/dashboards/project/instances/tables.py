@@ -87,6 +87,7 @@ def is_deleting(instance):
 
 
 class DeleteInstance(policy.PolicyTargetMixin, tables.DeleteAction):
+    concurrent = True
     policy_rules = (("compute", "os_compute_api:servers:delete"),)
     help_text = _("Deleted instances are not recoverable.")
 
@@ -569,23 +569,16 @@ class SetServerGroupAction(workflows.Action):
 
     def populate_server_group_choices(self, request, context):
         try:
-            server_groups = api.nova.server_group_list(request)
+            server_groups = api.nova.server_group_list_detailed(request)
             server_group_list = []
 
             for sg in server_groups:
-                server_group = api.nova.server_group_get(request, sg.id)
-
-                if 'affinity-hyperthread' in server_group.policies:
-                    if hasattr(server_group, 'members'):
-                        if server_group.members:
-                            if len(server_group.members) < 2:
-                                server_group_list.append((sg.id,
-                                                          "%s" % sg.name))
-                        else:
-                            server_group_list.append((sg.id, "%s" % sg.name))
-
-                else:
-                    server_group_list.append((sg.id, "%s" % sg.name))
+                # An affinity-hyperthread group is full with 2 members.
+                if ('affinity-hyperthread' in sg.policies and
+                        (getattr(sg, 'members', None) is None or
+                         sg.member_count >= 2)):
+                    continue
+                server_group_list.append((sg.id, "%s" % sg.name))
 
         except Exception:
             server_group_list = []
@@ -966,6 +959,7 @@ class LaunchInstance(workflows.Workflow):
     failure_message = _('Unable to launch %(count)s named "%(name)s".')
     success_url = "horizon:project:instances:index"
     multipart = True
+    concurrent = True
     default_steps = (SelectProjectUser,
                      SetInstanceDetails,
                      SetServerGroup,
@@ -32,7 +32,7 @@ INDEX_URL = reverse('horizon:project:network_topology:index')
 class NetworkTopologyTests(test.TestCase):
     trans = TranslationHelper()
 
-    @test.create_stubs({api.nova: ('server_list',),
+    @test.create_stubs({api.nova: ('server_iter',),
                         api.neutron: ('network_list_for_tenant',
                                       'network_list',
                                       'router_list',
@@ -42,14 +42,14 @@ class NetworkTopologyTests(test.TestCase):
 
     @django.test.utils.override_settings(
         OPENSTACK_NEUTRON_NETWORK={'enable_router': False})
-    @test.create_stubs({api.nova: ('server_list',),
+    @test.create_stubs({api.nova: ('server_iter',),
                         api.neutron: ('network_list_for_tenant',
                                       'port_list')})
     def test_json_view_router_disabled(self):
         self._test_json_view(router_enable=False)
 
     @django.test.utils.override_settings(CONSOLE_TYPE=None)
-    @test.create_stubs({api.nova: ('server_list',),
+    @test.create_stubs({api.nova: ('server_iter',),
                         api.neutron: ('network_list_for_tenant',
                                       'network_list',
                                       'router_list',
@@ -58,8 +58,8 @@ class NetworkTopologyTests(test.TestCase):
         self._test_json_view(with_console=False)
 
     def _test_json_view(self, router_enable=True, with_console=True):
-        api.nova.server_list(
-            IsA(http.HttpRequest)).AndReturn([self.servers.list(), False])
+        api.nova.server_iter(
+            IsA(http.HttpRequest)).AndReturn(iter(self.servers.list()))
 
         tenant_networks = [net for net in self.networks.list()
                            if not net['router:external']]
@@ -181,6 +181,78 @@ class NetworkTopologyTests(test.TestCase):
                  'fixed_ips': []})
         self.assertEqual(expect_port_urls, data['ports'])
 
+    def _stub_topology_calls(self, servers):
+        tenant_networks = [net for net in self.networks.list()
+                           if not net['router:external']]
+        api.nova.server_iter(
+            IsA(http.HttpRequest)).AndReturn(iter(servers))
+        api.neutron.network_list_for_tenant(
+            IsA(http.HttpRequest),
+            self.tenant.id).AndReturn(tenant_networks)
+        api.neutron.port_list(
+            IsA(http.HttpRequest)).AndReturn(self.ports.list())
+
+    @django.test.utils.override_settings(
+        OPENSTACK_NEUTRON_NETWORK={'enable_router': False})
+    @test.create_stubs({api.nova: ('server_iter',),
+                        api.neutron: ('network_list_for_tenant',
+                                      'port_list')})
+    def test_json_view_not_modified(self):
+        # The topology is cached, so it is only retrieved once.
+        self._stub_topology_calls(self.servers.list())
+        self.mox.ReplayAll()
+
+        res = self.client.get(JSON_URL)
+        self.assertEqual(200, res.status_code)
+        etag = res['ETag']
+
+        res = self.client.get(JSON_URL, {'since': etag.strip('"')})
+        self.assertEqual(304, res.status_code)
+        self.assertEqual(etag, res['ETag'])
+
+        res = self.client.get(JSON_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(304, res.status_code)
+
+    @django.test.utils.override_settings(
+        OPENSTACK_NEUTRON_NETWORK={'enable_router': False},
+        NETWORK_TOPOLOGY_CACHE_TIMEOUT=0)
+    @test.create_stubs({api.nova: ('server_iter',),
+                        api.neutron: ('network_list_for_tenant',
+                                      'port_list')})
+    def test_json_view_delta(self):
+        servers = self.servers.list()
+        self._stub_topology_calls(servers)
+        self._stub_topology_calls(servers[1:])
+        self.mox.ReplayAll()
+
+        res = self.client.get(JSON_URL)
+        res = self.client.get(JSON_URL, {'since': res['ETag'].strip('"')})
+        self.assertEqual(200, res.status_code)
+        data = jsonutils.loads(res.content)
+
+        self.assertTrue(data['delta'])
+        self.assertEqual({'changed': [],
+                          'order': ['%s:' % server.id
+                                    for server in servers[1:]]},
+                         data['servers'])
+        for name in ('networks', 'ports', 'routers'):
+            self.assertEqual({'changed': []}, data[name])
+
+    @django.test.utils.override_settings(
+        OPENSTACK_NEUTRON_NETWORK={'enable_router': False})
+    @test.create_stubs({api.nova: ('server_iter',),
+                        api.neutron: ('network_list_for_tenant',
+                                      'port_list')})
+    def test_json_view_unknown_version(self):
+        self._stub_topology_calls(self.servers.list())
+        self.mox.ReplayAll()
+
+        res = self.client.get(JSON_URL, {'since': 'unknown'})
+
+        data = jsonutils.loads(res.content)
+        self.assertNotIn('delta', data)
+        self.assertEqual(len(self.servers.list()), len(data['servers']))
+
 
 class NetworkTopologyCreateTests(test.TestCase):
 
@@ -16,18 +16,24 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
 import json
 
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
 from django.http import HttpResponse
+from django.http import HttpResponseNotModified
+from django.utils import translation
 from django.utils.translation import ugettext_lazy as _
 from django.views.generic import View
+import futurist
 
 from horizon import exceptions
 from horizon import tabs
 from horizon.utils.lazy_encoder import LazyTranslationEncoder
+from horizon.utils.memoized import get_request_scope
+from horizon.utils.memoized import get_shared_backend
 
 from openstack_dashboard import api
 from openstack_dashboard.dashboards.project.network_topology import forms
@@ -76,6 +82,13 @@ from openstack_dashboard.dashboards.project.routers.tables import \
 from openstack_dashboard.dashboards.project.routers import\
     views as r_views
 
+# Namespaces of the shared caches holding the current topology document of
+# each user, and the recent documents the changes are computed from.
+TOPOLOGY_CACHE = 'openstack_dashboard.dashboards.project.network_topology.' \
+    'views.topology'
+TOPOLOGY_VERSIONS_CACHE = TOPOLOGY_CACHE + '_versions'
+TOPOLOGY_VERSIONS_TIMEOUT = 300
+
 # List of known server statuses that wont connect to the console
 console_invalid_status = {
     'shutoff', 'suspended', 'resize', 'verify_resize',
@@ -83,6 +96,34 @@ console_invalid_status = {
     'shelved_offloaded'}
 
 
+def _get_if_none_match(request):
+    header = request.META.get('HTTP_IF_NONE_MATCH', '')
+    return [etag.strip().lstrip('W/').strip('"')
+            for etag in header.split(',') if etag.strip()]
+
+
+def _get_item_key(item):
+    # The gateway ports made up for the routers share their id, but not
+    # their device id.
+    return '%s:%s' % (item['id'], item.get('device_id') or '')
+
+
+def _get_delta(previous_items, items):
+    """Returns the changes between two versions of a topology collection.
+
+    ``changed`` lists the new and modified items. ``order`` lists the keys
+    of all the items and is only given when items were added, removed or
+    reordered.
+    """
+    previous = dict((_get_item_key(item), item) for item in previous_items)
+    delta = {'changed': [item for item in items
+                         if previous.get(_get_item_key(item)) != item]}
+    keys = [_get_item_key(item) for item in items]
+    if keys != [_get_item_key(item) for item in previous_items]:
+        delta['order'] = keys
+    return delta
+
+
 class TranslationHelper(object):
     """Helper class to provide the translations.
 
@@ -231,21 +272,43 @@ class JSONView(View):
                 return True
         return False
 
-    def _get_servers(self, request):
+    def _get_resources(self, request):
+        """Retrieves the servers, networks, routers and ports concurrently."""
+        tenant_id = request.user.tenant_id
+        calls = {
+            'servers': lambda: list(api.nova.server_iter(request)),
+            'networks': lambda: api.neutron.network_list_for_tenant(
+                request, tenant_id),
+            'ports': lambda: api.neutron.port_list(request),
+        }
+        if self.is_router_enabled:
+            calls['public_networks'] = lambda: api.neutron.network_list(
+                request, **{'router:external': True})
+            calls['routers'] = lambda: api.neutron.router_list(
+                request, tenant_id=tenant_id)
+        with futurist.ThreadPoolExecutor(max_workers=len(calls)) as e:
+            futures = dict((name, e.submit(call))
+                           for name, call in calls.items())
+        resources = {'public_networks': [], 'routers': []}
+        for name, future in futures.items():
+            try:
+                resources[name] = future.result()
+            except Exception:
+                resources[name] = []
+        return resources
+
+    def _get_servers(self, servers):
         # Get nova data
-        try:
-            servers, more = api.nova.server_list(request)
-        except Exception:
-            servers = []
         data = []
         console_type = getattr(settings, 'CONSOLE_TYPE', 'AUTO')
         # lowercase of the keys will be used at the end of the console URL.
         for server in servers:
-            server_data = {'name': server.name,
-                           'status': self.trans.instance[server.status],
-                           'original_status': server.status,
-                           'task': getattr(server, 'OS-EXT-STS:task_state'),
-                           'id': server.id}
+            server_data = {
+                'name': server.name,
+                'status': self.trans.instance[server.status],
+                'original_status': server.status,
+                'task': getattr(server, 'OS-EXT-STS:task_state'),
+                'id': server.id}
             # Avoid doing extra calls for console if the server is in
             # a invalid status for console connection
             if server.status.lower() not in console_invalid_status:
@@ -256,18 +319,12 @@ class JSONView(View):
         self.add_resource_url('horizon:project:instances:detail', data)
         return data
 
-    def _get_networks(self, request):
+    def _get_networks(self, neutron_networks, neutron_public_networks):
         # Get neutron data
         # if we didn't specify tenant_id, all networks shown as admin user.
         # so it is need to specify the networks. However there is no need to
         # specify tenant_id for subnet. The subnet which belongs to the public
         # network is needed to draw subnet information on public network.
-        try:
-            neutron_networks = api.neutron.network_list_for_tenant(
-                request,
-                request.user.tenant_id)
-        except Exception:
-            neutron_networks = []
         networks = []
         for network in neutron_networks:
             obj = {'name': network.name_or_id,
@@ -283,34 +340,27 @@ class JSONView(View):
             networks.append(obj)
 
         # Add public networks to the networks list
-        if self.is_router_enabled:
+        my_network_ids = [net['id'] for net in networks]
+        for publicnet in neutron_public_networks:
+            if publicnet.id in my_network_ids:
+                continue
             try:
-                neutron_public_networks = api.neutron.network_list(
-                    request,
-                    **{'router:external': True})
+                subnets = []
+                for subnet in publicnet.subnets:
+                    snet = {'id': subnet.id,
+                            'cidr': subnet.cidr}
+                    self.add_resource_url(
+                        'horizon:project:networks:subnets:detail', snet)
+                    subnets.append(snet)
             except Exception:
-                neutron_public_networks = []
-            my_network_ids = [net['id'] for net in networks]
-            for publicnet in neutron_public_networks:
-                if publicnet.id in my_network_ids:
-                    continue
-                try:
-                    subnets = []
-                    for subnet in publicnet.subnets:
-                        snet = {'id': subnet.id,
-                                'cidr': subnet.cidr}
-                        self.add_resource_url(
-                            'horizon:project:networks:subnets:detail', snet)
-                        subnets.append(snet)
-                except Exception:
-                    subnets = []
-                networks.append({
-                    'name': publicnet.name_or_id,
-                    'id': publicnet.id,
-                    'subnets': subnets,
-                    'status': self.trans.network[publicnet.status],
-                    'original_status': publicnet.status,
-                    'router:external': publicnet['router:external']})
+                subnets = []
+            networks.append({
+                'name': publicnet.name_or_id,
+                'id': publicnet.id,
+                'subnets': subnets,
+                'status': self.trans.network[publicnet.status],
+                'original_status': publicnet.status,
+                'router:external': publicnet['router:external']})
 
         self.add_resource_url('horizon:project:networks:detail',
                               networks)
@@ -319,16 +369,7 @@ class JSONView(View):
                       key=lambda x: x.get('router:external'),
                       reverse=True)
 
-    def _get_routers(self, request):
-        if not self.is_router_enabled:
-            return []
-        try:
-            neutron_routers = api.neutron.router_list(
-                request,
-                tenant_id=request.user.tenant_id)
-        except Exception:
-            neutron_routers = []
-
+    def _get_routers(self, neutron_routers):
         routers = [{'id': router.id,
                     'name': router.name_or_id,
                     'status': self.trans.router[router.status],
@@ -338,12 +379,7 @@ class JSONView(View):
         self.add_resource_url('horizon:project:routers:detail', routers)
         return routers
 
-    def _get_ports(self, request, networks):
-        try:
-            neutron_ports = api.neutron.port_list(request)
-        except Exception:
-            neutron_ports = []
-
+    def _get_ports(self, neutron_ports, networks):
         # we should filter out ports connected to non tenant networks
         # which they have no visibility to
         tenant_network_ids = [network['id'] for network in networks]
@@ -382,13 +418,64 @@ class JSONView(View):
                          'fixed_ips': []}
             ports.append(fake_port)
 
-    def get(self, request, *args, **kwargs):
-        networks = self._get_networks(request)
-        data = {'servers': self._get_servers(request),
+    def _get_topology(self, request):
+        """Returns the topology document, its JSON and its ETag."""
+        resources = self._get_resources(request)
+        networks = self._get_networks(resources['networks'],
+                                      resources['public_networks'])
+        data = {'servers': self._get_servers(resources['servers']),
                 'networks': networks,
-                'ports': self._get_ports(request, networks),
-                'routers': self._get_routers(request)}
+                'ports': self._get_ports(resources['ports'], networks),
+                'routers': self._get_routers(resources['routers'])}
         self._prepare_gateway_ports(data['routers'], data['ports'])
+        # Sort the keys so that every worker computes the same ETag.
         json_string = json.dumps(data, cls=LazyTranslationEncoder,
-                                 ensure_ascii=False)
-        return HttpResponse(json_string, content_type='text/json')
+                                 ensure_ascii=False, sort_keys=True)
+        etag = hashlib.sha1(json_string.encode('utf-8')).hexdigest()
+        # The cached document holds the translated strings, not the lazy
+        # translation objects.
+        return json.loads(json_string), json_string, etag
+
+    def _get_cached_topology(self, request, scope):
+        timeout = getattr(settings, 'NETWORK_TOPOLOGY_CACHE_TIMEOUT', 5)
+        backend = get_shared_backend()
+        topology = None
+        if timeout:
+            topology = backend.get(TOPOLOGY_CACHE, scope, None)
+        if topology is None:
+            topology = self._get_topology(request)
+            if timeout:
+                backend.set(TOPOLOGY_CACHE, scope, topology, timeout)
+            # Keep the document a while longer, so that the changes made
+            # since a given version can be computed.
+            data, json_string, etag = topology
+            backend.set(TOPOLOGY_VERSIONS_CACHE, scope + (etag,), data,
+                        TOPOLOGY_VERSIONS_TIMEOUT)
+        return topology
+
+    def get(self, request, *args, **kwargs):
+        # The documents are translated and may differ between users of
+        # the same project, for instance because of their roles.
+        scope = get_request_scope(request) + (translation.get_language(),)
+        data, json_string, etag = self._get_cached_topology(request, scope)
+
+        since = request.GET.get('since')
+        if since == etag or etag in _get_if_none_match(request):
+            response = HttpResponseNotModified()
+            response['ETag'] = '"%s"' % etag
+            return response
+        if since:
+            # Only the changes are returned when the version the client has
+            # is still known, the whole document otherwise.
+            previous = get_shared_backend().get(TOPOLOGY_VERSIONS_CACHE,
+                                                scope + (since,), None)
+            if previous is not None:
+                delta = {'delta': True}
+                for name in data:
+                    delta[name] = _get_delta(previous.get(name, []),
+                                             data[name])
+                json_string = json.dumps(delta, ensure_ascii=False)
+
+        response = HttpResponse(json_string, content_type='text/json')
+        response['ETag'] = '"%s"' % etag
+        return response
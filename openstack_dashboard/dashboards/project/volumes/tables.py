@@ -94,6 +94,7 @@ class LaunchVolumeNG(LaunchVolume):
 
 
 class DeleteVolume(VolumePolicyTargetMixin, tables.DeleteAction):
+    concurrent = True
     help_text = _("Deleted volumes are not recoverable. "
                   "All data stored in the volume will be removed.")
 
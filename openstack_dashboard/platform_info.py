@@ -0,0 +1,110 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Information about the StarlingX platform shown in the page header.
+
+The name of the system is kept in Django's cache, so that it is shared by
+all the WSGI workers. Once it is older than ``PLATFORM_INFO_CACHE_TIMEOUT``
+seconds, it is retrieved again from sysinv by a background thread of one of
+the workers, while the pages keep showing the previous name.
+"""
+
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+import futurist
+import six
+
+from horizon.utils import memoized
+
+from openstack_dashboard import api
+
+
+LOG = logging.getLogger(__name__)
+
+PLATFORM_INFO_KEY = 'horizon:platform_info:%s'
+
+# Held by the worker refreshing the system name of a region.
+PLATFORM_INFO_REFRESH_KEY = 'horizon:platform_info:refresh:%s'
+
+
+@memoized.memoized_process
+def _get_refresh_executor():
+    return futurist.ThreadPoolExecutor(max_workers=1)
+
+
+def _get_cache():
+    return caches[getattr(settings, 'PLATFORM_INFO_CACHE_ALIAS', 'default')]
+
+
+def _refresh_system_name(request, digest):
+    cache = _get_cache()
+    try:
+        systems = api.sysinv.system_list(request)
+        system_name = systems[0].name
+    except Exception:
+        # The refresh key is kept until it expires, so that sysinv is not
+        # queried again before the next refresh is due.
+        LOG.warning('Unable to retrieve the name of the system.',
+                    exc_info=True)
+        return
+    cache.set(PLATFORM_INFO_KEY % digest,
+              {'system_name': system_name, 'updated': time.time()}, None)
+    cache.delete(PLATFORM_INFO_REFRESH_KEY % digest)
+
+
+def get_system_name(request):
+    """Return the name of the system of the region of the request.
+
+    The name is an empty string until it has been retrieved once.
+    """
+    timeout = getattr(settings, 'PLATFORM_INFO_CACHE_TIMEOUT', 60)
+    region = memoized.get_request_scope(request)[2]
+    digest = hashlib.sha1(
+        six.text_type(region).encode('utf-8')).hexdigest()
+    cache = _get_cache()
+    info = cache.get(PLATFORM_INFO_KEY % digest)
+    if info is None or time.time() - info['updated'] >= timeout:
+        # Only one thread of all the workers refreshes the name.
+        if cache.add(PLATFORM_INFO_REFRESH_KEY % digest, True, timeout):
+            _get_refresh_executor().submit(_refresh_system_name,
+                                           request, digest)
+    if info is None:
+        return ''
+    return info['system_name']
+
+
+def get_platform_info(request):
+    """Return the platform details added to the context of the pages.
+
+    ``system_name``
+        The name of the system, shown to the administrators only.
+
+    ``alarmbanner``
+        Whether the alarm banner is shown.
+
+    ``stx_region``
+        Whether the current region is a StarlingX region.
+    """
+    user = request.user
+    stx_region = (user.is_authenticated() and
+                  api.base.is_stx_region(request))
+    if stx_region and user.is_superuser:
+        return {'system_name': get_system_name(request),
+                'alarmbanner': True,
+                'stx_region': True}
+    return {'system_name': '',
+            'alarmbanner': False,
+            'stx_region': bool(stx_region)}
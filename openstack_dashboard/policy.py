@@ -12,18 +12,82 @@
 #    under the License.
 
 
+import json
+
+from django.conf import settings
+
+from horizon.utils import memoized
 from horizon.utils import settings as utils_settings
 
 
+# Namespace of the policy decisions in the decision cache.
+POLICY_DECISION_CACHE = 'openstack_dashboard.policy.decisions'
+
+_policy_check_functions = {}
+
+
+def get_policy_check_function():
+    """Return the function set by ``POLICY_CHECK_FUNCTION``.
+
+    The function is only imported the first time a given value of the
+    setting is seen.
+    """
+    value = getattr(settings, 'POLICY_CHECK_FUNCTION', None)
+    try:
+        return _policy_check_functions[value]
+    except KeyError:
+        policy_check = utils_settings.import_object(value)
+        _policy_check_functions[value] = policy_check
+        return policy_check
+
+
+@memoized.memoized_process
+def get_decision_cache():
+    """Return the cache of the policy decisions of this process.
+
+    It holds up to ``POLICY_CHECK_CACHE_MAX_ENTRIES`` decisions, the least
+    recently used ones are evicted first.
+    """
+    return memoized.LocalMemoryBackend(max_entries=getattr(
+        settings, 'POLICY_CHECK_CACHE_MAX_ENTRIES', 10000))
+
+
+def _get_decision_key(actions, request, target):
+    token_id, project_id, region = memoized.get_request_scope(request)
+    if not token_id:
+        return None
+    try:
+        rules = json.dumps([actions, target], sort_keys=True)
+    except (TypeError, ValueError):
+        # The target holds objects which can not be compared reliably.
+        return None
+    return (getattr(settings, 'POLICY_CHECK_FUNCTION', None),
+            token_id, project_id, region, rules)
+
+
 def check(actions, request, target=None):
-    """Wrapper of the configurable policy method."""
+    """Wrapper of the configurable policy method.
+
+    The decisions are cached per token, project, region, rules and target
+    for ``POLICY_CHECK_CACHE_TIMEOUT`` seconds.
+    """
+
+    policy_check = get_policy_check_function()
 
-    policy_check = utils_settings.import_setting("POLICY_CHECK_FUNCTION")
+    if not policy_check:
+        return True
 
-    if policy_check:
+    timeout = getattr(settings, 'POLICY_CHECK_CACHE_TIMEOUT', 300)
+    key = _get_decision_key(actions, request, target) if timeout else None
+    if key is None:
         return policy_check(actions, request, target)
 
-    return True
+    cache = get_decision_cache()
+    allowed = cache.get(POLICY_DECISION_CACHE, key, None)
+    if allowed is None:
+        allowed = policy_check(actions, request, target)
+        cache.set(POLICY_DECISION_CACHE, key, allowed, timeout)
+    return allowed
 
 
 class PolicyTargetMixin(object):
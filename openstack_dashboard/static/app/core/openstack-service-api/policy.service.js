@@ -21,6 +21,7 @@
 
   PolicyService.$inject = [
     '$q',
+    '$timeout',
     'horizon.framework.util.filters.$memoize',
     'horizon.framework.util.http.service',
     'horizon.framework.widgets.toast.service'
@@ -30,6 +31,7 @@
    * @ngdoc service
    * @name PolicyService
    * @param {Object} $q
+   * @param {Object} $timeout
    * @param {Object} memoize
    * @param {Object} apiService
    * @param {Object} toastService
@@ -37,13 +39,17 @@
    * Horizon.
    * @returns {Object} The service
    */
-  function PolicyService($q, memoize, apiService, toastService) {
+  function PolicyService($q, $timeout, memoize, apiService, toastService) {
 
     var service = {
       check: memoize(check, memoizeHasher),
+      checkBatch: checkBatch,
       ifAllowed: memoize(ifAllowed, memoizeHasher)
     };
 
+    // ifAllowed() calls waiting to be sent together to the server.
+    var pending = [];
+
     return service;
 
     //////////////
@@ -106,6 +112,39 @@
       return deferred.promise;
     }
 
+    /**
+     * @name checkBatch
+     * @param {Object} policyChecks
+     * @description
+     * Check several policy rule lists in a single request. The required
+     * parameter maps names to objects with the structure accepted by check:
+     *
+     *   {
+     *     "stop": {
+     *       "rules": [ [ "compute", "os_compute_api:servers:stop" ] ],
+     *       "target": { "project_id": "1" }
+     *     },
+     *     "all_tenants": {
+     *       "rules": [ [ "compute", "os_compute_api:servers:index:get_all_tenants" ] ]
+     *     }
+     *   }
+     *
+     * The response maps each name to the result of its check:
+     *   {
+     *     "allowed": {
+     *       "stop": true,
+     *       "all_tenants": false
+     *     }
+     *   }
+     * @returns {Object} The result of the API call
+     */
+    function checkBatch(policyChecks) {
+      return apiService.post('/api/policy/batch/', {checks: policyChecks})
+        .error(function failurePath() {
+          toastService.add('warning', gettext('Policy check failed.'));
+        });
+    }
+
     /**
      * @name ifAllowed
      * @param {Object} policyRules
@@ -115,6 +154,9 @@
      * The policyRules input is the same as the check function. Please
      * refer to it for more information on the input.
      *
+     * The calls made while the page is being built are sent together
+     * with checkBatch, rather than one request per call.
+     *
      * @example
      * Assume if the users is not allowed to delete an object,
      * you will delete the object, otherwise, you will do something else.
@@ -126,15 +168,44 @@
      */
     function ifAllowed(policyRules) {
       var deferred = $q.defer();
-      service.check(policyRules).then(success);
+      if (pending.length === 0) {
+        $timeout(sendPending);
+      }
+      pending.push({rules: policyRules, deferred: deferred});
       return deferred.promise;
+    }
+
+    function sendPending() {
+      var sent = pending;
+      pending = [];
+
+      if (sent.length === 1) {
+        service.check(sent[0].rules).then(function success(response) {
+          settle(sent[0].deferred, response.allowed);
+        }, sent[0].deferred.reject);
+        return;
+      }
+
+      var policyChecks = {};
+      angular.forEach(sent, function addCheck(item, index) {
+        policyChecks[index] = item.rules;
+      });
+      service.checkBatch(policyChecks).then(function success(response) {
+        angular.forEach(sent, function settleCheck(item, index) {
+          settle(item.deferred, response.data.allowed[index]);
+        });
+      }, function failure() {
+        angular.forEach(sent, function rejectCheck(item) {
+          item.deferred.reject();
+        });
+      });
+    }
 
-      function success(response) {
-        if (response.allowed) {
-          deferred.resolve();
-        } else {
-          deferred.reject();
-        }
+    function settle(deferred, allowed) {
+      if (allowed) {
+        deferred.resolve();
+      } else {
+        deferred.reject();
       }
     }
 
@@ -51,6 +51,19 @@
           "rules"
         ],
         "messageType": "warning"
+      },
+      {
+        "func": "checkBatch",
+        "method": "post",
+        "call_args": [
+          "/api/policy/batch/",
+          {checks: "checks"}
+        ],
+        "error": "Policy check failed.",
+        "testInput": [
+          "checks"
+        ],
+        "messageType": "warning"
       }
     ];
 
@@ -172,6 +185,38 @@
       $timeout.flush();
       expect(service.check).not.toHaveBeenCalled();
     });
+
+    it("sends the checks made together in one batch", function() {
+      var def = $q.defer();
+      def.resolve({data: {allowed: {0: true, 1: false}}});
+      spyOn(service, 'check');
+      spyOn(service, 'checkBatch').and.returnValue(def.promise);
+      var allowed = jasmine.createSpy('allowed');
+      var denied = jasmine.createSpy('denied');
+      service.ifAllowed({rules: [['compute', 'stop']]}).then(allowed);
+      service.ifAllowed({rules: [['compute', 'start']]}).then(null, denied);
+      $timeout.flush();
+
+      expect(service.check).not.toHaveBeenCalled();
+      expect(service.checkBatch).toHaveBeenCalledWith({
+        0: {rules: [['compute', 'stop']]},
+        1: {rules: [['compute', 'start']]}
+      });
+      expect(allowed).toHaveBeenCalled();
+      expect(denied).toHaveBeenCalled();
+    });
+
+    it("rejects the batched checks when the batch fails", function() {
+      var def = $q.defer();
+      def.reject();
+      spyOn(service, 'checkBatch').and.returnValue(def.promise);
+      var denied = jasmine.createSpy('denied');
+      service.ifAllowed({rules: [['compute', 'pause']]}).then(null, denied);
+      service.ifAllowed({rules: [['compute', 'unpause']]}).then(null, denied);
+      $timeout.flush();
+
+      expect(denied.calls.count()).toBe(2);
+    });
   });
 
   function failWhenCalled() {
@@ -30,6 +30,8 @@ horizon.networktopologyloader = {
   reload_duration: 10000,
   // timer controlling update intervals
   update_timer: null,
+  // ETag of the model, so that only the changes are retrieved
+  etag: null,
 
   init:function() {
     var self = this;
@@ -44,16 +46,53 @@ horizon.networktopologyloader = {
    */
   update:function() {
     var self = this;
-    angular.element.getJSON(
-      angular.element('#networktopology').data('networktopology') + '?' + angular.element.now(),
-      function(data) {
-        self.model = data;
-        $('#networktopology').trigger('change');
+    angular.element.ajax({
+      url: angular.element('#networktopology').data('networktopology'),
+      data: self.etag ? {since: self.etag} : {},
+      dataType: 'json',
+      cache: false,
+      success: function(data, textStatus, jqXHR) {
+        // A "304 Not Modified" response has no data, the model is unchanged
+        if (data) {
+          self.model = data.delta ? self.apply_delta(self.model, data) : data;
+          var etag = jqXHR.getResponseHeader('ETag') || '';
+          self.etag = etag.replace(/"/g, '') || null;
+          $('#networktopology').trigger('change');
+        }
         self.update_timer = setTimeout(function(){
           self.update();
         }, self.reload_duration);
       }
-    );
+    });
+  },
+
+  /**
+   * applies the changed and reordered items of each collection of a delta
+   * response to the model
+   */
+  apply_delta:function(model, delta) {
+    var self = this;
+    var result = {};
+    angular.forEach(model, function(items, name) {
+      var changes = delta[name];
+      if (!changes) {
+        result[name] = items;
+        return;
+      }
+      var itemsByKey = {};
+      angular.forEach(items.concat(changes.changed), function(item) {
+        itemsByKey[self.item_key(item)] = item;
+      });
+      var keys = changes.order || items.map(self.item_key);
+      result[name] = keys.map(function(key) {
+        return itemsByKey[key];
+      });
+    });
+    return result;
+  },
+
+  item_key:function(item) {
+    return item.id + ':' + (item.device_id || '');
   },
 
   /**
@@ -130,6 +130,40 @@ class APIResourceWrapperTests(test.TestCase):
         self.assertIn('bar', resource_str)
         self.assertNotIn('baz', resource_str)
 
+    def test_generated_attributes(self):
+        for attr in APIResource._attrs:
+            self.assertIsInstance(APIResource.__dict__[attr],
+                                  api_base._ResourceAttribute)
+
+    def test_assigned_attribute_takes_precedence(self):
+        resource = APIResource.get_instance()
+        resource.foo = 'assigned'
+        self.assertEqual('assigned', resource.foo)
+        self.assertEqual('foo', resource._apiresource.foo)
+
+    def test_property_takes_precedence(self):
+        class PropertyAPIResource(APIResource):
+            @property
+            def foo(self):
+                return 'property'
+
+            @property
+            def bar(self):
+                raise AttributeError('bar')
+
+        resource = PropertyAPIResource(APIResource.get_instance()._apiresource)
+        self.assertEqual('property', resource.foo)
+        # A property raising AttributeError falls back to the resource.
+        self.assertEqual('bar', resource.bar)
+
+    def test_slotted_subclass(self):
+        class SlottedAPIResource(APIResource):
+            __slots__ = ()
+
+        resource = SlottedAPIResource(APIResource.get_instance()._apiresource)
+        self.assertEqual('foo', resource.foo)
+        self.assertFalse(hasattr(resource, '__dict__'))
+
 
 class APIDictWrapperTests(test.TestCase):
     # APIDict allows for both attribute access and dictionary style [element]
@@ -289,6 +323,40 @@ class ApiHelperTests(test.TestCase):
         with self.assertRaises(exceptions.ServiceCatalogException):
             url = api_base.url_for(self.request, 'image')
 
+    def test_catalog_index_shared_by_token(self):
+        index = api_base.get_catalog_index(self.request)
+        self.assertIs(index, api_base.get_catalog_index(self.request))
+
+        self.request.user._catalog_index = None
+        self.assertIs(index, api_base.get_catalog_index(self.request))
+
+    def test_catalog_index_fallback_endpoint_type(self):
+        catalog = [
+            {'type': 'compute',
+             'endpoints': [{'region': 'RegionOne',
+                            'publicURL': 'http://public.nova'}]},
+            {'type': 'identity',
+             'endpoints': [{'region': 'RegionOne',
+                            'internalURL': 'http://int.keystone'}]},
+        ]
+        index = api_base.ServiceCatalogIndex(catalog)
+        self.assertIsNone(index.url_for('compute', 'RegionOne',
+                                        'internalURL'))
+        self.assertEqual('http://int.keystone',
+                         index.url_for('identity', 'RegionTwo',
+                                       'internalURL'))
+        self.assertTrue(index.is_service_enabled('identity', 'RegionTwo'))
+        self.assertFalse(index.is_service_enabled('compute', 'RegionTwo'))
+        self.assertFalse(index.is_service_enabled('image', 'RegionOne'))
+
+        index = api_base.ServiceCatalogIndex(
+            catalog, fallback_endpoint_type='publicURL')
+        self.assertEqual('http://public.nova',
+                         index.url_for('compute', 'RegionOne',
+                                       'internalURL'))
+        self.assertIsNone(index.url_for('compute', 'RegionTwo',
+                                        'internalURL'))
+
 
 class QuotaSetTests(test.TestCase):
 
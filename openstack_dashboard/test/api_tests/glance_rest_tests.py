@@ -74,6 +74,43 @@ class ImagesRestTestCase(test.ResetImageAPIVersionMixin, test.TestCase):
         glance.Image().delete(request, "1")
         gc.image_delete.assert_called_once_with(request, "1")
 
+    @mock.patch.object(glance.api, 'glance')
+    def test_image_upload_get(self, gc):
+        request = self.mock_rest_request()
+        gc.image_upload_get.return_value = {'status': 'uploading',
+                                            'size': 4, 'bytes_uploaded': 2}
+
+        response = glance.ImageUpload().get(request, "1")
+        self.assertStatusCode(response, 200)
+        self.assertEqual(response.json, {'status': 'uploading',
+                                         'size': 4, 'bytes_uploaded': 2})
+        gc.image_upload_get.assert_called_once_with(request, "1")
+
+    @mock.patch.object(glance.api, 'glance')
+    def test_image_upload_get_not_found(self, gc):
+        request = self.mock_rest_request()
+        gc.image_upload_get.return_value = None
+
+        response = glance.ImageUpload().get(request, "1")
+        self.assertStatusCode(response, 404)
+
+    @mock.patch.object(glance.api, 'glance')
+    def test_image_upload_cancel(self, gc):
+        request = self.mock_rest_request()
+        gc.image_upload_cancel.return_value = {'status': 'cancelled'}
+
+        response = glance.ImageUpload().delete(request, "1")
+        self.assertStatusCode(response, 204)
+        gc.image_upload_cancel.assert_called_once_with(request, "1")
+
+    @mock.patch.object(glance.api, 'glance')
+    def test_image_upload_cancel_not_found(self, gc):
+        request = self.mock_rest_request()
+        gc.image_upload_cancel.return_value = None
+
+        response = glance.ImageUpload().delete(request, "1")
+        self.assertStatusCode(response, 404)
+
     @mock.patch.object(glance.api, 'glance')
     def test_image_edit_v1(self, gc):
         request = self.mock_rest_request(body='''{"name": "Test",
@@ -17,7 +17,13 @@
 #    under the License.
 
 from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test.utils import override_settings
+import futurist
+import mock
+from mox3.mox import IsA
+
+from horizon import exceptions
 
 from openstack_dashboard import api
 from openstack_dashboard.api import base
@@ -28,6 +34,7 @@ class GlanceApiTests(test.APITestCase):
     def setUp(self):
         super(GlanceApiTests, self).setUp()
         api.glance.VERSIONS.clear_active_cache()
+        self.addCleanup(api.glance._image_uploads.clear)
 
     @override_settings(API_RESULT_PAGE_SIZE=2)
     def test_image_list_detailed_no_pagination(self):
@@ -351,3 +358,122 @@ class GlanceApiTests(test.APITestCase):
 
     def test_image_create_v2_external_upload(self):
         self._test_image_create_external_upload()
+
+    @mock.patch.object(api.glance, '_get_image_upload_executor')
+    def test_image_create_data_upload(self, mock_executor):
+        mock_executor.return_value = futurist.SynchronousExecutor()
+        expected_image = self.images.first()
+        data = SimpleUploadedFile('image.iso', b'image data')
+
+        glanceclient = self.stub_glanceclient()
+        glanceclient.images = self.mox.CreateMockAnything()
+        glanceclient.images.create().AndReturn(expected_image)
+        glanceclient.images.upload(
+            expected_image.id, IsA(api.glance.ImageUpload)).WithSideEffects(
+                lambda image_id, upload: upload.read(4) + upload.read())
+        self.mox.ReplayAll()
+
+        api.glance.image_create(self.request, data=data)
+
+        upload = api.glance.image_upload_get(self.request, expected_image.id)
+        self.assertEqual('done', upload['status'])
+        self.assertEqual(10, upload['size'])
+        self.assertEqual(10, upload['bytes_uploaded'])
+        # The data was taken away from the request instead of being copied.
+        self.assertEqual(b'', data.read())
+        self.assertEqual({}, api.glance._image_uploads)
+
+    @mock.patch.object(api.glance, '_get_image_upload_executor')
+    def test_image_create_data_upload_failed(self, mock_executor):
+        mock_executor.return_value = futurist.SynchronousExecutor()
+        expected_image = self.images.first()
+
+        glanceclient = self.stub_glanceclient()
+        glanceclient.images = self.mox.CreateMockAnything()
+        glanceclient.images.create().AndReturn(expected_image)
+        glanceclient.images.upload(
+            expected_image.id, IsA(api.glance.ImageUpload)).AndRaise(
+                self.exceptions.glance)
+        self.mox.ReplayAll()
+
+        api.glance.image_create(
+            self.request, data=SimpleUploadedFile('image.iso', b'data'))
+
+        upload = api.glance.image_upload_get(self.request, expected_image.id)
+        self.assertEqual('failed', upload['status'])
+        self.assertEqual({}, api.glance._image_uploads)
+
+    @override_settings(IMAGE_UPLOAD_MAX_PER_USER=1)
+    @mock.patch.object(api.glance, '_get_image_upload_executor')
+    def test_image_create_data_upload_limit(self, mock_executor):
+        expected_image = self.images.first()
+
+        glanceclient = self.stub_glanceclient()
+        glanceclient.images = self.mox.CreateMockAnything()
+        glanceclient.images.create().AndReturn(expected_image)
+        self.mox.ReplayAll()
+
+        api.glance.image_create(
+            self.request, data=SimpleUploadedFile('image.iso', b'data'))
+        self.assertRaises(
+            exceptions.Conflict, api.glance.image_create, self.request,
+            data=SimpleUploadedFile('image.iso', b'data'))
+        self.assertEqual(1, mock_executor.return_value.submit.call_count)
+
+    @mock.patch.object(api.glance, '_get_image_upload_executor')
+    def test_image_upload_cancel_queued(self, mock_executor):
+        mock_executor.return_value.submit.return_value.cancel.return_value = (
+            True)
+        expected_image = self.images.first()
+        data = SimpleUploadedFile('image.iso', b'data')
+
+        glanceclient = self.stub_glanceclient()
+        glanceclient.images = self.mox.CreateMockAnything()
+        glanceclient.images.create().AndReturn(expected_image)
+        glanceclient.images.delete(expected_image.id)
+        self.mox.ReplayAll()
+
+        api.glance.image_create(self.request, data=data)
+        self.assertEqual('queued', api.glance.image_upload_get(
+            self.request, expected_image.id)['status'])
+
+        upload = api.glance.image_upload_cancel(self.request,
+                                                expected_image.id)
+        self.assertEqual('cancelled', upload['status'])
+        self.assertEqual({}, api.glance._image_uploads)
+
+    @mock.patch.object(api.glance, '_get_image_upload_executor')
+    def test_image_upload_cancel_running(self, mock_executor):
+        mock_executor.return_value = futurist.SynchronousExecutor()
+        expected_image = self.images.first()
+
+        def upload_data(image_id, upload):
+            upload.read(2)
+            api.glance.image_upload_cancel(self.request, image_id)
+            upload.read(2)
+
+        glanceclient = self.stub_glanceclient()
+        glanceclient.images = self.mox.CreateMockAnything()
+        glanceclient.images.create().AndReturn(expected_image)
+        glanceclient.images.upload(
+            expected_image.id, IsA(api.glance.ImageUpload)).WithSideEffects(
+                upload_data)
+        glanceclient.images.delete(expected_image.id)
+        self.mox.ReplayAll()
+
+        api.glance.image_create(
+            self.request, data=SimpleUploadedFile('image.iso', b'data'))
+
+        upload = api.glance.image_upload_get(self.request, expected_image.id)
+        self.assertEqual('cancelled', upload['status'])
+        self.assertEqual(2, upload['bytes_uploaded'])
+
+    def test_image_upload_get_other_user(self):
+        api.glance.get_shared_backend().set(
+            api.glance.IMAGE_UPLOAD_CACHE, 'image-id',
+            {'user_id': 'other-user', 'status': 'uploading'}, 60)
+
+        self.assertIsNone(api.glance.image_upload_get(self.request,
+                                                      'image-id'))
+        self.assertIsNone(api.glance.image_upload_cancel(self.request,
+                                                         'image-id'))
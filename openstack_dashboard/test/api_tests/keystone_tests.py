@@ -114,3 +114,29 @@ class ServiceAPITests(test.APITestCase):
         self.assertEqual("http://public.nova2.example.com:8774/v2",
                          service.public_url)
         self.assertEqual("int.nova2.example.com", service.host)
+
+
+class AuthorizedTenantTests(test.APITestCase):
+    def test_authorized_tenant_list(self):
+        tenants = api.keystone.authorized_tenant_list(self.request)
+
+        self.assertEqual([tenant.id for tenant in self.tenants.list()],
+                         [tenant.id for tenant in tenants])
+        self.assertEqual([tenant.enabled for tenant in self.tenants.list()],
+                         [tenant.enabled for tenant in tenants])
+        self.assertIsInstance(tenants[0], api.keystone.AuthorizedTenant)
+
+    def test_authorized_tenant_list_cached(self):
+        tenants = api.keystone.authorized_tenant_list(self.request)
+        self.request.user.authorized_tenants = []
+
+        self.assertIs(tenants,
+                      api.keystone.authorized_tenant_list(self.request))
+
+    def test_authorized_tenant_list_cached_per_token(self):
+        api.keystone.authorized_tenant_list(self.request)
+        self.request.user.authorized_tenants = []
+        self.request.user.token.id = 'another-token'
+
+        self.assertEqual([],
+                         api.keystone.authorized_tenant_list(self.request))
@@ -79,16 +79,16 @@ class NetworkApiNeutronTests(NetworkApiNeutronTestBase):
 
         self.qclient.list_ports(device_id=server_ids) \
             .AndReturn({'ports': server_ports})
+        # Floating IPs and networks are retrieved concurrently.
         if router_enabled:
             self.qclient.list_floatingips(tenant_id=tenant_id,
                                           port_id=server_port_ids) \
-                .AndReturn({'floatingips': assoc_fips})
+                .InAnyOrder().AndReturn({'floatingips': assoc_fips})
             self.qclient.list_ports(tenant_id=tenant_id) \
-                .AndReturn({'ports': self.api_ports.list()})
+                .InAnyOrder().AndReturn({'ports': self.api_ports.list()})
+        # Only the network names are used, their subnets are not listed.
         self.qclient.list_networks(id=frozenset(server_network_ids)) \
-            .AndReturn({'networks': server_networks})
-        self.qclient.list_subnets() \
-            .AndReturn({'subnets': self.api_subnets.list()})
+            .InAnyOrder().AndReturn({'networks': server_networks})
         self.mox.ReplayAll()
 
         api.network.servers_update_addresses(self.request, servers)
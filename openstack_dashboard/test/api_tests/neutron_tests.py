@@ -35,16 +35,68 @@ class NeutronApiTestBase(test.APITestCase):
 class NeutronApiTests(test.APITestCase):
     def test_network_list(self):
         networks = {'networks': self.api_networks.list()}
-        subnets = {'subnets': self.api_subnets.list()}
+        subnet_ids = set(s for n in self.api_networks.list()
+                         for s in n['subnets'])
+        subnets = {'subnets': [s for s in self.api_subnets.list()
+                               if s['id'] in subnet_ids]}
 
         neutronclient = self.stub_neutronclient()
         neutronclient.list_networks().AndReturn(networks)
-        neutronclient.list_subnets().AndReturn(subnets)
+        # Only the subnets of the networks are retrieved.
+        neutronclient.list_subnets(id=tuple(sorted(subnet_ids))) \
+            .AndReturn(subnets)
         self.mox.ReplayAll()
 
         ret_val = api.neutron.network_list(self.request)
         for n in ret_val:
             self.assertIsInstance(n, api.neutron.Network)
+            for subnet in n['subnets']:
+                self.assertIsInstance(subnet, api.neutron.Subnet)
+
+    def test_network_list_without_subnets(self):
+        networks = {'networks': self.api_networks.list()}
+
+        neutronclient = self.stub_neutronclient()
+        neutronclient.list_networks().AndReturn(networks)
+        self.mox.ReplayAll()
+
+        ret_val = api.neutron.network_list(self.request, expand_subnet=False)
+        for n in ret_val:
+            self.assertIsInstance(n, api.neutron.Network)
+
+    def test_network_list_for_tenant_shares_subnets(self):
+        tenant_id = '1'
+        api_networks = self.api_networks.list()
+        own_networks = [n for n in api_networks
+                        if n['tenant_id'] == tenant_id and not n['shared']]
+        # The shared sub-query returns an owned network again, whose
+        # subnets are not retrieved twice.
+        shared_networks = [n for n in api_networks if n['shared']]
+        shared_networks = (shared_networks +
+                           [copy.deepcopy(n) for n in own_networks[:1]])
+        own_subnet_ids = set(s for n in own_networks for s in n['subnets'])
+        shared_subnet_ids = set(s for n in shared_networks
+                                for s in n['subnets']) - own_subnet_ids
+        api_subnets = self.api_subnets.list()
+
+        neutronclient = self.stub_neutronclient()
+        neutronclient.list_networks(tenant_id=tenant_id, shared=False) \
+            .AndReturn({'networks': own_networks})
+        neutronclient.list_subnets(id=tuple(sorted(own_subnet_ids))) \
+            .AndReturn({'subnets': [s for s in api_subnets
+                                    if s['id'] in own_subnet_ids]})
+        neutronclient.list_networks(shared=True) \
+            .AndReturn({'networks': shared_networks})
+        if shared_subnet_ids:
+            neutronclient.list_subnets(id=tuple(sorted(shared_subnet_ids))) \
+                .AndReturn({'subnets': [s for s in api_subnets
+                                        if s['id'] in shared_subnet_ids]})
+        self.mox.ReplayAll()
+
+        ret_val = api.neutron.network_list_for_tenant(self.request, tenant_id)
+        for n in ret_val:
+            for subnet in n['subnets']:
+                self.assertIsInstance(subnet, api.neutron.Subnet)
 
     @test.create_stubs({api.neutron: ('network_list',
                                       'subnet_list')})
@@ -729,16 +781,47 @@ class NeutronApiTests(test.APITestCase):
         neutronclient = self.stub_neutronclient()
         uri_len_exc = neutron_exc.RequestURITooLong(excess=220)
         neutronclient.list_ports(id=port_ids).AndRaise(uri_len_exc)
+        # The chunks are requested concurrently.
+        for i in range(0, 10, 4):
+            neutronclient.list_ports(id=tuple(port_ids[i:i + 4])) \
+                .InAnyOrder() \
+                .AndReturn({'ports': ports[i:i + 4]})
+        # The accepted URI length is remembered, so the second listing
+        # is split right away.
         for i in range(0, 10, 4):
-            neutronclient.list_ports(id=port_ids[i:i + 4]) \
+            neutronclient.list_ports(id=tuple(port_ids[i:i + 4])) \
+                .InAnyOrder() \
                 .AndReturn({'ports': ports[i:i + 4]})
         self.mox.ReplayAll()
 
+        for __ in range(2):
+            ret_val = api.neutron.list_resources_with_long_filters(
+                api.neutron.port_list, 'id', port_ids,
+                request=self.request)
+            self.assertEqual(10, len(ret_val))
+            self.assertEqual(port_ids, [p.id for p in ret_val])
+
+    def test_list_resources_with_long_filters_duplicates(self):
+        ports = [{'id': uuidutils.generate_uuid(),
+                  'name': 'port%s' % i,
+                  'admin_state_up': True}
+                 for i in range(4)]
+        port_ids = [port['id'] for port in ports]
+
+        neutronclient = self.stub_neutronclient()
+        uri_len_exc = neutron_exc.RequestURITooLong(excess=220)
+        neutronclient.list_ports(id=port_ids + port_ids).AndRaise(uri_len_exc)
+        for i in range(0, 4, 2):
+            # Each chunk returns a resource of the other chunk as well.
+            neutronclient.list_ports(id=tuple(port_ids[i:i + 2])) \
+                .InAnyOrder() \
+                .AndReturn({'ports': ports[i:i + 2] + ports[2 - i:3 - i]})
+        self.mox.ReplayAll()
+
         ret_val = api.neutron.list_resources_with_long_filters(
-            api.neutron.port_list, 'id', port_ids,
+            api.neutron.port_list, 'id', port_ids + port_ids,
             request=self.request)
-        self.assertEqual(10, len(ret_val))
-        self.assertEqual(port_ids, [p.id for p in ret_val])
+        self.assertEqual(sorted(port_ids), sorted(p.id for p in ret_val))
 
     def test_qos_policies_list(self):
         exp_policies = self.qos_policies.list()
@@ -1158,7 +1241,8 @@ class NeutronApiFloatingIpTests(NeutronApiTestBase):
                                                            shared_nets})
         shared_subs = [s for s in self.api_subnets.list()
                        if s['id'] in shared_subnet_ids]
-        self.qclient.list_subnets().AndReturn({'subnets': shared_subs})
+        self.qclient.list_subnets(id=tuple(sorted(set(shared_subnet_ids)))) \
+            .AndReturn({'subnets': shared_subs})
 
         self.mox.ReplayAll()
 
@@ -1167,6 +1251,8 @@ class NeutronApiFloatingIpTests(NeutronApiTestBase):
         for ret, exp in zip(rets, target_ports):
             self.assertEqual(exp[0], ret.id)
             self.assertEqual(exp[1], ret.name)
+        # The targets of the project are cached.
+        self.assertIs(rets, api.neutron.floating_ip_target_list(self.request))
 
     def test_floating_ip_target_get_by_instance(self):
         ports = self.api_ports.list()
@@ -1209,3 +1295,24 @@ class NeutronApiFloatingIpTests(NeutronApiTestBase):
         ret = api.neutron.floating_ip_target_list_by_instance(
             self.request, 'vm2', target_list)
         self.assertEqual(['id21', 'id22'], ret)
+
+    def test_floating_ip_target_list_index(self):
+        target_list = api.neutron.FloatingIpTargetList([
+            {'name': 'name11', 'id': 'id11', 'instance_id': 'vm1',
+             'port_id': 'port1'},
+            {'name': 'name21', 'id': 'id21', 'instance_id': 'vm2',
+             'port_id': 'port2'},
+            {'name': 'name22', 'id': 'id22', 'instance_id': 'vm2',
+             'port_id': 'port2'}])
+        self.mox.ReplayAll()
+
+        self.assertEqual({'port1': ['id11'], 'port2': ['id21', 'id22']},
+                         target_list.by_port)
+        self.assertEqual('id21',
+                         api.neutron.floating_ip_target_get_by_instance(
+                             self.request, 'vm2', target_list))
+        self.assertIsNone(api.neutron.floating_ip_target_get_by_instance(
+            self.request, 'vm3', target_list))
+        self.assertEqual(['id21', 'id22'],
+                         api.neutron.floating_ip_target_list_by_instance(
+                             self.request, 'vm2', target_list))
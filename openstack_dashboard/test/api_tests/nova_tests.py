@@ -23,10 +23,12 @@ from django.conf import settings
 from django import http
 from django.test.utils import override_settings
 
+import mock
 from mox3.mox import IsA
 from novaclient import api_versions
 from novaclient import exceptions as nova_exceptions
 from novaclient.v2 import flavor_access as nova_flavor_access
+from novaclient.v2 import server_groups as nova_server_groups
 from novaclient.v2 import servers
 
 from horizon import exceptions as horizon_exceptions
@@ -199,6 +201,66 @@ class ComputeApiTests(test.APITestCase):
         self.assertEqual(page_size, len(ret_val))
         self.assertTrue(has_more)
 
+    def test_server_iter(self):
+        servers = self.servers.list()
+        novaclient = self.stub_novaclient()
+        novaclient.servers = self.mox.CreateMockAnything()
+        novaclient.versions = self.mox.CreateMockAnything()
+        novaclient.versions.get_current().AndReturn("2.45")
+        marker = None
+        for i in range(0, len(servers), 2):
+            novaclient.servers.list(True, {'all_tenants': True},
+                                    marker=marker, limit=2) \
+                .AndReturn(servers[i:i + 2])
+            marker = servers[i:i + 2][-1].id
+        novaclient.servers.list(True, {'all_tenants': True},
+                                marker=marker, limit=2).AndReturn([])
+        self.mox.ReplayAll()
+
+        ret_val = list(api.nova.server_iter(self.request,
+                                            {'all_tenants': True,
+                                             'paginate': True},
+                                            page_size=2))
+        for server in ret_val:
+            self.assertIsInstance(server, api.nova.Server)
+        self.assertEqual([s.id for s in servers], [s.id for s in ret_val])
+
+    def test_server_iter_short_pages(self):
+        servers = self.servers.list()
+        novaclient = self.stub_novaclient()
+        novaclient.servers = self.mox.CreateMockAnything()
+        novaclient.versions = self.mox.CreateMockAnything()
+        novaclient.versions.get_current().AndReturn("2.45")
+        # Nova returns pages of 2 servers when 3 are requested.
+        novaclient.servers.list(True, {'project_id': self.tenant.id},
+                                marker=None, limit=3) \
+            .AndReturn(servers[:2])
+        novaclient.servers.list(True, {'project_id': self.tenant.id},
+                                marker=servers[1].id, limit=3) \
+            .AndReturn(servers[2:3])
+        novaclient.servers.list(True, {'project_id': self.tenant.id},
+                                marker=servers[2].id, limit=3) \
+            .AndReturn([])
+        self.mox.ReplayAll()
+
+        ret_val = list(api.nova.server_iter(self.request, page_size=3))
+        self.assertEqual([s.id for s in servers[:3]],
+                         [s.id for s in ret_val])
+
+    def test_server_iter_stops_early(self):
+        servers = self.servers.list()
+        novaclient = self.stub_novaclient()
+        novaclient.servers = self.mox.CreateMockAnything()
+        novaclient.versions = self.mox.CreateMockAnything()
+        novaclient.versions.get_current().AndReturn("2.45")
+        novaclient.servers.list(True, {'project_id': self.tenant.id},
+                                marker=None, limit=1) \
+            .AndReturn(servers[:1])
+        self.mox.ReplayAll()
+
+        server_iter = api.nova.server_iter(self.request, page_size=1)
+        self.assertEqual(servers[0].id, next(server_iter).id)
+
     def test_usage_get(self):
         novaclient = self.stub_novaclient()
         novaclient.versions = self.mox.CreateMockAnything()
@@ -663,3 +725,24 @@ class ComputeApiTests(test.APITestCase):
         ret_val = api.nova.server_group_list(self.request)
         self.assertIsInstance(ret_val, list)
         self.assertEqual(len(ret_val), len(server_groups))
+
+    @mock.patch.object(api.nova, 'server_group_get')
+    @mock.patch.object(api.nova, 'server_group_list')
+    def test_server_group_list_detailed(self, mock_list, mock_get):
+        manager = nova_server_groups.ServerGroupsManager(None)
+        listed = nova_server_groups.ServerGroup(
+            manager, {'id': 'sg2', 'name': 'partial'}, loaded=True)
+        detailed = nova_server_groups.ServerGroup(
+            manager, {'id': 'sg2', 'name': 'partial',
+                      'policies': ['affinity'], 'members': ['a', 'b']})
+        mock_list.return_value = [self.server_groups.first(), listed]
+        mock_get.return_value = detailed
+
+        ret_val = api.nova.server_group_list_detailed(self.request)
+
+        # Only the server group listed without its details is retrieved.
+        mock_list.assert_called_once_with(self.request)
+        mock_get.assert_called_once_with(self.request, 'sg2')
+        self.assertEqual([self.server_groups.first().id, 'sg2'],
+                         [sg.id for sg in ret_val])
+        self.assertEqual([0, 2], [sg.member_count for sg in ret_val])
@@ -79,3 +79,34 @@ class AdminPolicyRestTestCase(test.BaseAdminViewTests):
         response = policy.Policy().post(request)
         self.assertStatusCode(response, 200)
         self.assertEqual({"allowed": True}, response.json)
+
+
+class PolicyBatchRestTestCase(test.TestCase):
+    @override_settings(POLICY_CHECK_FUNCTION='openstack_auth.policy.check')
+    def test_policy_batch(self):
+        request = self.mock_rest_request(body='''
+            {"checks": {
+                "stop": {"rules": [["compute", "os_compute_api:stop"]],
+                         "target": {"project_id": "1"}},
+                "all_tenants": {
+                    "rules": [["compute",
+                               "os_compute_api:servers:index:get_all_tenants"]]
+                }}}''')
+        response = policy.PolicyBatch().post(request)
+        self.assertStatusCode(response, 200)
+        self.assertEqual({"allowed": {"stop": True, "all_tenants": False}},
+                         response.json)
+
+    @override_settings(POLICY_CHECK_FUNCTION='openstack_auth.policy.check')
+    def test_policy_batch_empty(self):
+        request = self.mock_rest_request(body='{"checks": {}}')
+        response = policy.PolicyBatch().post(request)
+        self.assertStatusCode(response, 200)
+        self.assertEqual({"allowed": {}}, response.json)
+
+    @override_settings(POLICY_CHECK_FUNCTION='openstack_auth.policy.check')
+    def test_policy_batch_error(self):
+        request = self.mock_rest_request(
+            body='{"checks": {"stop": {"bad": "compute"}}}')
+        response = policy.PolicyBatch().post(request)
+        self.assertStatusCode(response, 400)
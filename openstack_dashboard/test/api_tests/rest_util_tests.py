@@ -11,6 +11,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import json
+
+import mock
+
+from openstack_dashboard.api import base
 from openstack_dashboard.api.rest import json_encoder
 from openstack_dashboard.api.rest import utils
 from openstack_dashboard.test import helpers as test
@@ -247,3 +252,50 @@ class JSONEncoderTestCase(test.TestCase):
 
         self.assertNotEqual(default_encoder_response.content,
                             custom_encoder_response.content)
+
+    def test_custom_encoder_uses_c_encoder_for_conventional_data(self):
+        data = dict(self.conventional_data, nanKey=1.5)
+        with mock.patch.object(json.encoder, '_make_iterencode',
+                               wraps=json.encoder._make_iterencode) as m:
+            content = json.dumps(data, cls=json_encoder.NaNJSONEncoder)
+        if json.encoder.c_make_encoder is not None:
+            self.assertFalse(m.called)
+        self.assertEqual(json.dumps(data), content)
+
+    def test_custom_encoder_nested_infinity(self):
+        content = json.dumps({'items': [1.5, self.data_inf]},
+                             cls=json_encoder.NaNJSONEncoder)
+        self.assertEqual('{"items": [1.5, 1e+999]}', content)
+
+    def test_custom_encoder_sorted_keys_infinity(self):
+        content = json.dumps({'b': self.data_inf, 'a': 1}, sort_keys=True,
+                             cls=json_encoder.NaNJSONEncoder)
+        self.assertEqual('{"a": 1, "b": 1e+999}', content)
+
+    def test_api_wrappers_encoded_through_to_dict(self):
+        @utils.ajax()
+        def f(self, request):
+            return {'items': [base.APIDictWrapper({'id': 'one'})]}
+
+        response = f(self, self.mock_rest_request())
+        self.assertEqual({'items': [{'id': 'one'}]}, response.json)
+
+    def test_streaming_response(self):
+        data = {'items': [base.APIDictWrapper({'id': i}) for i in range(3)],
+                'has_more_data': False,
+                'key': self.data_inf}
+
+        @utils.ajax(json_encoder=json_encoder.NaNJSONEncoder)
+        def f(self, request):
+            return data
+
+        @utils.ajax(json_encoder=json_encoder.NaNJSONEncoder, streaming=True)
+        def g(self, request):
+            return data
+
+        request = self.mock_rest_request()
+        response = g(self, request)
+        self.assertStatusCode(response, 200)
+        self.assertEqual('application/json', response['content-type'])
+        self.assertEqual(f(self, request).content,
+                         b''.join(response.streaming_content))
@@ -130,6 +130,26 @@ settings_utils.update_dashboards(
 
 OPENSTACK_PROFILER = {'enabled': False}
 
+# Run batch actions, tabs and workflow choice population serially so that
+# mox sees API calls in a fixed order.
+BATCH_ACTION_MAX_WORKERS = 1
+TAB_LOAD_MAX_WORKERS = 1
+WORKFLOW_POPULATE_MAX_WORKERS = 1
+
+# Do not share quota usages between the requests of a test.
+QUOTA_USAGE_CACHE_TIMEOUT = 0
+
+# Retrieve the usage of a period at once instead of day by day.
+USAGE_ROLLUP_CACHE_TIMEOUT = 0
+
+# Check the access to the panels on every page, as mox expects the API
+# calls made by these checks.
+NAV_CACHE_TIMEOUT = 0
+
+# Evaluate the policy rules on every check, as the tests switch the roles
+# of the user without changing its token.
+POLICY_CHECK_CACHE_TIMEOUT = 0
+
 settings_utils.find_static_files(HORIZON_CONFIG, AVAILABLE_THEMES,
                                  THEME_COLLECTION_DIR, ROOT_PATH)
 
@@ -190,6 +190,7 @@ def data(TEST):
         dict(id="41023e92-8008-4c8b-8059-7f2293ff3775",
              name='test',
              policies=['test'],
+             members=[],
              ))
     TEST.server_groups.add(server_group)
 
@@ -0,0 +1,72 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import time
+
+from django.core.cache import caches
+import futurist
+import mock
+
+from openstack_dashboard import api
+from openstack_dashboard import platform_info
+from openstack_dashboard.test import helpers as test
+
+
+class PlatformInfoTests(test.TestCase):
+    def setUp(self):
+        super(PlatformInfoTests, self).setUp()
+        caches['default'].clear()
+        self.addCleanup(caches['default'].clear)
+        patcher = mock.patch.object(
+            platform_info, '_get_refresh_executor',
+            return_value=futurist.SynchronousExecutor())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(api, 'sysinv', create=True)
+        self.sysinv = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.sysinv.system_list.return_value = [mock.Mock()]
+        self.sysinv.system_list.return_value[0].name = 'system-1'
+
+    def test_get_system_name(self):
+        # The first page is rendered before the name is known.
+        self.assertEqual('', platform_info.get_system_name(self.request))
+        self.assertEqual('system-1',
+                         platform_info.get_system_name(self.request))
+        self.sysinv.system_list.assert_called_once_with(self.request)
+
+    def test_get_system_name_stale(self):
+        platform_info.get_system_name(self.request)
+        self.sysinv.system_list.return_value[0].name = 'system-2'
+
+        with mock.patch.object(time, 'time',
+                               return_value=time.time() + 3600):
+            self.assertEqual('system-1',
+                             platform_info.get_system_name(self.request))
+            self.assertEqual('system-2',
+                             platform_info.get_system_name(self.request))
+        self.assertEqual(2, self.sysinv.system_list.call_count)
+
+    def test_get_system_name_error(self):
+        self.sysinv.system_list.side_effect = Exception()
+
+        self.assertEqual('', platform_info.get_system_name(self.request))
+        self.assertEqual('', platform_info.get_system_name(self.request))
+        self.sysinv.system_list.assert_called_once_with(self.request)
+
+    @mock.patch.object(api.base, 'is_stx_region', return_value=False)
+    def test_get_platform_info_not_stx_region(self, mock_is_stx_region):
+        self.assertEqual({'system_name': '',
+                          'alarmbanner': False,
+                          'stx_region': False},
+                         platform_info.get_platform_info(self.request))
+        self.assertFalse(self.sysinv.system_list.called)
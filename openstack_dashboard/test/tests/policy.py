@@ -12,6 +12,7 @@
 #    under the License.
 
 from django.test.utils import override_settings
+import mock
 
 from openstack_dashboard import policy
 from openstack_dashboard.test import helpers as test
@@ -30,6 +31,60 @@ class PolicyTestCase(test.TestCase):
                              request=self.request)
         self.assertTrue(value)
 
+    @override_settings(POLICY_CHECK_FUNCTION='openstack_auth.policy.check')
+    def test_policy_check_function_imported_once(self):
+        with mock.patch.object(policy.utils_settings, 'import_object',
+                               return_value=lambda *args: False) as m_import:
+            policy._policy_check_functions.clear()
+            self.addCleanup(policy._policy_check_functions.clear)
+            policy.check((("identity", "admin_required"),),
+                         request=self.request)
+            value = policy.check((("identity", "admin_required"),),
+                                 request=self.request)
+        self.assertFalse(value)
+        m_import.assert_called_once_with('openstack_auth.policy.check')
+
+
+@override_settings(POLICY_CHECK_CACHE_TIMEOUT=300)
+class PolicyDecisionCacheTestCase(test.TestCase):
+    def setUp(self):
+        super(PolicyDecisionCacheTestCase, self).setUp()
+        policy.get_decision_cache().clear()
+        self.policy_check = mock.Mock(return_value=False)
+        self.addCleanup(policy.get_decision_cache().clear)
+
+    def test_decision_cached(self):
+        rules = (("identity", "admin_required"),)
+        with override_settings(POLICY_CHECK_FUNCTION=self.policy_check):
+            self.assertFalse(policy.check(rules, self.request))
+            self.assertFalse(policy.check(rules, self.request))
+        self.policy_check.assert_called_once_with(rules, self.request, None)
+
+    def test_decision_cached_per_target(self):
+        rules = (("identity", "admin_required"),)
+        with override_settings(POLICY_CHECK_FUNCTION=self.policy_check):
+            policy.check(rules, self.request, {'project_id': '1'})
+            policy.check(rules, self.request, {'project_id': '2'})
+            policy.check(rules, self.request, {'project_id': '1'})
+        self.assertEqual(2, self.policy_check.call_count)
+
+    def test_decision_cached_per_token(self):
+        rules = (("identity", "admin_required"),)
+        with override_settings(POLICY_CHECK_FUNCTION=self.policy_check):
+            policy.check(rules, self.request)
+            with mock.patch.object(self.request.user.token, 'id',
+                                   'another-token'):
+                policy.check(rules, self.request)
+        self.assertEqual(2, self.policy_check.call_count)
+
+    @override_settings(POLICY_CHECK_CACHE_TIMEOUT=0)
+    def test_decision_cache_disabled(self):
+        rules = (("identity", "admin_required"),)
+        with override_settings(POLICY_CHECK_FUNCTION=self.policy_check):
+            policy.check(rules, self.request)
+            policy.check(rules, self.request)
+        self.assertEqual(2, self.policy_check.call_count)
+
 
 class PolicyBackendTestCaseAdmin(test.BaseAdminViewTests):
     @override_settings(POLICY_CHECK_FUNCTION='openstack_auth.policy.check')
@@ -19,13 +19,19 @@
 
 from __future__ import absolute_import
 
+import copy
+import threading
+
 from django import http
 from django.test.utils import override_settings
 from django.utils.translation import ugettext_lazy as _
+import mock
 from mox3.mox import IsA
 
 from horizon import exceptions
+from horizon.utils import memoized
 from openstack_dashboard import api
+from openstack_dashboard.api import base as base_api
 from openstack_dashboard.api import cinder
 from openstack_dashboard.test import helpers as test
 from openstack_dashboard.usage import quotas
@@ -79,7 +85,7 @@ class QuotaTests(test.APITestCase):
                             actual_usages.items() if 'available' in value}
         self.assertEqual(expected_available, actual_available)
 
-    @test.create_stubs({api.nova: ('server_list',
+    @test.create_stubs({api.nova: ('server_iter',
                                    'flavor_list',
                                    'tenant_quota_get',),
                         api.neutron: ('tenant_floating_ip_list',
@@ -104,8 +110,8 @@ class QuotaTests(test.APITestCase):
             .AndReturn(self.floating_ips.list())
         opts = {'tenant_id': tenant_id,
                 'all_tenants': 1}
-        api.nova.server_list(IsA(http.HttpRequest), search_opts=opts) \
-            .AndReturn([servers, False])
+        api.nova.server_iter(IsA(http.HttpRequest), search_opts=opts) \
+            .AndReturn(iter(servers))
         api.nova.tenant_quota_get(IsA(http.HttpRequest), tenant_id) \
             .AndReturn(self.quotas.first())
 
@@ -131,7 +137,7 @@ class QuotaTests(test.APITestCase):
         # Compare available resources
         self.assertAvailableQuotasEqual(expected_output, quota_usages.usages)
 
-    @test.create_stubs({api.nova: ('server_list',
+    @test.create_stubs({api.nova: ('server_iter',
                                    'flavor_list',
                                    'tenant_quota_get',),
                         api.neutron: ('tenant_floating_ip_list',
@@ -160,8 +166,8 @@ class QuotaTests(test.APITestCase):
                     .AndReturn(True)
                 api.neutron.tenant_floating_ip_list(IsA(http.HttpRequest)) \
                     .AndReturn(self.floating_ips.list())
-                api.nova.server_list(IsA(http.HttpRequest)) \
-                    .AndReturn([servers, False])
+                api.nova.server_iter(IsA(http.HttpRequest)) \
+                    .AndReturn(iter(servers))
                 api.nova.tenant_quota_get(IsA(http.HttpRequest), '1') \
                     .AndReturn(self.quotas.first())
 
@@ -215,7 +221,7 @@ class QuotaTests(test.APITestCase):
                            quotas.NOVA_QUOTA_FIELDS)
         self.assertItemsEqual(result_quotas, expected_quotas)
 
-    @test.create_stubs({api.nova: ('server_list',
+    @test.create_stubs({api.nova: ('server_iter',
                                    'flavor_list',
                                    'tenant_quota_get',),
                         api.neutron: ('tenant_floating_ip_list',
@@ -241,8 +247,8 @@ class QuotaTests(test.APITestCase):
             .AndReturn(True)
         api.neutron.tenant_floating_ip_list(IsA(http.HttpRequest)) \
             .AndReturn(self.floating_ips.list())
-        api.nova.server_list(IsA(http.HttpRequest)) \
-            .AndReturn([servers, False])
+        api.nova.server_iter(IsA(http.HttpRequest)) \
+            .AndReturn(iter(servers))
 
         self.mox.ReplayAll()
 
@@ -257,7 +263,7 @@ class QuotaTests(test.APITestCase):
         self.assertIn('ram', quota_usages)
         self.assertIsNotNone(quota_usages.get('ram'))
 
-    @test.create_stubs({api.nova: ('server_list',
+    @test.create_stubs({api.nova: ('server_iter',
                                    'flavor_list',
                                    'tenant_quota_get',),
                         api.neutron: ('tenant_floating_ip_list',
@@ -280,7 +286,7 @@ class QuotaTests(test.APITestCase):
             .AndReturn(True)
         api.neutron.tenant_floating_ip_list(IsA(http.HttpRequest)) \
             .AndReturn([])
-        api.nova.server_list(IsA(http.HttpRequest)).AndReturn([[], False])
+        api.nova.server_iter(IsA(http.HttpRequest)).AndReturn(iter([]))
 
         self.mox.ReplayAll()
 
@@ -296,7 +302,7 @@ class QuotaTests(test.APITestCase):
         # Compare internal structure of usages to expected.
         self.assertItemsEqual(expected_output, quota_usages.usages)
 
-    @test.create_stubs({api.nova: ('server_list',
+    @test.create_stubs({api.nova: ('server_iter',
                                    'flavor_list',
                                    'tenant_quota_get',),
                         api.neutron: ('tenant_floating_ip_list',
@@ -326,7 +332,7 @@ class QuotaTests(test.APITestCase):
             .AndReturn(True)
         api.neutron.tenant_floating_ip_list(IsA(http.HttpRequest)) \
             .AndReturn(self.floating_ips.list())
-        api.nova.server_list(IsA(http.HttpRequest)).AndReturn([servers, False])
+        api.nova.server_iter(IsA(http.HttpRequest)).AndReturn(iter(servers))
         opts = {'all_tenants': 1, 'project_id': self.request.user.tenant_id}
         cinder.volume_list(IsA(http.HttpRequest), opts) \
             .AndReturn(self.volumes.list())
@@ -346,7 +352,7 @@ class QuotaTests(test.APITestCase):
         # Compare internal structure of usages to expected.
         self.assertItemsEqual(expected_output, quota_usages.usages)
 
-    @test.create_stubs({api.nova: ('server_list',
+    @test.create_stubs({api.nova: ('server_iter',
                                    'flavor_list',
                                    'tenant_quota_get',),
                         api.neutron: ('tenant_floating_ip_list',
@@ -372,7 +378,7 @@ class QuotaTests(test.APITestCase):
             .AndReturn(self.quotas.first())
         api.neutron.floating_ip_supported(IsA(http.HttpRequest)) \
             .AndReturn(False)
-        api.nova.server_list(IsA(http.HttpRequest)).AndReturn([servers, False])
+        api.nova.server_iter(IsA(http.HttpRequest)).AndReturn(iter(servers))
         opts = {'all_tenants': 1, 'project_id': self.request.user.tenant_id}
         cinder.volume_list(IsA(http.HttpRequest), opts) \
             .AndReturn(self.volumes.list())
@@ -482,7 +488,7 @@ class QuotaTests(test.APITestCase):
             targets=('instances', 'cores', 'ram', 'volumes', ),
             use_flavor_list=True, use_cinder_call=True)
 
-    @test.create_stubs({api.nova: ('server_list',
+    @test.create_stubs({api.nova: ('server_iter',
                                    'flavor_list',
                                    'tenant_quota_get',),
                         api.base: ('is_service_enabled',),
@@ -505,8 +511,8 @@ class QuotaTests(test.APITestCase):
             if use_flavor_list:
                 api.nova.flavor_list(IsA(http.HttpRequest)) \
                     .AndReturn(self.flavors.list())
-            api.nova.server_list(IsA(http.HttpRequest)) \
-                    .AndReturn([servers, False])
+            api.nova.server_iter(IsA(http.HttpRequest)) \
+                    .AndReturn(iter(servers))
             api.nova.tenant_quota_get(IsA(http.HttpRequest), '1') \
                 .AndReturn(self.quotas.first())
 
@@ -574,7 +580,8 @@ class QuotaTests(test.APITestCase):
             .AndReturn(self.neutron_quotas.first())
         if 'networks' in targets:
             api.neutron.network_list(IsA(http.HttpRequest),
-                                     tenant_id=self.request.user.tenant_id) \
+                                     tenant_id=self.request.user.tenant_id,
+                                     expand_subnet=False) \
                 .AndReturn(self.networks.list())
         if 'subnets' in targets:
             api.neutron.subnet_list(IsA(http.HttpRequest),
@@ -621,3 +628,74 @@ class QuotaTests(test.APITestCase):
         self.assertEqual(expected, quota_usages.usages)
         # Compare available resources
         self.assertAvailableQuotasEqual(expected, quota_usages.usages)
+
+    @override_settings(QUOTA_USAGE_CACHE_TIMEOUT=10)
+    @mock.patch.object(quotas, '_collect_tenant_usages')
+    @mock.patch.object(quotas, 'get_tenant_quota_data')
+    @mock.patch.object(quotas, 'get_disabled_quotas')
+    def test_tenant_quota_usages_shared_cache(self, mock_disabled,
+                                              mock_quota_data,
+                                              mock_collect):
+        def collect(request, usages, disabled_quotas, tenant_id):
+            usages.tally('instances', 2)
+
+        mock_disabled.return_value = set()
+        mock_quota_data.return_value = base_api.QuotaSet({'instances': 10})
+        mock_collect.side_effect = collect
+
+        usages = quotas.tenant_quota_usages(self.request)
+        self.assertEqual({'quota': 10, 'used': 2, 'available': 8},
+                         usages['instances'])
+        # Modifying the result does not leak into the cache.
+        usages.tally('instances', 1)
+
+        # Another request of the same project is served from the cache.
+        request = copy.copy(self.request)
+        usages = quotas.tenant_quota_usages(request)
+        self.assertEqual({'quota': 10, 'used': 2, 'available': 8},
+                         usages['instances'])
+        self.assertEqual(1, mock_collect.call_count)
+
+        memoized.invalidate_shared(quotas.QUOTA_USAGE_CACHE)
+        request = copy.copy(self.request)
+        quotas.tenant_quota_usages(request)
+        self.assertEqual(2, mock_collect.call_count)
+
+    @override_settings(QUOTA_USAGE_TIMEOUTS={'volume': 0.1})
+    def test_collect_tenant_usages_timeout(self):
+        release = threading.Event()
+
+        def compute(request, usages, disabled_quotas, tenant_id):
+            usages.tally('instances', 2)
+
+        def volume(request, usages, disabled_quotas, tenant_id):
+            release.wait()
+            usages.tally('volumes', 1)
+
+        collectors = (('compute', compute, 'compute failed'),
+                      ('volume', volume, 'volume failed'))
+        usages = quotas.QuotaUsage()
+        try:
+            with mock.patch.object(quotas, 'USAGE_COLLECTORS', collectors):
+                # The volumes must not be reported as unused.
+                self.assertRaisesRegexp(
+                    exceptions.NotAvailable, 'volume failed',
+                    quotas._collect_tenant_usages,
+                    self.request, usages, set(), '1')
+        finally:
+            release.set()
+
+    def test_collect_tenant_usages_error(self):
+        def compute(request, usages, disabled_quotas, tenant_id):
+            usages.tally('instances', 2)
+
+        def network(request, usages, disabled_quotas, tenant_id):
+            raise exceptions.NotAvailable()
+
+        collectors = (('compute', compute, 'compute failed'),
+                      ('network', network, 'network failed'))
+        usages = quotas.QuotaUsage()
+        with mock.patch.object(quotas, 'USAGE_COLLECTORS', collectors):
+            self.assertRaises(exceptions.NotAvailable,
+                              quotas._collect_tenant_usages,
+                              self.request, usages, set(), '1')
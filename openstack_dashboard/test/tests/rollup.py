@@ -0,0 +1,149 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import absolute_import
+
+import datetime
+
+from django.test.utils import override_settings
+import mock
+from novaclient.v2 import usage as nova_usage
+
+from openstack_dashboard import api
+from openstack_dashboard.test import helpers as test
+from openstack_dashboard.usage import rollup
+
+
+def _make_usage(tenant_id, hours, state):
+    return api.nova.NovaUsage(nova_usage.Usage(
+        nova_usage.UsageManager(None),
+        {'tenant_id': tenant_id,
+         'total_hours': hours,
+         'total_local_gb_usage': hours,
+         'total_memory_mb_usage': hours * 512,
+         'total_vcpus_usage': hours,
+         'server_usages': [{'instance_id': 'instance-1',
+                            'hours': hours,
+                            'vcpus': 1,
+                            'local_gb': 1,
+                            'memory_mb': 512,
+                            'state': state,
+                            'ended_at': None}]},
+        loaded=True))
+
+
+@override_settings(USAGE_ROLLUP_CACHE_TIMEOUT=3600)
+class UsageRollupTests(test.APITestCase):
+    def setUp(self):
+        super(UsageRollupTests, self).setUp()
+        rollup.get_rollup_cache().clear()
+        self.addCleanup(rollup.get_rollup_cache().clear)
+
+    def test_get_day_ranges(self):
+        start = datetime.datetime(2012, 1, 1)
+        end = datetime.datetime(2012, 1, 3, 23, 59, 59)
+
+        self.assertEqual([(start, datetime.datetime(2012, 1, 2)),
+                          (datetime.datetime(2012, 1, 2),
+                           datetime.datetime(2012, 1, 3)),
+                          (datetime.datetime(2012, 1, 3), end)],
+                         rollup.get_day_ranges(start, end))
+
+    def test_get_day_ranges_single_day(self):
+        start = datetime.datetime(2012, 1, 1)
+        end = datetime.datetime(2012, 1, 1, 23, 59, 59)
+
+        self.assertEqual([(start, end)], rollup.get_day_ranges(start, end))
+
+    @mock.patch.object(api.nova, 'usage_list')
+    def test_usage_list_merges_days(self, mock_usage_list):
+        days = {datetime.datetime(2012, 1, 1): _make_usage('1', 24, 'active'),
+                datetime.datetime(2012, 1, 2): _make_usage('1', 12,
+                                                           'stopped')}
+        mock_usage_list.side_effect = lambda request, start, end: [
+            days[start]]
+        start = datetime.datetime(2012, 1, 1)
+        end = datetime.datetime(2012, 1, 2, 23, 59, 59)
+
+        usages = rollup.usage_list(self.request, start, end)
+
+        self.assertEqual(1, len(usages))
+        self.assertEqual('1', usages[0].tenant_id)
+        self.assertEqual(36, usages[0].total_hours)
+        self.assertEqual(36 * 512, usages[0].total_memory_mb_usage)
+        self.assertEqual(1, len(usages[0].server_usages))
+        self.assertEqual(36, usages[0].server_usages[0]['hours'])
+        self.assertEqual('stopped', usages[0].server_usages[0]['state'])
+        self.assertEqual(2, mock_usage_list.call_count)
+
+    @mock.patch.object(api.nova, 'usage_list')
+    def test_usage_list_caches_past_days(self, mock_usage_list):
+        mock_usage_list.side_effect = lambda request, start, end: [
+            _make_usage('1', 24, 'active')]
+        start = datetime.datetime(2012, 1, 1)
+        end = datetime.datetime(2012, 1, 2, 23, 59, 59)
+
+        rollup.usage_list(self.request, start, end)
+        usages = rollup.usage_list(self.request, start, end)
+
+        self.assertEqual(48, usages[0].total_hours)
+        self.assertEqual(2, mock_usage_list.call_count)
+
+    @mock.patch.object(api.nova, 'usage_list')
+    def test_usage_list_refetches_today(self, mock_usage_list):
+        mock_usage_list.side_effect = lambda request, start, end: [
+            _make_usage('1', 1, 'active')]
+        now = datetime.datetime.utcnow()
+        start = datetime.datetime(now.year, now.month, now.day)
+        end = start + datetime.timedelta(hours=23, minutes=59, seconds=59)
+
+        rollup.usage_list(self.request, start, end)
+        rollup.usage_list(self.request, start, end)
+
+        self.assertEqual(2, mock_usage_list.call_count)
+
+    @mock.patch.object(api.nova, 'usage_get')
+    def test_usage_get_without_instances(self, mock_usage_get):
+        mock_usage_get.return_value = api.nova.NovaUsage(nova_usage.Usage(
+            nova_usage.UsageManager(None), {}, loaded=True))
+        start = datetime.datetime(2012, 1, 1)
+        end = datetime.datetime(2012, 1, 1, 23, 59, 59)
+
+        usage = rollup.usage_get(self.request, self.tenant.id, start, end)
+
+        self.assertEqual(self.tenant.id, usage.tenant_id)
+        self.assertEqual([], usage.server_usages)
+        self.assertEqual(0, usage.vcpu_hours)
+        mock_usage_get.assert_called_once_with(self.request, self.tenant.id,
+                                               start, end)
+
+    @override_settings(USAGE_ROLLUP_MAX_DAYS=2)
+    @mock.patch.object(api.nova, 'usage_list')
+    def test_usage_list_long_period(self, mock_usage_list):
+        usages = [_make_usage('1', 72, 'active')]
+        mock_usage_list.return_value = usages
+        start = datetime.datetime(2012, 1, 1)
+        end = datetime.datetime(2012, 1, 3, 23, 59, 59)
+
+        self.assertEqual(usages, rollup.usage_list(self.request, start, end))
+        mock_usage_list.assert_called_once_with(self.request, start, end)
+
+    @override_settings(USAGE_ROLLUP_CACHE_TIMEOUT=0)
+    @mock.patch.object(api.nova, 'usage_list')
+    def test_usage_list_disabled(self, mock_usage_list):
+        usages = [_make_usage('1', 24, 'active')]
+        mock_usage_list.return_value = usages
+        start = datetime.datetime(2012, 1, 1)
+        end = datetime.datetime(2012, 1, 2, 23, 59, 59)
+
+        self.assertEqual(usages, rollup.usage_list(self.request, start, end))
+        mock_usage_list.assert_called_once_with(self.request, start, end)
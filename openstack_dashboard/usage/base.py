@@ -23,6 +23,7 @@ from horizon import forms
 from horizon import messages
 
 from openstack_dashboard import api
+from openstack_dashboard.usage import rollup
 
 
 class BaseUsage(object):
@@ -262,7 +263,7 @@ class GlobalUsage(BaseUsage):
             if not req.GET.get('start') or not req.GET.get('end'):
                 return []
             req.session['usage_list'] = True
-        return api.nova.usage_list(self.request, start, end)
+        return rollup.usage_list(self.request, start, end)
 
 
 class ProjectUsage(BaseUsage):
@@ -274,7 +275,7 @@ class ProjectUsage(BaseUsage):
                                             self.show_deleted)
         instances = []
         deleted_instances = []
-        usage = api.nova.usage_get(self.request, self.project_id, start, end)
+        usage = rollup.usage_get(self.request, self.project_id, start, end)
         # Attribute may not exist if there are no instances
         if hasattr(usage, 'server_usages'):
             now = self.today
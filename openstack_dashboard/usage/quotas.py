@@ -11,12 +11,19 @@
 # under the License.
 
 from collections import defaultdict
+import copy
 import itertools
 import logging
+import time
 
+from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
+import futurist
+from futurist import waiters
 
 from horizon import exceptions
+from horizon.utils.memoized import get_request_scope
+from horizon.utils.memoized import get_shared_backend
 from horizon.utils.memoized import memoized
 
 from openstack_dashboard.api import base
@@ -93,6 +100,12 @@ QUOTA_NAMES = {
     "security_group_rule": _("Security Group Rules")
 }
 
+# Namespace of the shared cache holding the result of tenant_quota_usages.
+# The API wrappers creating or deleting quota-limited resources invalidate it.
+QUOTA_USAGE_CACHE = 'openstack_dashboard.usage.quotas.tenant_quota_usages'
+
+DEFAULT_QUOTA_USAGE_TIMEOUT = 30
+
 
 class QuotaUsage(dict):
     """Tracks quota limit, used, and available for a given set of quotas."""
@@ -317,39 +330,46 @@ def _get_tenant_compute_usages(request, usages, disabled_quotas, tenant_id):
     if tenant_id and tenant_id != request.user.project_id:
         # all_tenants is required when querying about any project the user is
         # not currently scoped to
-        instances, has_more = nova.server_list(
+        instances = nova.server_iter(
             request, search_opts={'tenant_id': tenant_id, 'all_tenants': True})
     else:
-        instances, has_more = nova.server_list(request)
+        instances = nova.server_iter(request)
+
+    # Only the flavor of each instance is needed, so count them while
+    # walking the pages instead of keeping every instance in memory.
+    instance_count = 0
+    flavor_counts = defaultdict(int)
+    for instance in instances:
+        instance_count += 1
+        flavor_counts[instance.flavor['id']] += 1
 
-    _add_usage_if_quota_enabled(usages, 'instances', len(instances),
+    _add_usage_if_quota_enabled(usages, 'instances', instance_count,
                                 disabled_quotas)
 
     if {'cores', 'ram'} - disabled_quotas:
         # Fetch deleted flavors if necessary.
         flavors = dict([(f.id, f) for f in nova.flavor_list(request)])
-        missing_flavors = [instance.flavor['id'] for instance in instances
-                           if instance.flavor['id'] not in flavors]
+        missing_flavors = [flavor_id for flavor_id in flavor_counts
+                           if flavor_id not in flavors]
         for missing in missing_flavors:
-            if missing not in flavors:
-                try:
-                    flavors[missing] = nova.flavor_get(request, missing)
-                except Exception:
-                    flavors[missing] = {}
-                    exceptions.handle(request, ignore=True)
+            try:
+                flavors[missing] = nova.flavor_get(request, missing)
+            except Exception:
+                flavors[missing] = {}
+                exceptions.handle(request, ignore=True)
 
         # Sum our usage based on the flavors of the instances.
-        for flavor in [flavors[instance.flavor['id']]
-                       for instance in instances]:
+        for flavor_id, count in flavor_counts.items():
+            flavor = flavors[flavor_id]
             _add_usage_if_quota_enabled(
-                usages, 'cores', getattr(flavor, 'vcpus', None),
+                usages, 'cores', (getattr(flavor, 'vcpus', None) or 0) * count,
                 disabled_quotas)
             _add_usage_if_quota_enabled(
-                usages, 'ram', getattr(flavor, 'ram', None),
+                usages, 'ram', (getattr(flavor, 'ram', None) or 0) * count,
                 disabled_quotas)
 
         # Initialize the tally if no instances have been launched yet
-        if len(instances) == 0:
+        if instance_count == 0:
             _add_usage_if_quota_enabled(usages, 'cores', 0, disabled_quotas)
             _add_usage_if_quota_enabled(usages, 'ram', 0, disabled_quotas)
 
@@ -378,7 +398,8 @@ def _get_tenant_network_usages(request, usages, disabled_quotas, tenant_id):
         usages.tally('security_groups', len(security_groups))
 
     if 'network' not in disabled_quotas:
-        networks = neutron.network_list(request, tenant_id=tenant_id)
+        networks = neutron.network_list(request, tenant_id=tenant_id,
+                                        expand_subnet=False)
         usages.tally('networks', len(networks))
 
     if 'subnet' not in disabled_quotas:
@@ -443,11 +464,91 @@ def _convert_targets_to_quota_keys(targets):
     return quota_keys
 
 
+@profiler.trace
+def _get_tenant_server_group_usages(request, usages, disabled_quotas,
+                                    tenant_id):
+    if 'server_groups' in disabled_quotas:
+        return
+
+    server_groups = []
+    try:
+        server_groups = nova.server_group_list(request)
+    except Exception:
+        pass
+
+    for server_group in server_groups:
+        project_id = getattr(server_group, 'project_id', None)
+        setattr(server_group, 'project_id', project_id)
+
+    usages.tally('server_groups', len([server_group for server_group in
+                                       server_groups if
+                                       server_group.project_id ==
+                                       request.user.tenant_id]))
+
+
+# Usage collectors run concurrently by tenant_quota_usages. Each one talks to
+# a single service and is keyed by the name used in QUOTA_USAGE_TIMEOUTS.
+USAGE_COLLECTORS = (
+    ('compute', _get_tenant_compute_usages,
+     _("Unable to retrieve compute usage information.")),
+    ('network', _get_tenant_network_usages,
+     _("Unable to retrieve network usage information.")),
+    ('volume', _get_tenant_volume_usages,
+     _("Unable to retrieve volume usage information.")),
+    ('server_groups', _get_tenant_server_group_usages,
+     _("Unable to retrieve server group usage information.")),
+)
+
+
+def _get_usage_timeouts():
+    timeouts = dict((service, DEFAULT_QUOTA_USAGE_TIMEOUT)
+                    for service, collector, msg in USAGE_COLLECTORS)
+    timeouts.update(getattr(settings, 'QUOTA_USAGE_TIMEOUTS', {}))
+    return timeouts
+
+
+def _collect_tenant_usages(request, usages, disabled_quotas, tenant_id):
+    """Runs the usage collectors concurrently and merges their tallies.
+
+    Every collector tallies into its own :class:`QuotaUsage` so that no
+    state is shared between threads. Like when the collectors ran one
+    after the other, the error of a collector is raised, so that no
+    usage is reported as lower than it is. A collector which does not
+    finish within its timeout raises :class:`~horizon.exceptions.NotAvailable`.
+    """
+    timeouts = _get_usage_timeouts()
+    start = time.time()
+    executor = futurist.ThreadPoolExecutor(max_workers=len(USAGE_COLLECTORS))
+    try:
+        futures = [(service, msg,
+                    executor.submit(collector, request, QuotaUsage(),
+                                    disabled_quotas, tenant_id))
+                   for service, collector, msg in USAGE_COLLECTORS]
+        # NOTE: The futures are waited for in the collector order, so the
+        # merged tallies and the errors do not depend on thread timing.
+        for service, msg, future in futures:
+            remaining = max(timeouts[service] - (time.time() - start), 0)
+            if not waiters.wait_for_all([future], timeout=remaining).done:
+                LOG.warning("Timed out after %s seconds collecting the %s "
+                            "quota usages.", timeouts[service], service)
+                raise exceptions.NotAvailable(msg)
+            collected = future.result()
+            for name, data in collected.usages.items():
+                if 'used' in data:
+                    usages.tally(name, data['used'])
+    finally:
+        # Do not wait for collectors which timed out.
+        executor.shutdown(wait=False)
+
+
 @profiler.trace
 @memoized
 def tenant_quota_usages(request, tenant_id=None, targets=None):
     """Get our quotas and construct our usage object.
 
+    The result is kept in the shared cache for
+    ``QUOTA_USAGE_CACHE_TIMEOUT`` seconds.
+
     :param tenant_id: Target tenant ID. If no tenant_id is provided,
         a the request.user.project_id is assumed to be used.
     :param targets: A tuple of quota names to be retrieved.
@@ -456,6 +557,16 @@ def tenant_quota_usages(request, tenant_id=None, targets=None):
     if not tenant_id:
         tenant_id = request.user.project_id
 
+    cache_timeout = getattr(settings, 'QUOTA_USAGE_CACHE_TIMEOUT', 10)
+    backend = get_shared_backend()
+    cache_key = (get_request_scope(request), tenant_id,
+                 tuple(sorted(targets)) if targets else None)
+    if cache_timeout:
+        cached = backend.get(QUOTA_USAGE_CACHE, cache_key, None)
+        if cached is not None:
+            # Callers may modify the usages, never hand out the cached copy.
+            return copy.deepcopy(cached)
+
     disabled_quotas = get_disabled_quotas(request)
     usages = QuotaUsage()
 
@@ -470,26 +581,11 @@ def tenant_quota_usages(request, tenant_id=None, targets=None):
         usages.add_quota(quota)
 
     # Get our usages.
-    _get_tenant_compute_usages(request, usages, disabled_quotas, tenant_id)
-    _get_tenant_network_usages(request, usages, disabled_quotas, tenant_id)
-    _get_tenant_volume_usages(request, usages, disabled_quotas, tenant_id)
-
-    # Server Group usage
-    if 'server_groups' not in disabled_quotas:
-        server_groups = []
-        try:
-            server_groups = nova.server_group_list(request)
-        except Exception:
-            pass
-
-        for server_group in server_groups:
-            project_id = getattr(server_group, 'project_id', None)
-            setattr(server_group, 'project_id', project_id)
+    _collect_tenant_usages(request, usages, disabled_quotas, tenant_id)
 
-        usages.tally('server_groups', len([server_group for server_group in
-                                           server_groups if
-                                           server_group.project_id ==
-                                           request.user.tenant_id]))
+    if cache_timeout:
+        backend.set(QUOTA_USAGE_CACHE, cache_key, copy.deepcopy(usages),
+                    cache_timeout)
     return usages
 
 
@@ -0,0 +1,189 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Daily rollups of the nova simple tenant usage.
+
+The usage of a period is the sum of the usage of each of its days. The
+days which are over never change, so their usage is kept in a cache of
+the process and only the days which are not cached yet, including the
+current one, are retrieved from nova. Periods longer than
+``USAGE_ROLLUP_MAX_DAYS`` are retrieved at once.
+"""
+
+import collections
+import datetime
+
+from django.conf import settings
+from django.utils import timezone
+import futurist
+from novaclient.v2 import usage as nova_usage
+
+from horizon.utils import memoized
+
+from openstack_dashboard.api import base
+from openstack_dashboard.api import nova
+
+
+# Namespace of the cache holding the usage of the past days. It is never
+# invalidated, as changes to the instances do not change the past.
+USAGE_ROLLUP_CACHE = 'openstack_dashboard.usage.rollup'
+
+USAGE_ROLLUP_MAX_WORKERS = 8
+
+TOTAL_FIELDS = ('total_hours', 'total_local_gb_usage',
+                'total_memory_mb_usage', 'total_vcpus_usage')
+
+
+@memoized.memoized_process
+def get_rollup_cache():
+    """Return the cache of the daily usages of this process.
+
+    The usage of a day holds the instances of every project for the admin
+    overview, so it is kept apart from the shared cache. It holds up to
+    ``USAGE_ROLLUP_CACHE_MAX_ENTRIES`` days, the least recently used ones
+    are evicted first.
+    """
+    return memoized.LocalMemoryBackend(max_entries=getattr(
+        settings, 'USAGE_ROLLUP_CACHE_MAX_ENTRIES', 100))
+
+
+def get_day_ranges(start, end):
+    """Splits the period from start to end into ranges ending at midnight."""
+    ranges = []
+    while True:
+        midnight = datetime.datetime.combine(
+            start.date() + datetime.timedelta(days=1), datetime.time())
+        if midnight >= end:
+            ranges.append((start, end))
+            return ranges
+        ranges.append((start, midnight))
+        start = midnight
+
+
+def _get_rollup(usages):
+    """Returns the cacheable data of a list of NovaUsage."""
+    rollup = []
+    for usage in usages:
+        # The usage of a project without instances has no details at all.
+        tenant_id = getattr(usage, 'tenant_id', None)
+        if tenant_id is None:
+            continue
+        data = dict((field, getattr(usage, field, 0) or 0)
+                    for field in TOTAL_FIELDS)
+        data['tenant_id'] = tenant_id
+        data['server_usages'] = [
+            dict(server_usage)
+            for server_usage in getattr(usage, 'server_usages', None) or []]
+        rollup.append(data)
+    return rollup
+
+
+def _make_usage(tenant_id, start, end):
+    usage = dict((field, 0) for field in TOTAL_FIELDS)
+    usage.update(tenant_id=tenant_id, start=start.isoformat(),
+                 stop=end.isoformat(), server_usages=[])
+    return usage
+
+
+def _wrap_usage(usage):
+    return nova.NovaUsage(nova_usage.Usage(nova_usage.UsageManager(None),
+                                           usage, loaded=True))
+
+
+def _merge_rollups(rollups, start, end):
+    """Merges the rollups of consecutive days into a list of NovaUsage.
+
+    The hours of the instances are summed, their other details, such as
+    their state, are taken from the most recent day.
+    """
+    usages = collections.OrderedDict()
+    for rollup in rollups:
+        for data in rollup:
+            usage = usages.get(data['tenant_id'])
+            if usage is None:
+                usage = _make_usage(data['tenant_id'], start, end)
+                usage['server_usages'] = collections.OrderedDict()
+                usages[data['tenant_id']] = usage
+            for field in TOTAL_FIELDS:
+                usage[field] += data[field]
+            server_usages = usage['server_usages']
+            for server_usage in data['server_usages']:
+                key = (server_usage.get('instance_id') or
+                       len(server_usages))
+                server_usage = dict(server_usage)
+                previous = server_usages.get(key)
+                if previous is not None:
+                    server_usage['hours'] = (previous.get('hours', 0) +
+                                             server_usage.get('hours', 0))
+                server_usages[key] = server_usage
+    result = []
+    for usage in usages.values():
+        usage['server_usages'] = list(usage['server_usages'].values())
+        result.append(_wrap_usage(usage))
+    return result
+
+
+def _get_usages(scope, fetch, start, end):
+    timeout = getattr(settings, 'USAGE_ROLLUP_CACHE_TIMEOUT', 2678400)
+    if not timeout:
+        return fetch(start, end)
+
+    ranges = get_day_ranges(start, end)
+    # A long period would take a nova call per day and fill the cache.
+    if len(ranges) > getattr(settings, 'USAGE_ROLLUP_MAX_DAYS', 31):
+        return fetch(start, end)
+
+    backend = get_rollup_cache()
+    today = datetime.datetime.combine(
+        timezone.make_naive(timezone.now(), timezone.utc).date(),
+        datetime.time())
+    rollups = [backend.get(USAGE_ROLLUP_CACHE,
+                           scope + (range_start.isoformat(),
+                                    range_end.isoformat()), None)
+               for range_start, range_end in ranges]
+    missing = [i for i, rollup in enumerate(rollups) if rollup is None]
+    if missing:
+        workers = min(len(missing), USAGE_ROLLUP_MAX_WORKERS)
+        with futurist.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [(i, executor.submit(fetch, *ranges[i]))
+                       for i in missing]
+        for i, future in futures:
+            rollups[i] = _get_rollup(future.result())
+            range_start, range_end = ranges[i]
+            # The usage of the current day is still changing.
+            if range_end <= today:
+                backend.set(USAGE_ROLLUP_CACHE,
+                            scope + (range_start.isoformat(),
+                                     range_end.isoformat()),
+                            rollups[i], timeout)
+    return _merge_rollups(rollups, start, end)
+
+
+def usage_list(request, start, end):
+    """Returns the usage of every project, like api.nova.usage_list."""
+    def fetch(range_start, range_end):
+        return nova.usage_list(request, range_start, range_end)
+
+    scope = (base.url_for(request, 'compute'), None)
+    return _get_usages(scope, fetch, start, end)
+
+
+def usage_get(request, tenant_id, start, end):
+    """Returns the usage of a project, like api.nova.usage_get."""
+    def fetch(range_start, range_end):
+        return [nova.usage_get(request, tenant_id, range_start, range_end)]
+
+    scope = (base.url_for(request, 'compute'), tenant_id)
+    usages = _get_usages(scope, fetch, start, end)
+    if usages:
+        return usages[0]
+    return _wrap_usage(_make_usage(tenant_id, start, end))
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Micro-benchmark of the API resource wrappers.
+
+Compares the attribute access throughput and the per-object memory of
+openstack_dashboard.api.base.APIResourceWrapper against the previous
+implementation, which resolved every attribute through an overridden
+__getattribute__ and an AttributeError fallback. The slotted variant is a
+wrapper subclass declaring an empty __slots__, so its instances have no
+__dict__ at all.
+
+Run it from the top of the source tree::
+
+    python tools/api_wrapper_benchmark.py --count 50000
+"""
+
+from __future__ import print_function
+
+import argparse
+import gc
+import os
+import sys
+import timeit
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE',
+                      'openstack_dashboard.test.settings')
+
+import django  # noqa
+django.setup()
+
+from openstack_dashboard.api import base  # noqa
+
+ATTRS = ['id', 'name', 'status', 'flavor', 'image', 'tenant_id',
+         'created', 'addresses', 'metadata', 'key_name']
+
+
+class LegacyAPIResourceWrapper(object):
+    """The wrapper as it was before attributes were generated."""
+    _attrs = []
+    _apiresource = None
+
+    def __init__(self, apiresource):
+        self._apiresource = apiresource
+
+    def __getattribute__(self, attr):
+        try:
+            return object.__getattribute__(self, attr)
+        except AttributeError:
+            if attr not in self._attrs:
+                raise
+            return getattr(self._apiresource, attr)
+
+
+class LegacyServer(LegacyAPIResourceWrapper):
+    _attrs = ATTRS
+
+    @property
+    def image_name(self):
+        return self.image
+
+
+class Server(base.APIResourceWrapper):
+    _attrs = ATTRS
+
+    @property
+    def image_name(self):
+        return self.image
+
+
+class SlottedServer(Server):
+    # Only possible for wrappers which never get attributes assigned.
+    __slots__ = ()
+
+
+class Resource(object):
+    def __init__(self, index):
+        for attr in ATTRS:
+            setattr(self, attr, '%s-%s' % (attr, index))
+
+
+def measure_memory(wrapper_class, resources):
+    gc.collect()
+    if tracemalloc is None:
+        # Without tracemalloc only the wrappers themselves are measured.
+        wrappers = [wrapper_class(r) for r in resources]
+        size = sum(sys.getsizeof(w) + sys.getsizeof(getattr(w, '__dict__',
+                                                            None))
+                   for w in wrappers)
+        return wrappers, size
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    wrappers = [wrapper_class(r) for r in resources]
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return wrappers, size
+
+
+def measure_access(wrappers, repeat):
+    def access():
+        for wrapper in wrappers:
+            for attr in ATTRS:
+                getattr(wrapper, attr)
+            wrapper.image_name
+    return min(timeit.repeat(access, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=50000,
+                        help='Number of wrapped resources.')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of timing runs, the best is kept.')
+    args = parser.parse_args()
+
+    resources = [Resource(i) for i in range(args.count)]
+    accesses = args.count * (len(ATTRS) + 1)
+    print('%d resources, %d attribute accesses per run'
+          % (args.count, accesses))
+    for label, wrapper_class in (('legacy', LegacyServer),
+                                 ('generated', Server),
+                                 ('slotted', SlottedServer)):
+        wrappers, size = measure_memory(wrapper_class, resources)
+        seconds = measure_access(wrappers, args.repeat)
+        print('%-10s %8.0f accesses/ms %8.1f bytes/object'
+              % (label, accesses / seconds / 1000.0,
+                 float(size) / args.count))
+
+
+if __name__ == '__main__':
+    main()
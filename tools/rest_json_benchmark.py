@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Benchmark of the JSON encoding of the REST API responses.
+
+Encodes payloads shaped like the ``/api/nova/servers/`` and
+``/api/neutron/ports/`` listings with:
+
+* legacy: NaNJSONEncoder as it was before, always running the pure Python
+  encoder of the standard library,
+* fast: NaNJSONEncoder, which uses the C accelerated encoder unless the
+  data holds NaN or infinite floats,
+* streaming: the encoding of StreamingJSONResponse, one item at a time.
+
+The items are API wrappers converted by their ``to_dict()`` method while
+they are encoded, as the REST views now return them.
+
+Run it from the top of the source tree::
+
+    python tools/rest_json_benchmark.py --count 5000
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE',
+                      'openstack_dashboard.test.settings')
+
+import django  # noqa
+django.setup()
+
+from openstack_dashboard.api import base  # noqa
+from openstack_dashboard.api.rest import json_encoder  # noqa
+
+
+class LegacyNaNJSONEncoder(json_encoder.NaNJSONEncoder):
+    """Always runs the pure Python encoder, as every response did before."""
+
+    def _c_iterencode(self, o):
+        raise ValueError()
+
+
+def make_server(i):
+    addr = '10.0.%s.%s' % (i // 250, i % 250)
+    return base.APIDictWrapper({
+        'id': 'server-%s' % i,
+        'name': 'server %s' % i,
+        'status': 'ACTIVE',
+        'tenant_id': 'project-%s' % (i % 50),
+        'user_id': 'user-%s' % (i % 20),
+        'image': {'id': 'image-%s' % (i % 10)},
+        'flavor': {'id': 'flavor-%s' % (i % 5)},
+        'addresses': {'private': [{'addr': addr,
+                                   'version': 4,
+                                   'OS-EXT-IPS:type': 'fixed'}]},
+        'metadata': {'group': 'web'},
+        'key_name': 'key',
+        'created': '2017-01-01T00:00:00Z',
+        'updated': '2017-01-01T00:00:00Z',
+        'progress': 0,
+        'OS-EXT-AZ:availability_zone': 'nova',
+        'OS-EXT-STS:power_state': 1,
+        'OS-EXT-STS:task_state': None,
+        'OS-EXT-STS:vm_state': 'active',
+        'security_groups': [{'name': 'default'}],
+    })
+
+
+def make_port(i):
+    return base.APIDictWrapper({
+        'id': 'port-%s' % i,
+        'name': '',
+        'network_id': 'network-%s' % (i % 100),
+        'tenant_id': 'project-%s' % (i % 50),
+        'mac_address': 'fa:16:3e:%02x:%02x:%02x' % (
+            i // 65536 % 256, i // 256 % 256, i % 256),
+        'admin_state_up': True,
+        'status': 'ACTIVE',
+        'device_id': 'server-%s' % i,
+        'device_owner': 'compute:nova',
+        'fixed_ips': [{'subnet_id': 'subnet-%s' % (i % 100),
+                       'ip_address': '10.0.%s.%s' % (i // 250, i % 250)}],
+        'allowed_address_pairs': [],
+        'binding:vnic_type': 'normal',
+        'security_groups': ['default'],
+        'port_security_enabled': True,
+    })
+
+
+def encode(encoder_class, data):
+    return json.dumps(data, cls=encoder_class,
+                      default=json_encoder.to_primitive)
+
+
+def encode_streaming(encoder_class, data):
+    encoder = encoder_class(default=json_encoder.to_primitive)
+    return ''.join(json_encoder.iterencode(data, encoder))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=5000,
+                        help='Number of servers and ports.')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of timing runs, the best is kept.')
+    args = parser.parse_args()
+
+    payloads = (
+        ('servers', {'items': [make_server(i) for i in range(args.count)]}),
+        ('ports', {'items': [make_port(i) for i in range(args.count)]}),
+    )
+    for name, data in payloads:
+        expected = encode(LegacyNaNJSONEncoder, data)
+        print('%s: %d items, %d bytes'
+              % (name, args.count, len(expected)))
+        for label, func, encoder_class in (
+                ('legacy', encode, LegacyNaNJSONEncoder),
+                ('fast', encode, json_encoder.NaNJSONEncoder),
+                ('streaming', encode_streaming,
+                 json_encoder.NaNJSONEncoder)):
+            assert func(encoder_class, data) == expected
+            seconds = min(timeit.repeat(
+                lambda: func(encoder_class, data),
+                number=1, repeat=args.repeat))
+            print('  %-10s %8.1f ms' % (label, seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
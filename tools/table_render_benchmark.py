@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Benchmark of the DataTable rendering.
+
+Renders the horizon test table, which has link, inline edit, status and
+multi select columns and every kind of row action, with 1000 rows. The
+cells are rendered either through the default string building path or
+through the cell template, as every cell was before.
+
+Run it from the top of the source tree::
+
+    python tools/table_render_benchmark.py --rows 1000
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'horizon.test.settings')
+
+import django  # noqa
+django.setup()
+
+from django.test import RequestFactory  # noqa
+
+from horizon.tables import base as tables_base  # noqa
+from horizon.test.tests import tables as table_tests  # noqa
+
+
+class TemplateCell(tables_base.Cell):
+    """Renders every cell through the cell template."""
+
+    def render(self):
+        cell_template = self.row.table._get_template(self.template_path)
+        return cell_template.render({"cell": self})
+
+
+class User(object):
+    is_authenticated = True
+    is_superuser = True
+
+    def has_perms(self, perms):
+        return True
+
+
+def make_data(rows):
+    return [table_tests.FakeObject(str(i), 'name %s' % i, 'value %s' % i,
+                                   ('active', 'down')[i % 2])
+            for i in range(rows)]
+
+
+def render(request, data, cell_class):
+    table = table_tests.MyTable(request, data)
+    table._meta.cell_class = cell_class
+    return table.render()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000,
+                        help='Number of table rows.')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of timing runs, the best is kept.')
+    args = parser.parse_args()
+
+    request = RequestFactory().get('/')
+    request.user = User()
+    request.session = {}
+    data = make_data(args.rows)
+
+    print('%d rows, %d columns'
+          % (args.rows, len(table_tests.MyTable.base_columns)))
+    for label, cell_class in (('template', TemplateCell),
+                              ('plain', tables_base.Cell)):
+        seconds = min(timeit.repeat(
+            lambda: render(request, data, cell_class),
+            number=1, repeat=args.repeat))
+        print('%-10s %8.1f ms/table' % (label, seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()